@@ -0,0 +1,451 @@
+"""
+API de control local (asyncio, JSON por líneas).
+
+Un servidor asyncio en un hilo daemon escucha en TCP de localhost o en un
+socket Unix. Cada línea es un objeto JSON con "cmd" (y un "id" opcional que
+se devuelve en la respuesta):
+
+    {"id": 1, "cmd": "crear", "nombre": "Carga", "n": 100, "grupo": "/web"}
+    {"id": 2, "cmd": "finalizar", "pids": [12, 13]}
+    {"id": 3, "cmd": "forzar", "pid": 14}
+    {"id": 4, "cmd": "kill_zombi"}
+    {"id": 8, "cmd": "fork", "pid": 14, "n": 3}
+    {"id": 9, "cmd": "wait", "pid": 14}           (con "hijo" para un hijo concreto)
+    {"id": 5, "cmd": "iniciar"}            / "pausar"
+    {"id": 6, "cmd": "estado"}
+    {"id": 7, "cmd": "suscribir", "estados": ["Zombi"]}   / "desuscribir"
+
+Las respuestas son {"id", "ok", "resultado"} o {"id", "ok": false, "error"},
+en el orden de los pedidos de cada conexión, así que un cliente puede enviar
+miles de líneas sin esperar cada respuesta. Los comandos que tocan el motor
+se acumulan y viajan como UN comando de MotorEnHilo: el hilo del motor
+aplica el lote completo entre dos ticks.
+
+Los suscriptores reciben {"evento": "transicion", "tick", "pid", "nombre",
+"de", "a"} por cada cambio de estado (de = null en las altas, a = null en
+las bajas). El observador del motor solo está instalado mientras hay
+suscriptores; los eventos se acumulan en un buffer acotado y se envían en
+tandas. Si el buffer o la conexión de un suscriptor se llenan, se descartan
+eventos y se avisa con {"evento": "perdidos", "n"}.
+
+Ejemplo sin ventana (motor propio, en pausa hasta "iniciar"):
+    python api_control.py servir --puerto 8765
+    python api_control.py carga --puerto 8765 --comandos 20000
+"""
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from hilo_motor import MotorEnHilo
+from grupos import RAIZ
+from simulador import PID_INIT, MotorSimulacion, Proceso
+
+MAX_EVENTOS_PENDIENTES = 100_000   # eventos sin enviar antes de empezar a descartar
+MAX_BUFFER_SUSCRIPTOR = 4 * 1024 * 1024  # bytes sin enviar por suscriptor antes de descartar
+
+# Comandos que se aplican en el hilo del motor: (motor, pedido) -> resultado
+ComandoApi = Callable[[MotorSimulacion, Dict[str, Any]], Any]
+
+
+def _pids(pedido: Dict[str, Any]) -> List[int]:
+    pids = pedido.get("pids")
+    if not isinstance(pids, list) or not all(isinstance(pid, int) for pid in pids):
+        raise ValueError("'pids' debe ser una lista de enteros")
+    return pids
+
+
+def _crear(motor: MotorSimulacion, pedido: Dict[str, Any]) -> List[int]:
+    nombre = str(pedido.get("nombre") or "Tarea")
+    grupo = str(pedido.get("grupo") or RAIZ)
+    n = pedido.get("n", 1)
+    if not isinstance(n, int) or n < 1:
+        raise ValueError("'n' debe ser un entero positivo")
+    if n == 1:
+        return [motor.crear_proceso(nombre, grupo).pid]
+    return [p.pid for p in motor.crear_procesos(n, nombre, grupo)]
+
+
+def _finalizar(motor: MotorSimulacion, pedido: Dict[str, Any]) -> List[int]:
+    pids = [pid for pid in _pids(pedido) if pid in motor.procesos]
+    motor.finalizar(pids)
+    return pids
+
+
+def _forzar(motor: MotorSimulacion, pedido: Dict[str, Any]) -> str:
+    pid = pedido.get("pid")
+    if pid not in motor.procesos:
+        raise ValueError(f"no existe el PID {pid}")
+    motor.forzar_ejecucion(pid)
+    return motor.procesos[pid].estado
+
+
+def _fork(motor: MotorSimulacion, pedido: Dict[str, Any]) -> List[int]:
+    n = pedido.get("n", 1)
+    if not isinstance(n, int) or n < 1:
+        raise ValueError("'n' debe ser un entero positivo")
+    return [p.pid for p in motor.fork(pedido.get("pid"), n, str(pedido.get("nombre") or "Hijo"))]
+
+
+def _wait(motor: MotorSimulacion, pedido: Dict[str, Any]) -> Optional[int]:
+    """PID del hijo recolectado, o null si no había zombis de ese padre"""
+    pid = pedido.get("pid")
+    if not isinstance(pid, int) or isinstance(pid, bool) or (pid != PID_INIT and pid not in motor.procesos):
+        raise ValueError(f"no existe el PID {pid}")
+    hijo = pedido.get("hijo")
+    if hijo is not None and (not isinstance(hijo, int) or isinstance(hijo, bool) or hijo not in motor.procesos):
+        raise ValueError(f"no existe el PID hijo {hijo}")
+    return motor.esperar(pid, hijo)
+
+
+def _kill_zombi(motor: MotorSimulacion, pedido: Dict[str, Any]) -> int:
+    antes = len(motor.procesos)
+    motor.kill_zombi()
+    return antes - len(motor.procesos)
+
+
+def _estado(motor: MotorSimulacion, pedido: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "tick": motor.tick_actual,
+        "por_estado": motor.contar_por_estado(),
+        "cola_listos": len(motor.planificador.cola_listos),
+        "total_finalizados": motor.total_finalizados_historico,
+        "grupos": motor.grupos.resumen() if motor.grupos.activo else {},
+    }
+
+
+def _nada(motor: MotorSimulacion, pedido: Dict[str, Any]) -> None:
+    return None
+
+
+def _error(mensaje: str) -> ComandoApi:
+    def comando(motor: MotorSimulacion, pedido: Dict[str, Any]):
+        raise ValueError(mensaje)
+    return comando
+
+
+COMANDOS_MOTOR: Dict[str, ComandoApi] = {
+    "crear": _crear,
+    "finalizar": _finalizar,
+    "forzar": _forzar,
+    "kill_zombi": _kill_zombi,
+    "fork": _fork,
+    "wait": _wait,
+    "estado": _estado,
+}
+
+
+class _Suscriptor:
+    def __init__(self, escritor: asyncio.StreamWriter, estados: Optional[frozenset]):
+        self.escritor = escritor
+        self.estados = estados  # None = todos
+        self.perdidos = 0
+
+
+class ServidorControl:
+    def __init__(self, motor_hilo: MotorEnHilo, host: str = "127.0.0.1", puerto: Optional[int] = None,
+                 ruta_unix: Optional[str] = None, intervalo_eventos_s: float = 0.05):
+        if (puerto is None) == (ruta_unix is None):
+            raise ValueError("indicar un puerto TCP o una ruta de socket Unix (uno de los dos)")
+        self.motor_hilo = motor_hilo
+        self.host = host
+        self.puerto = puerto
+        self.ruta_unix = ruta_unix
+        self.intervalo_eventos_s = intervalo_eventos_s
+        self.lotes = 0       # comandos de MotorEnHilo enviados
+        self.comandos = 0    # pedidos aplicados en esos lotes
+
+        # Lote en curso: se llena desde el bucle asyncio y lo vacía el hilo del motor
+        self._lock = threading.Lock()
+        self._pendientes: List[Tuple[ComandoApi, Dict[str, Any], asyncio.Future]] = []
+        self._lote_programado = False
+
+        # Eventos de transición: los escribe el hilo del motor, los envía el bucle asyncio
+        self._eventos: deque = deque()
+        self._eventos_perdidos = 0
+        self._suscriptores: Dict[asyncio.StreamWriter, _Suscriptor] = {}
+        self._conexiones: set = set()  # escritores de todas las conexiones abiertas
+
+        self._bucle: Optional[asyncio.AbstractEventLoop] = None
+        self._servidor = None
+        self._listo = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._hilo = threading.Thread(target=self._correr, name="api-control", daemon=True)
+
+    @property
+    def direccion(self) -> str:
+        if self.ruta_unix is not None:
+            return f"unix:{self.ruta_unix}"
+        return f"tcp://{self.host}:{self.puerto}"
+
+    # ---------- Ciclo de vida ----------
+    def iniciar(self):
+        self._hilo.start()
+        self._listo.wait()
+        if self._error is not None:
+            raise self._error
+
+    def detener(self):
+        if self._bucle is not None and self._bucle.is_running():
+            self._bucle.call_soon_threadsafe(self._bucle.stop)
+            self._hilo.join(timeout=1.0)
+        self.motor_hilo.enviar(lambda motor: setattr(motor, "al_transicion", None))
+
+    def _correr(self):
+        self._bucle = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._bucle)
+        try:
+            if self.ruta_unix is not None:
+                self._servidor = self._bucle.run_until_complete(
+                    asyncio.start_unix_server(self._atender, path=self.ruta_unix))
+            else:
+                self._servidor = self._bucle.run_until_complete(
+                    asyncio.start_server(self._atender, self.host, self.puerto))
+                self.puerto = self._servidor.sockets[0].getsockname()[1]  # puerto real si se pidió 0
+        except BaseException as exc:
+            self._error = exc
+            self._listo.set()
+            return
+        self._listo.set()
+        tarea_eventos = self._bucle.create_task(self._enviar_eventos())
+        try:
+            self._bucle.run_forever()
+        finally:
+            self._servidor.close()
+            # Ninguna tarea puede quedar pendiente al cerrar el bucle ("Task was destroyed but it is
+            # pending!"): se cancela el envío de eventos y se cierran las conexiones, cuyas tareas
+            # terminan solas al leer el fin de archivo
+            tarea_eventos.cancel()
+            for escritor in list(self._conexiones):
+                escritor.close()
+            pendientes = asyncio.all_tasks(self._bucle)
+            if pendientes:
+                self._bucle.run_until_complete(asyncio.wait(pendientes, timeout=1.0))
+            self._bucle.close()
+
+    # ---------- Conexiones ----------
+    async def _atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        self._conexiones.add(escritor)
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                if not linea.strip():
+                    continue
+                self._procesar(linea, escritor)
+                if escritor.transport.get_write_buffer_size() > MAX_BUFFER_SUSCRIPTOR:
+                    await escritor.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._conexiones.discard(escritor)
+            self._quitar_suscriptor(escritor)
+            escritor.close()
+
+    def _procesar(self, linea: bytes, escritor: asyncio.StreamWriter):
+        try:
+            pedido = json.loads(linea)
+            if not isinstance(pedido, dict):
+                raise ValueError("se esperaba un objeto JSON")
+        except ValueError as exc:
+            pedido, comando = {}, _error(f"JSON inválido: {exc}")
+        else:
+            comando = self._comando(pedido, escritor)
+        # También los que no tocan el motor (y los errores) pasan por el lote para responder en orden
+        ident = pedido.get("id")
+        futuro = self._encolar(comando, pedido)
+        futuro.add_done_callback(lambda f: self._responder_futuro(escritor, ident, f))
+
+    def _comando(self, pedido: Dict[str, Any], escritor: asyncio.StreamWriter) -> ComandoApi:
+        cmd = pedido.get("cmd")
+        if cmd in COMANDOS_MOTOR:
+            return COMANDOS_MOTOR[cmd]
+        if cmd == "iniciar":
+            return lambda motor, pedido: self.motor_hilo.reanudar()
+        if cmd == "pausar":
+            return lambda motor, pedido: self.motor_hilo.pausar()
+        if cmd == "suscribir":
+            estados = pedido.get("estados")
+            self._agregar_suscriptor(escritor, frozenset(estados) if estados else None)
+            return _nada
+        if cmd == "desuscribir":
+            self._quitar_suscriptor(escritor)
+            return _nada
+        return _error(f"comando desconocido: {cmd}")
+
+    def _responder(self, escritor: asyncio.StreamWriter, ident: Any, resultado: Any = None,
+                   error: Optional[str] = None):
+        if escritor.is_closing():
+            return
+        if error is None:
+            respuesta = {"id": ident, "ok": True, "resultado": resultado}
+        else:
+            respuesta = {"id": ident, "ok": False, "error": error}
+        escritor.write(json.dumps(respuesta, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def _responder_futuro(self, escritor: asyncio.StreamWriter, ident: Any, futuro: asyncio.Future):
+        if futuro.exception() is not None:
+            self._responder(escritor, ident, error=str(futuro.exception()))
+        else:
+            self._responder(escritor, ident, futuro.result())
+
+    # ---------- Lotes de comandos ----------
+    def _encolar(self, comando: ComandoApi, pedido: Dict[str, Any]) -> asyncio.Future:
+        """Agrega el pedido al lote en curso; el primero del lote lo programa en el hilo del motor"""
+        futuro = self._bucle.create_future()
+        with self._lock:
+            self._pendientes.append((comando, pedido, futuro))
+            programar = not self._lote_programado
+            self._lote_programado = True
+        if programar:
+            self.motor_hilo.enviar(self._aplicar_lote)
+        return futuro
+
+    def _aplicar_lote(self, motor: MotorSimulacion):
+        """Corre en el hilo del motor, entre ticks: aplica todo lo acumulado hasta ahora"""
+        with self._lock:
+            lote, self._pendientes = self._pendientes, []
+            self._lote_programado = False
+        resultados = []
+        for comando, pedido, futuro in lote:
+            try:
+                resultados.append((futuro, comando(motor, pedido), None))
+            except Exception as exc:  # un pedido inválido no afecta al resto del lote
+                resultados.append((futuro, None, exc))
+        self.lotes += 1
+        self.comandos += len(lote)
+        self._bucle.call_soon_threadsafe(self._resolver, resultados)
+
+    @staticmethod
+    def _resolver(resultados):
+        for futuro, resultado, error in resultados:
+            if futuro.cancelled():
+                continue
+            if error is not None:
+                futuro.set_exception(error)
+            else:
+                futuro.set_result(resultado)
+
+    # ---------- Eventos de transición ----------
+    def _agregar_suscriptor(self, escritor: asyncio.StreamWriter, estados: Optional[frozenset]):
+        if not self._suscriptores:
+            self.motor_hilo.enviar(lambda motor: setattr(motor, "al_transicion", self._observar))
+        self._suscriptores[escritor] = _Suscriptor(escritor, estados)
+
+    def _quitar_suscriptor(self, escritor: asyncio.StreamWriter):
+        if self._suscriptores.pop(escritor, None) is not None and not self._suscriptores:
+            self.motor_hilo.enviar(lambda motor: setattr(motor, "al_transicion", None))
+
+    def _observar(self, proceso: Proceso, anterior: Optional[str], nuevo: Optional[str]):
+        """Observador del motor (hilo del motor): solo agrega al buffer"""
+        if len(self._eventos) >= MAX_EVENTOS_PENDIENTES:
+            self._eventos_perdidos += 1
+            return
+        self._eventos.append((self.motor_hilo.motor.tick_actual, proceso.pid, proceso.nombre, anterior, nuevo))
+
+    async def _enviar_eventos(self):
+        while True:
+            await asyncio.sleep(self.intervalo_eventos_s)
+            n = len(self._eventos)
+            if not n:
+                continue
+            eventos = [self._eventos.popleft() for _ in range(n)]
+            perdidos, self._eventos_perdidos = self._eventos_perdidos, 0
+            lineas = [
+                (nuevo, anterior, json.dumps({"evento": "transicion", "tick": tick, "pid": pid, "nombre": nombre,
+                                              "de": anterior, "a": nuevo}, ensure_ascii=False))
+                for tick, pid, nombre, anterior, nuevo in eventos
+            ]
+            for escritor, suscriptor in list(self._suscriptores.items()):
+                if escritor.is_closing():
+                    self._quitar_suscriptor(escritor)
+                    continue
+                if suscriptor.estados is None:
+                    texto = [linea for _, _, linea in lineas]
+                else:
+                    texto = [linea for nuevo, anterior, linea in lineas
+                             if nuevo in suscriptor.estados or anterior in suscriptor.estados]
+                suscriptor.perdidos += perdidos
+                if escritor.transport.get_write_buffer_size() > MAX_BUFFER_SUSCRIPTOR:
+                    suscriptor.perdidos += len(texto)  # suscriptor lento: no se le acumula sin límite
+                    continue
+                if suscriptor.perdidos:
+                    texto.insert(0, json.dumps({"evento": "perdidos", "n": suscriptor.perdidos}))
+                    suscriptor.perdidos = 0
+                if texto:
+                    escritor.write(("\n".join(texto) + "\n").encode("utf-8"))
+
+
+# ===============================
+# Uso sin ventana
+# ===============================
+
+def _servir(args) -> int:
+    motor_hilo = MotorEnHilo(MotorSimulacion(semilla=args.semilla, tiempo_real=False))
+    motor_hilo.motor.log = None  # sin interfaz no hay quien vacíe el log
+    motor_hilo.motor.tick_ms = args.tick_ms
+    motor_hilo.arrancar()
+    servidor = ServidorControl(motor_hilo, host=args.host, puerto=args.puerto, ruta_unix=args.unix)
+    servidor.iniciar()
+    print(f"API de control en {servidor.direccion} (motor en pausa: enviar 'iniciar')", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.detener()
+        motor_hilo.detener()
+    return 0
+
+
+async def _carga(args) -> Dict[str, float]:
+    if args.unix:
+        lector, escritor = await asyncio.open_unix_connection(args.unix)
+    else:
+        lector, escritor = await asyncio.open_connection(args.host, args.puerto)
+    inicio = time.perf_counter()
+    for i in range(args.comandos):
+        escritor.write(json.dumps({"id": i, "cmd": "crear", "nombre": "Carga"}).encode("utf-8") + b"\n")
+        if i % 1000 == 999:
+            await escritor.drain()
+    await escritor.drain()
+    errores = 0
+    for _ in range(args.comandos):
+        respuesta = json.loads(await lector.readline())
+        errores += not respuesta["ok"]
+    duracion = time.perf_counter() - inicio
+    escritor.close()
+    return {"comandos": args.comandos, "errores": errores, "segundos": duracion,
+            "comandos_por_segundo": args.comandos / duracion}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="API de control del simulador (JSON por líneas)")
+    sub = parser.add_subparsers(dest="accion", required=True)
+    p_servir = sub.add_parser("servir", help="motor sin ventana controlado solo por la API")
+    p_carga = sub.add_parser("carga", help="envía N comandos 'crear' y mide cuántos por segundo se aplican")
+    for p in (p_servir, p_carga):
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--puerto", type=int, default=None)
+        p.add_argument("--unix", default=None, help="ruta de socket Unix en lugar de TCP")
+    p_servir.add_argument("--semilla", type=int, default=None)
+    p_servir.add_argument("--tick-ms", type=int, default=100)
+    p_carga.add_argument("--comandos", type=int, default=10000)
+    args = parser.parse_args(argv)
+    if (args.puerto is None) == (args.unix is None):
+        parser.error("indicar --puerto o --unix")
+
+    if args.accion == "servir":
+        return _servir(args)
+    print(json.dumps(asyncio.run(_carga(args)), ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
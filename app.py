@@ -1,10 +1,13 @@
 import tkinter as tk
 from tkinter import ttk
-import random
 import time
-from dataclasses import dataclass, field
+from collections import deque
 from typing import List, Optional, Dict
 
+from hilo_motor import MotorEnHilo
+from simulador import ESTADOS, ESTADO_COLOR, Instantanea, MotorSimulacion
+from vista_procesos import VistaProcesos
+
 # ===============================
 # Ventana de Auditoría
 # ===============================
@@ -62,6 +65,18 @@ class VentanaAuditoria(tk.Toplevel):
         self.txt_log.see("end")
         self.txt_log.configure(state="disabled")
     
+    def log_lote(self, mensajes: List[str]):
+        """Agregar varios mensajes con una sola inserción en el Text"""
+        marca = time.strftime('%H:%M:%S')
+        self.insertar_lineas([f"[{marca}] {msg}\n" for msg in mensajes])
+
+    def insertar_lineas(self, lineas):
+        """Insertar líneas ya marcadas con su hora (p. ej. las acumuladas antes de abrir la ventana)"""
+        self.txt_log.configure(state="normal")
+        self.txt_log.insert("end", "".join(lineas))
+        self.txt_log.see("end")
+        self.txt_log.configure(state="disabled")
+    
     def limpiar_log(self):
         """Limpiar el contenido del log"""
         self.txt_log.configure(state="normal")
@@ -74,217 +89,67 @@ class VentanaAuditoria(tk.Toplevel):
         self.lift()
 
 # ===============================
-# Modelo de Procesos y Estados
+# Programador de redibujo
 # ===============================
 
-
-# Tiempo
-
-def generar_duracion_ejecucion_variada() -> int:
+class ProgramadorRedibujo:
     """
-    Genera duración de ejecución variada y observable:
-    - 30% procesos cortos (3-5 ticks = 9-15 segundos)
-    - 40% procesos normales (6-10 ticks = 18-30 segundos)  
-    - 25% procesos largos (12-18 ticks = 36-54 segundos)
-    - 5% procesos muy largos (20-30 ticks = 60-90 segundos)
+    Agrupa todas las invalidaciones en como mucho un redibujo por cuadro.
+    Mide el costo de cada redibujo y, si supera la fracción de cuadro
+    permitida, alarga el cuadro (baja la frecuencia de refresco); cuando
+    el costo vuelve a ser bajo recupera la frecuencia base.
     """
-    tipo = random.random()
-    if tipo < 0.3:  # Procesos cortos
-        return random.randint(3, 5)
-    elif tipo < 0.7:  # Procesos normales
-        return random.randint(6, 10)
-    elif tipo < 0.95:  # Procesos largos
-        return random.randint(12, 18)
-    else:  # Procesos muy largos
-        return random.randint(20, 30)
-
-def generar_tiempo_ejecucion_variado() -> int:
-    """Genera tiempo variado para Listo -> Ejecución (4, 7, o 9 ticks)"""
-    opciones = [4, 7, 9]
-    return random.choice(opciones)
-
-def generar_tiempo_bloqueo() -> int:
-    """Genera tiempo de bloqueo (3-5 ticks)"""
-    return random.randint(3, 5)
-
-def generar_tiempo_admision_variado() -> int:
-    """Genera tiempo de admisión FIJO para Nuevo -> Listo (siempre 3 ticks)"""
-    return 3
-
-def generar_tiempo_espera_cpu() -> int:
-    """Genera tiempo de espera variado en Listo antes de poder ejecutar (4, 7, o 9 ticks)"""
-    return generar_tiempo_ejecucion_variado()
-
-def generar_linger_zombi_variado() -> int:
-    """Genera tiempo de linger para zombis (5-12 ticks = 15-36 segundos)"""
-    return random.randint(5, 12)
-
-# ===============================
-# Modelo de Proceso y Planificador
-# ===============================
 
-ESTADOS = (
-    "Listo",
-    "Ejecución", 
-    "Bloqueado",
-    "Zombi",
-    "Finalizado",
-)
-
-ESTADO_COLOR = {
-    "Nuevo": "#D0E1FF",        # azul claro
-    "Listo": "#E7FFD0",        # verde claro
-    "Ejecución": "#FFF3B0",    # amarillo claro
-    "Bloqueado": "#FFB3B3",    # rojo claro
-    "Zombi": "#D6C6F5",        # lila
-    "Finalizado": "#E0E0E0",    # gris
-}
-
-_id_counter = 1000
-
-def next_pid() -> int:
-    global _id_counter
-    _id_counter += 1
-    return _id_counter
-
-@dataclass
-class Proceso:
-    pid: int
-    nombre: str
-    estado: str = "Nuevo"
-    tiempo_llegada: float = field(default_factory=time.time)
-    # Simulación automática
-    tiempo_estado: int = 0           # ticks acumulados en el estado actual
-    duracion_ejecucion: int = 0      # ticks que requiere en Ejecución
-    tiempo_admision: int = 0         # ticks requeridos para pasar de Nuevo a Listo
-    tiempo_espera_cpu: int = 0       # ticks que debe esperar en Listo antes de poder ejecutar
-    tiempo_bloqueo: int = 0          # ticks que permanecerá en Bloqueado (3-5 ticks)
-    proceso_dependencia: Optional[int] = None  # PID del proceso del cual depende cuando está bloqueado
-    linger_zombi: int = 0            # ticks que permanecerá en Zombi
-    tiempo_finalizado: float = 0     # timestamp cuando pasó a Finalizado (para auto-eliminación)
-    padre: Optional[int] = None
-    automatizado: bool = True
-    # Recursos del sistema
-    cpu_percent: float = 0.0         # Porcentaje de CPU (0-100%)
-    memoria_mb: float = 0.0          # Memoria en MB
-    disco_percent: float = 0.0       # Porcentaje de disco (0-100%)
-
-    def to_row(self) -> List[str]:
-        duracion_str = f"{self.duracion_ejecucion}" if self.duracion_ejecucion > 0 else "Auto"
-        
-        # Mostrar dependencia en el nombre si está bloqueado
-        nombre_display = self.nombre
-        if self.estado == "Bloqueado" and self.proceso_dependencia:
-            nombre_display = f"{self.nombre} (→{self.proceso_dependencia})"
-        
-        return [
-            str(self.pid),
-            nombre_display,
-            self.estado,
-            str(self.tiempo_estado),
-            duracion_str,
-            f"{self.cpu_percent:.1f}%",
-            f"{self.memoria_mb:.0f} MB",
-            f"{self.disco_percent:.1f}%",
-        ]
-
-class Planificador:
-    def __init__(self):
-        self.cola_listos: List[int] = []  # pids
-        self.procesos_bloqueados: List[int] = []  # pids de procesos bloqueados
-        self.en_ejecucion: Optional[int] = None
-        self.proceso_con_prioridad: Optional[int] = None  # PID del proceso ejecutándose por aging
-
-    def admitir(self, proceso: Proceso):
-        if proceso.estado == "Nuevo":
-            proceso.estado = "Listo"
-            proceso.tiempo_estado = 0
-            self.cola_listos.append(proceso.pid)
-
-    def asignar_cpu(self, procesos: Dict[int, Proceso]):
-        # FIFO estricto: el primero en la cola es el próximo en ejecutar
-        if self.en_ejecucion is None and self.cola_listos:
-            # Tomar siempre el primer proceso de la cola (FIFO)
-            pid = self.cola_listos[0]
-            p = procesos.get(pid)
-            if p and p.estado == "Listo":
-                # Verificar si ha esperado el tiempo mínimo
-                if p.tiempo_estado >= p.tiempo_espera_cpu:
-                    # Ha esperado suficiente, puede ejecutar
-                    self.cola_listos.pop(0)
-                    p.estado = "Ejecución"
-                    p.tiempo_estado = 0
-                    if p.duracion_ejecucion <= 0:
-                        p.duracion_ejecucion = generar_duracion_ejecucion_variada()
-                    self.en_ejecucion = pid
-    
-    def bloquear_proceso(self, proceso: Proceso, procesos_disponibles: Dict[int, Proceso]):
-        """Bloquea un proceso que está en ejecución y establece dependencia"""
-        if proceso.estado == "Ejecución":
-            proceso.estado = "Bloqueado"
-            proceso.tiempo_estado = 0
-            proceso.tiempo_bloqueo = generar_tiempo_bloqueo()
-            
-            # Buscar un proceso del cual depender (solo Listo o Ejecución)
-            candidatos_dependencia = [
-                p for p in procesos_disponibles.values() 
-                if p.pid != proceso.pid and p.estado in ["Listo", "Ejecución"]
-            ]
-            
-            if candidatos_dependencia:
-                # Elegir el proceso con menor PID (más antiguo) como dependencia
-                proceso_dependencia = min(candidatos_dependencia, key=lambda x: x.pid)
-                proceso.proceso_dependencia = proceso_dependencia.pid
-            else:
-                proceso.proceso_dependencia = None
-                
-            self.procesos_bloqueados.append(proceso.pid)
-            self.en_ejecucion = None
-    
-    def desbloquear_proceso(self, proceso: Proceso):
-        """Desbloquea un proceso y lo devuelve a Listo"""
-        if proceso.estado == "Bloqueado" and proceso.pid in self.procesos_bloqueados:
-            proceso.estado = "Listo"
-            proceso.tiempo_estado = 0
-            proceso.proceso_dependencia = None  # Limpiar dependencia
-            self.procesos_bloqueados.remove(proceso.pid)
-            self.cola_listos.append(proceso.pid)  # Va al final de la cola FIFO
-
-    def tick(self, procesos: Dict[int, Proceso]):
-        # En el modo automático solo aseguramos que haya asignación si está libre
-        if self.en_ejecucion is None:
-            self.asignar_cpu(procesos)
+    def __init__(self, widget: tk.Misc, redibujar, frame_ms: int = 50, frame_max_ms: int = 1000,
+                 fraccion_presupuesto: float = 0.5):
+        self.widget = widget
+        self.redibujar = redibujar
+        self.frame_base_ms = frame_ms
+        self.frame_ms = frame_ms
+        self.frame_max_ms = frame_max_ms
+        self.fraccion_presupuesto = fraccion_presupuesto  # parte del cuadro que puede ocupar el redibujo
+        self.costo_ms = 0.0           # promedio móvil del costo de redibujo
+        self.ultimo_costo_ms = 0.0
+        self.redibujos = 0
+        self._pendiente: Optional[str] = None
+        self._ultimo = 0.0
+
+    def invalidar(self):
+        """Pide un redibujo; las peticiones repetidas dentro del mismo cuadro se agrupan"""
+        if self._pendiente is not None:
+            return
+        transcurrido_ms = (time.perf_counter() - self._ultimo) * 1000
+        espera = max(0, int(self.frame_ms - transcurrido_ms))
+        self._pendiente = self.widget.after(espera, self._ejecutar)
+
+    def _ejecutar(self):
+        self._pendiente = None
+        inicio = time.perf_counter()
+        self.redibujar()
+        self._ultimo = time.perf_counter()
+        self.ultimo_costo_ms = (self._ultimo - inicio) * 1000
+        self.redibujos += 1
+        self.costo_ms = self.ultimo_costo_ms if self.redibujos == 1 else 0.8 * self.costo_ms + 0.2 * self.ultimo_costo_ms
+        self._adaptar()
+
+    def _adaptar(self):
+        necesario_ms = self.costo_ms / self.fraccion_presupuesto
+        if necesario_ms > self.frame_ms:
+            # El redibujo no cabe en el presupuesto: bajar la frecuencia
+            self.frame_ms = min(self.frame_max_ms, int(necesario_ms * 1.25))
+        elif necesario_ms < self.frame_ms * 0.5 and self.frame_ms > self.frame_base_ms:
+            # Sobra margen: recuperar frecuencia poco a poco
+            self.frame_ms = max(self.frame_base_ms, int(self.frame_ms * 0.8))
 
 # ===============================
 # Interfaz de Usuario Tkinter
 # ===============================
 
-def generar_duracion_ejecucion_variada() -> int:
-    """
-    Genera duración de ejecución variada automáticamente (más lenta para observar):
-    - 30% procesos cortos (3-5 ticks)
-    - 40% procesos normales (6-10 ticks)  
-    - 25% procesos largos (12-18 ticks)
-    - 5% procesos muy largos (20-30 ticks)
-    """
-    tipo = random.random()
-    if tipo < 0.3:  # Procesos cortos
-        return random.randint(3, 5)
-    elif tipo < 0.7:  # Procesos normales
-        return random.randint(6, 10)
-    elif tipo < 0.95:  # Procesos largos
-        return random.randint(12, 18)
-    else:  # Procesos muy largos
-        return random.randint(20, 30)
-
-# FUNCIÓN ELIMINADA: estaba duplicada y causaba el error de tiempos
-
-def generar_linger_zombi_variado() -> int:
-    """Genera tiempo de linger para zombis (más lento)"""
-    return random.randint(5, 12)
-
 class TaskManagerApp(tk.Tk):
-    def __init__(self):
+    MAX_LOG_PENDIENTE = 5000  # mensajes que se guardan mientras el log de eventos no se abrió
+
+    def __init__(self, puerto_metricas: Optional[int] = None, puerto_control: Optional[int] = None,
+                 ruta_control: Optional[str] = None):
         super().__init__()
         self.title("Mini Administrador de Tareas - SO")
         
@@ -306,46 +171,66 @@ class TaskManagerApp(tk.Tk):
         # Permitir que la ventana se maximice correctamente
         self.state('normal')  # Asegurar que empiece en estado normal
 
-        # Modelo
-        self.procesos: Dict[int, Proceso] = {}
-        self.planificador = Planificador()
+        # Modelo: el motor corre en su propio hilo y publica instantáneas;
+        # la interfaz nunca toca su estado directamente
+        # (tiempo simulado: en turbo los 4 s de conversión a zombi siguen midiéndose en ticks)
+        self.motor_hilo = MotorEnHilo(MotorSimulacion(tiempo_real=False))
+        self.redibujo = ProgramadorRedibujo(self, self._refrescar_ui, frame_ms=50)  # cuadro independiente del tick
+        self.instantanea_actual: Optional[Instantanea] = None
+        self.vista = VistaProcesos()         # orden y filtros de la tabla (índices incrementales)
+        self.iids: Dict[int, str] = {}       # PID -> item del Treeview
+        self._orden_mostrado: List[str] = []  # hijos del Treeview en el orden visible actual
 
         # Configuración de reloj automático
-        self.tick_ms = 1500  # ms por tick (1.5 segundos - más rápido para mejor dinamismo)
         self.cpu_corriendo = False  # NO iniciar automáticamente - esperar comando del usuario
 
         # Sistema completamente automático (sin opciones de configuración)
         self.auto_progress = tk.BooleanVar(value=True)  # Siempre activo
-        
-        # Lista de PIDs especiales que se convertirán en zombis automáticamente
-        self.pids_especiales = []  # Guardaremos 3 PIDs aleatorios aquí
-        self.finalizados_pendientes_zombi = {}  # PID -> tiempo_finalizacion para conversión a zombi
-
-        # Contador persistente de procesos finalizados (no se reinicia al eliminar)
-        self.total_finalizados_historico = 0
-
-        # Límites de recursos del sistema
-        self.cpu_total_disponible = 100.0      # 100% CPU total
-        self.memoria_total_disponible = 8192.0  # 8 GB de RAM total
-        self.disco_total_disponible = 100.0    # 100% disco total
-
-        # Variables para creación automática de procesos
-        self.auto_process_counter = 0
-        self.max_auto_processes = 3
-        self.auto_process_timer = 0
-        self.auto_process_interval = random.randint(5, 6)  # 5-6 ticks
-        self.procesos_automaticos = set()  # PIDs de procesos creados automáticamente
+        self.auto_progress.trace_add("write", lambda *_: self._sincronizar_auto_progreso())
+        self.turbo = tk.BooleanVar(value=False)
+        self.turbo.trace_add("write", lambda *_: self.motor_hilo.activar_turbo(self.turbo.get()))
 
         # Construcción UI
         self._build_ui()
         
-        # Crear ventana de auditoría
-        self.ventana_auditoria = VentanaAuditoria(self)
+        # Ventanas secundarias: se construyen la primera vez que se abren.
+        # Hasta entonces el log se acumula (acotado) con la hora de cada mensaje.
+        self.ventana_auditoria: Optional[VentanaAuditoria] = None
+        self.ventana_graficos = None  # graficos.VentanaGraficos
+        self.log_pendiente = deque(maxlen=self.MAX_LOG_PENDIENTE)
         
         self._log("Simulador de Sistema Operativo iniciado automáticamente.")
 
         # Inicio automático del sistema
-        self.after(200, self._refrescar_ui)
+        self.protocol("WM_DELETE_WINDOW", self._cerrar)
+        self.motor_hilo.arrancar()
+
+        # Endpoint opcional de métricas (Prometheus) en un hilo propio
+        self.servidor_metricas = None
+        if puerto_metricas is not None:
+            from metricas_http import ServidorMetricas
+            self.servidor_metricas = ServidorMetricas(lambda: self.motor_hilo.ultima_publicada,
+                                                      puerto=puerto_metricas)
+            self.servidor_metricas.iniciar()
+            # ticks/s y la latencia por fase salen del perfilador: se enciende ya, sin esperar al HUD
+            self.motor_hilo.enviar(lambda motor: motor.activar_perfilador())
+            self._log(f"📡 Métricas disponibles en {self.servidor_metricas.direccion}")
+        # API de control opcional (JSON por líneas); sus comandos viajan por la misma cola que los botones
+        self.servidor_control = None
+        if puerto_control is not None or ruta_control is not None:
+            from api_control import ServidorControl
+            self.servidor_control = ServidorControl(self.motor_hilo, puerto=puerto_control, ruta_unix=ruta_control)
+            self.servidor_control.iniciar()
+            self._log(f"🛰️ API de control en {self.servidor_control.direccion}")
+        # Los temporizadores se arman cuando la ventana ya está en pantalla
+        self._al_mostrar = self.bind("<Map>", self._primera_vez_visible, add="+")
+
+    def _primera_vez_visible(self, event):
+        # <Map> de la raíz también llega por cada widget hijo: solo cuenta el de la ventana principal
+        if event.widget is not self:
+            return
+        self.unbind("<Map>", self._al_mostrar)
+        self.after(200, self._sondear_motor)
         self.after(1000, self._start_cpu)  # Iniciar CPU automáticamente tras 1 segundo
 
     # ---------- Construcción UI ----------
@@ -356,6 +241,7 @@ class TaskManagerApp(tk.Tk):
 
         # Panel izquierdo - Treeview
         left = ttk.Frame(self)
+        self.panel_procesos = left
         left.grid(row=0, column=0, sticky="nsew", padx=8, pady=8)
         left.rowconfigure(1, weight=1)
         left.columnconfigure(0, weight=1)
@@ -363,6 +249,20 @@ class TaskManagerApp(tk.Tk):
         title = ttk.Label(left, text="Procesos", font=("Segoe UI", 11, "bold"))
         title.grid(row=0, column=0, sticky="w")
 
+        # Filtros: estado y búsqueda por nombre (se aplican sobre los índices de la vista)
+        filtros = ttk.Frame(left)
+        filtros.grid(row=0, column=0, columnspan=2, sticky="e")
+        ttk.Label(filtros, text="Estado:").pack(side=tk.LEFT)
+        self.filtro_estado = tk.StringVar(value="Todos")
+        cmb_estado = ttk.Combobox(filtros, textvariable=self.filtro_estado, state="readonly", width=11,
+                                  values=("Todos",) + ESTADOS)
+        cmb_estado.pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Label(filtros, text="Buscar:").pack(side=tk.LEFT)
+        self.filtro_texto = tk.StringVar(value="")
+        ttk.Entry(filtros, textvariable=self.filtro_texto, width=16).pack(side=tk.LEFT, padx=2)
+        self.filtro_estado.trace_add("write", lambda *_: self._aplicar_filtros())
+        self.filtro_texto.trace_add("write", lambda *_: self._aplicar_filtros())
+
         columns = ("PID", "Nombre", "Estado", "Tiempo", "Duración", "CPU", "Memoria", "Disco")
         # Altura adaptativa del Treeview - más conservadora para pantallas pequeñas
         tree_height = 12  # Altura reducida pero visible
@@ -381,15 +281,15 @@ class TaskManagerApp(tk.Tk):
         }
         
         for col in columns:
-            self.tree.heading(col, text=col)
+            self.tree.heading(col, text=col, command=lambda c=col: self._ordenar_por(c))
             if col == "Duración":
-                self.tree.heading(col, text="Duración Ejec.")
+                self.tree.heading(col, text="Duración Ejec.", command=lambda c=col: self._ordenar_por(c))
             elif col == "CPU":
-                self.tree.heading(col, text="CPU")
+                self.tree.heading(col, text="CPU", command=lambda c=col: self._ordenar_por(c))
             elif col == "Memoria":
-                self.tree.heading(col, text="Memoria")
+                self.tree.heading(col, text="Memoria", command=lambda c=col: self._ordenar_por(c))
             elif col == "Disco":
-                self.tree.heading(col, text="Disco")
+                self.tree.heading(col, text="Disco", command=lambda c=col: self._ordenar_por(c))
             
             # Configurar ancho de columna
             self.tree.column(col, anchor=tk.CENTER, width=column_widths[col], minwidth=50)
@@ -418,6 +318,10 @@ class TaskManagerApp(tk.Tk):
                                      foreground="blue")
         self.lbl_recursos.grid(row=4, column=0, columnspan=2, sticky="w", pady=(2, 0))
 
+        # Control de admisión (tiempo en Nuevo y contrapresión)
+        self.lbl_admision = ttk.Label(left, text="Admisión: sin datos")
+        self.lbl_admision.grid(row=5, column=0, columnspan=2, sticky="w", pady=(2, 0))
+
         # Panel derecho - Controles
         right = ttk.Frame(self)
         right.grid(row=0, column=1, sticky="nsew", padx=8, pady=8)
@@ -440,6 +344,7 @@ class TaskManagerApp(tk.Tk):
         self._actualizar_botones_control()
 
         ttk.Checkbutton(grp_cpu, text="Progreso automático", variable=self.auto_progress).grid(row=1, column=0, columnspan=2, padx=3, pady=3, sticky="w")
+        ttk.Checkbutton(grp_cpu, text="⏩ Turbo (avance rápido)", variable=self.turbo).grid(row=2, column=0, columnspan=2, padx=3, pady=3, sticky="w")
 
         # Sección creación
         grp_crea = ttk.LabelFrame(right, text="Procesos")
@@ -486,15 +391,52 @@ class TaskManagerApp(tk.Tk):
         
         btn_auditoria = ttk.Button(grp_auditoria, text="📋 Log de Eventos", command=self._abrir_auditoria)
         btn_auditoria.pack(padx=6, pady=6, fill="x")
+        ttk.Button(grp_auditoria, text="📉 Gráficos", command=self._abrir_graficos).pack(padx=6, pady=(0, 6), fill="x")
+
+        # Rendimiento: HUD por fase y captura con cProfile
+        grp_perf = ttk.LabelFrame(right, text="Rendimiento")
+        grp_perf.grid(row=5, column=0, sticky="ew", pady=(6, 0))
+        grp_perf.columnconfigure(0, weight=1)
+
+        self.hud_activo = tk.BooleanVar(value=False)
+        ttk.Checkbutton(grp_perf, text="📈 HUD por fase", variable=self.hud_activo,
+                        command=self._alternar_hud).grid(row=0, column=0, padx=3, pady=3, sticky="w")
+        ttk.Button(grp_perf, text="Perfilar 200 ticks", command=self._perfilar_ventana).grid(row=1, column=0, padx=3, pady=3, sticky="ew")
+
+        # Overlay sobre la tabla de procesos: se crea al activar el HUD por primera vez
+        self.lbl_hud: Optional[tk.Label] = None
 
     # ---------- Utilidades ----------
     def _abrir_auditoria(self):
-        """Abrir la ventana de auditoría"""
+        """Abrir la ventana de auditoría (se crea la primera vez con lo acumulado hasta ahora)"""
+        if self.ventana_auditoria is None:
+            self.ventana_auditoria = VentanaAuditoria(self)
+            self.ventana_auditoria.insertar_lineas(self.log_pendiente)
+            self.log_pendiente.clear()
         self.ventana_auditoria.mostrar()
     
+    def _abrir_graficos(self):
+        """Abrir la ventana de historial"""
+        if self.ventana_graficos is None:
+            # Solo el hilo del motor toca el motor: el almacén y la memoria llegan en la instantánea
+            inst = self.motor_hilo.ultima_publicada
+            if inst is None or inst.series is None:
+                self._log("📉 Historial todavía no disponible")
+                return
+            from graficos import VentanaGraficos
+            self.ventana_graficos = VentanaGraficos(self, inst.series, inst.memoria_total_disponible)
+        self.ventana_graficos.mostrar()
+
     def _log(self, msg: str):
         """Registrar mensaje en la ventana de auditoría"""
-        self.ventana_auditoria.log_mensaje(msg)
+        self._log_lote([msg])
+
+    def _log_lote(self, mensajes: List[str]):
+        if self.ventana_auditoria is not None:
+            self.ventana_auditoria.log_lote(mensajes)
+        else:
+            marca = time.strftime('%H:%M:%S')
+            self.log_pendiente.extend(f"[{marca}] {msg}\n" for msg in mensajes)
 
     def _selected_pids(self) -> List[int]:
         sel = []
@@ -506,304 +448,89 @@ class TaskManagerApp(tk.Tk):
                 continue
         return sel
 
-    def _actualizar_pids_especiales(self):
-        """Actualiza la lista de PIDs especiales dinámicamente: 1 por cada grupo de 9 procesos (menos zombis)"""
-        total_procesos = len(self.procesos)
-        # Calcular cuántos PIDs especiales necesitamos: 1 por cada 9 procesos (redondeando hacia arriba)
-        zombis_objetivo = (total_procesos + 8) // 9  # Equivale a math.ceil(total_procesos / 9)
-        
-        self._log(f"📊 ACTUALIZACIÓN PIDs: Total={total_procesos}, Objetivo zombis={zombis_objetivo} (cada 9), Actuales={len(self.pids_especiales)} {self.pids_especiales}")
-        
-        # Si necesitamos más PIDs especiales (se agregaron procesos)
-        if len(self.pids_especiales) < zombis_objetivo:
-            # Obtener PIDs candidatos (que no sean especiales aún)
-            candidatos = [pid for pid in self.procesos.keys() if pid not in self.pids_especiales]
-            self._log(f"📊 Necesitamos {zombis_objetivo - len(self.pids_especiales)} PIDs más. Candidatos: {candidatos}")
-            
-            # Agregar PIDs aleatorios hasta alcanzar el objetivo
-            while len(self.pids_especiales) < zombis_objetivo and candidatos:
-                nuevo_especial = random.choice(candidatos)
-                self.pids_especiales.append(nuevo_especial)
-                candidatos.remove(nuevo_especial)
-                
-                # Calcular en qué "grupo de 9" estamos
-                grupo_actual = (len(self.pids_especiales) - 1) * 9 + 1
-                grupo_hasta = len(self.pids_especiales) * 9
-                self._log(f"🎯 PID {nuevo_especial} seleccionado para zombi #{len(self.pids_especiales)} (procesos {grupo_actual}-{grupo_hasta})")
-        
-        # Si tenemos demasiados PIDs especiales (por eliminación de procesos)
-        elif len(self.pids_especiales) > zombis_objetivo:
-            # Remover PIDs que ya no existen en el sistema
-            pids_especiales_antiguos = self.pids_especiales.copy()
-            self.pids_especiales = [pid for pid in self.pids_especiales if pid in self.procesos]
-            
-            if len(pids_especiales_antiguos) != len(self.pids_especiales):
-                self._log(f"🎯 PIDs especiales limpiados (procesos eliminados del sistema)")
-            
-            # Si aún tenemos demasiados, remover algunos aleatoriamente
-            while len(self.pids_especiales) > zombis_objetivo:
-                pid_a_remover = random.choice(self.pids_especiales)
-                self.pids_especiales.remove(pid_a_remover)
-                self._log(f"🎯 PID {pid_a_remover} removido de especiales (reducción de procesos)")
-        
-        self._log(f"📊 PIDs especiales FINAL: {self.pids_especiales} ({len(self.pids_especiales)} zombis para {total_procesos} procesos)")
-
-    def _finalizar_proceso(self, proceso: Proceso, razon: str = ""):
-        """Marca un proceso como finalizado y registra el timestamp"""
-        proceso.estado = "Finalizado"
-        proceso.tiempo_estado = 0
-        proceso.tiempo_finalizado = time.time()
-        
-        # Incrementar contador persistente de finalizados
-        self.total_finalizados_historico += 1
-        
-        # Si es un PID especial, marcarlo para conversión automática a zombi en 4 segundos
-        if proceso.pid in self.pids_especiales:
-            self.finalizados_pendientes_zombi[proceso.pid] = time.time()
-            self._log(f"⭐ PID {proceso.pid} es ESPECIAL - programado para zombi en 4 segundos")
-        else:
-            self._log(f"📋 PID {proceso.pid} es NORMAL - será eliminado en 3 ticks")
-        
-        msg = f"PID {proceso.pid} finalizado"
-        if razon:
-            msg += f" ({razon})"
-        self._log(msg + ".")
-        
-        # Debug: mostrar estado de PIDs especiales
-        self._log(f"📊 PIDs especiales actuales: {self.pids_especiales}")
-        self._log(f"📊 Pendientes para zombi: {list(self.finalizados_pendientes_zombi.keys())}")
-
-    def _distribuir_recursos_sistema(self):
-        """Distribuye recursos aleatoriamente entre procesos pero respetando límites del sistema"""
-        # Primero, asignar recursos base según estado
-        for proceso in self.procesos.values():
-            if proceso.estado == "Nuevo":
-                proceso.cpu_percent = 0.0
-                proceso.memoria_mb = 5.0  # Estructuras base
-                proceso.disco_percent = 0.0
-                
-            elif proceso.estado == "Listo":
-                proceso.cpu_percent = 0.0  # No ejecuta aún
-                proceso.memoria_mb = random.uniform(10.0, 50.0)  # Memoria reservada
-                proceso.disco_percent = 0.0
-                
-            elif proceso.estado == "Ejecución":
-                # ASIGNAR CPU DIRECTAMENTE AQUÍ
-                cpu_asignada = random.uniform(15.0, 45.0)
-                proceso.cpu_percent = cpu_asignada
-                proceso.memoria_mb = random.uniform(50.0, 200.0)  # Memoria para ejecución
-                # Disco (40% probabilidad de usar)
-                if random.random() < 0.4:
-                    proceso.disco_percent = random.uniform(5.0, 25.0)
-                else:
-                    proceso.disco_percent = 0.0
-                
-            elif proceso.estado == "Bloqueado":
-                proceso.cpu_percent = 0.0  # No ejecuta
-                # Mantiene la memoria que tenía (no la cambio aquí)
-                if proceso.memoria_mb == 0:  # Si es la primera vez
-                    proceso.memoria_mb = random.uniform(30.0, 100.0)
-                proceso.disco_percent = 0.0  # Esperando evento externo
-                
-            elif proceso.estado == "Finalizado":
-                proceso.cpu_percent = 0.0
-                proceso.memoria_mb = 0.0  # Se libera
-                proceso.disco_percent = 0.0
-                
-            elif proceso.estado == "Zombi":
-                proceso.cpu_percent = 0.0  # NUNCA consume CPU
-                proceso.memoria_mb = 1.0   # Solo entrada en tabla de procesos
-                proceso.disco_percent = 0.0
-        
-        # Normalizar CPU para que no exceda 100% total
-        procesos_ejecutando = [p for p in self.procesos.values() if p.estado == "Ejecución"]
-        if procesos_ejecutando:
-            cpu_total = sum(p.cpu_percent for p in procesos_ejecutando)
-            if cpu_total > 100.0:
-                factor_cpu = 100.0 / cpu_total
-                for proceso in procesos_ejecutando:
-                    proceso.cpu_percent *= factor_cpu
-            
-            # Normalizar disco si excede 100%
-            disco_total = sum(p.disco_percent for p in procesos_ejecutando if p.disco_percent > 0)
-            if disco_total > 100.0:
-                factor_disco = 100.0 / disco_total
-                for proceso in procesos_ejecutando:
-                    if proceso.disco_percent > 0:
-                        proceso.disco_percent *= factor_disco
-        
-        # Verificar límite de memoria total
-        memoria_total = sum(p.memoria_mb for p in self.procesos.values())
-        if memoria_total > self.memoria_total_disponible:
-            # Escalar proporcionalmente
-            factor = self.memoria_total_disponible / memoria_total
-            for proceso in self.procesos.values():
-                if proceso.memoria_mb > 0:
-                    proceso.memoria_mb *= factor
-
     # ---------- Acciones ----------
-    def _crear_proceso(self, nombre: Optional[str] = None, automatizado: Optional[bool] = None):
+    # Se encolan como comandos; el hilo del motor los aplica entre ticks y
+    # publica una instantánea nueva que se dibuja en el siguiente cuadro.
+    def _crear_proceso(self, nombre: Optional[str] = None):
         # Si se proporciona un nombre específico (como "System"), usarlo
         # Si no, usar el nombre del campo de entrada para procesos manuales
         if nombre is None:
             # Proceso manual desde el botón - usar el campo de texto
             nombre = self.ent_nombre.get() or "Tarea"
-        # Todos los procesos son automáticos por defecto
-        automatizado = True
-        pid = next_pid()
-        p = Proceso(
-            pid=pid,
-            nombre=f"{nombre}-{pid}",
-            automatizado=automatizado,
-        )
-        
-        # Asignar tiempos automáticamente para simular SO real
-        p.duracion_ejecucion = generar_tiempo_ejecucion_variado()  # 4, 7, 9 ticks para ejecución
-        p.tiempo_admision = generar_tiempo_admision_variado()      # Siempre 3 ticks
-        p.tiempo_espera_cpu = generar_tiempo_espera_cpu()          # 4, 7, 9 ticks para espera CPU
-        p.tiempo_bloqueo = generar_tiempo_bloqueo()                # 3-5 ticks para bloqueo
-        
-        # Inicializar recursos básicos según estado inicial
-        if p.estado == "Nuevo":
-            p.cpu_percent = 0.0
-            p.memoria_mb = 5.0
-            p.disco_percent = 0.0
-        
-        self.procesos[pid] = p
-        
-        # Actualizar PIDs especiales según la proporción 1:6
-        self._actualizar_pids_especiales()
-        
-        self._log(f"Creado proceso {p.nombre} (PID={pid}, Nuevo→Listo: {p.tiempo_admision}t, Listo→Ejec: {p.tiempo_espera_cpu}t, Duración: {p.duracion_ejecucion}t). Estado: Nuevo.")
-
-        self._refrescar_tree()
+        self.motor_hilo.enviar(lambda motor: motor.crear_proceso(nombre))
 
     def _crear_varios(self, n: int):
-        for _ in range(n):
-            self._crear_proceso()
+        # Un solo comando: un rango de PIDs, una línea de log y un redibujo
+        nombre = self.ent_nombre.get() or "Tarea"
+        self.motor_hilo.enviar(lambda motor: motor.crear_procesos(n, nombre))
 
     def _admitir_seleccionados(self):
-        for pid in self._selected_pids():
-            p = self.procesos.get(pid)
-            if p and p.estado == "Nuevo":
-                self.planificador.admitir(p)
-                self._log(f"Admitido manualmente a Listo: PID {pid}.")
-        self._refrescar_tree()
+        pids = self._selected_pids()
+        self.motor_hilo.enviar(lambda motor: motor.admitir(pids))
 
     def _admitir_todos_nuevos(self):
-        for p in self.procesos.values():
-            if p.estado == "Nuevo":
-                self.planificador.admitir(p)
-        self._log("Todos los 'Nuevo' admitidos a Listo.")
-        self._refrescar_tree()
+        self.motor_hilo.enviar(lambda motor: motor.admitir_todos_nuevos())
 
     def _forzar_ejec_sel(self):
         sel = self._selected_pids()
         if not sel:
             return
-        pid = sel[0]
-        p = self.procesos.get(pid)
-        if not p:
-            return
-        
-        # FIFO ESTRICTO: Solo permitir ejecutar si es el primero en la cola de Listo
-        if p.estado == "Listo":
-            if not self.planificador.cola_listos or self.planificador.cola_listos[0] != pid:
-                self._log(f"ERROR FIFO: El proceso {pid} no es el primero en la cola de Listo")
-                return
-        elif p.estado == "Nuevo":
-            # Si está en Nuevo, primero admitirlo a Listo
-            self.planificador.admitir(p)
-            self._log(f"Proceso {pid} admitido a Listo desde Nuevo")
-            return
-        else:
-            self._log(f"ERROR: El proceso {pid} no puede ejecutar desde estado {p.estado}")
-            return
-        
-        # Preempt actual si hay uno ejecutando
-        if self.planificador.en_ejecucion is not None and self.planificador.en_ejecucion != pid:
-            actual = self.procesos.get(self.planificador.en_ejecucion)
-            if actual and actual.estado == "Ejecución":
-                actual.estado = "Listo"
-                actual.tiempo_estado = 0
-                self.planificador.cola_listos.insert(0, actual.pid)
-        
-        # Quitar de cola listos y ejecutar (solo si es el primero)
-        self.planificador.cola_listos.pop(0)  # Quitar el primer elemento
-        p.estado = "Ejecución"
-        p.tiempo_estado = 0
-        if p.duracion_ejecucion <= 0:
-            p.duracion_ejecucion = generar_duracion_ejecucion_variada()
-        self.planificador.en_ejecucion = p.pid
-        self._log(f"Proceso {pid} ejecutando (FIFO respetado)")
-        self._log(f"Forzado a Ejecución: PID {p.pid}.")
-        self._refrescar_tree()
+        self.motor_hilo.enviar(lambda motor: motor.forzar_ejecucion(sel[0]))
 
     def _finalizar_sel(self):
-        for pid in self._selected_pids():
-            p = self.procesos.get(pid)
-            if not p:
-                continue
-            if self.planificador.en_ejecucion == pid:
-                self.planificador.en_ejecucion = None
-            self._finalizar_proceso(p, "manualmente")
-        self._refrescar_tree()
+        pids = self._selected_pids()
+        self.motor_hilo.enviar(lambda motor: motor.finalizar(pids))
 
     def _crear_zombi(self):
-        for pid in self._selected_pids():
-            p = self.procesos.get(pid)
-            if not p:
-                continue
-            if self.planificador.en_ejecucion == pid:
-                self.planificador.en_ejecucion = None
-            p.estado = "Zombi"
-            p.tiempo_estado = 0
-            p.linger_zombi = generar_linger_zombi_variado()
-            self._log(f"PID {pid} enviado a Zombi (linger={p.linger_zombi}).")
-        self._refrescar_tree()
+        pids = self._selected_pids()
+        self.motor_hilo.enviar(lambda motor: motor.enviar_a_zombi(pids))
 
     def _recolectar_zombis(self):
-        reco = 0
-        for p in self.procesos.values():
-            if p.estado == "Zombi":
-                self._finalizar_proceso(p, "recolección manual de zombi")
-                reco += 1
-        if reco:
-            self._log(f"Recolectados {reco} zombi(s) manualmente.")
-        self._refrescar_tree()
+        self.motor_hilo.enviar(lambda motor: motor.recolectar_zombis())
 
     def _kill_zombi(self):
         """Kill solo UN zombi a la vez (el más antiguo por PID)"""
-        zombis = [p for p in self.procesos.values() if p.estado == "Zombi"]
-        
-        if not zombis:
-            self._log("No hay zombis para eliminar.")
-            return
-        
-        # Eliminar el zombi más antiguo (menor PID)
-        zombi_mas_antiguo = min(zombis, key=lambda x: x.pid)
-        pid_eliminado = zombi_mas_antiguo.pid
-        
-        # Verificar si era un proceso automático antes de eliminarlo
-        era_automatico = pid_eliminado in self.procesos_automaticos
-        
-        del self.procesos[pid_eliminado]
-        
-        # Si era automático, decrementar contador y remover de la lista
-        if era_automatico:
-            self.procesos_automaticos.remove(pid_eliminado)
-            self.auto_process_counter -= 1
-            self._log(f"🤖 Proceso automático PID {pid_eliminado} eliminado. Contador: {self.auto_process_counter}/{self.max_auto_processes}")
-        
-        # Remover de PIDs especiales si estaba ahí
-        if pid_eliminado in self.pids_especiales:
-            self.pids_especiales.remove(pid_eliminado)
-        
-        # Actualizar proporción de PIDs especiales
-        self._actualizar_pids_especiales()
-        
-        self._log(f"💀 KILL: Zombi PID {pid_eliminado} eliminado definitivamente del sistema.")
-        self._refrescar_tree()
+        self.motor_hilo.enviar(lambda motor: motor.kill_zombi())
+
+    def _alternar_hud(self):
+        """Muestra u oculta el overlay; el perfilador se crea una vez y no se reemplaza
+        (así una captura de "Perfilar" en curso termina y vuelca igual)"""
+        activo = self.hud_activo.get()
+        if activo:
+            self.motor_hilo.enviar(lambda motor: motor.activar_perfilador())
+        if self.lbl_hud is None:
+            self.lbl_hud = tk.Label(self.panel_procesos, font=("Consolas", 8), justify="left", anchor="nw",
+                                    bg="#1E1E1E", fg="#9CDCFE", padx=6, pady=4)
+        if activo:
+            self.lbl_hud.configure(text="Midiendo...")
+            self.lbl_hud.place(relx=1.0, y=24, x=-20, anchor="ne")
+        else:
+            self.lbl_hud.place_forget()
+
+    def _perfilar_ventana(self, ticks: int = 200):
+        """Captura cProfile de los próximos ticks y lo vuelca a perfil_<hora>.prof/.folded"""
+        ruta_base = time.strftime("perfil_%Y%m%d_%H%M%S")
+        logs = self.motor_hilo.logs
+
+        def al_terminar(rutas):
+            logs.put(f"🔬 Perfil de {ticks} ticks guardado: {rutas[0]} (cProfile) y {rutas[1]} (pilas plegadas)")
+
+        self.motor_hilo.enviar(
+            lambda motor: motor.activar_perfilador().solicitar_perfil(ticks, ruta_base, al_terminar))
+        self._log(f"🔬 Perfilando los próximos {ticks} ticks...")
+
+    def _actualizar_hud(self, inst: Instantanea):
+        lineas = [f"{inst.ticks_por_segundo:8.1f} ticks/s",
+                  f"{'fase':<18}{'media':>8}{'p99':>8}"]
+        for fase, media_ms, p99_ms, _suma, _cantidad in inst.perfil:
+            lineas.append(f"{fase:<18}{media_ms:8.3f}{p99_ms:8.3f}")
+        lineas.append(f"{'redibujo':<18}{self.redibujo.costo_ms:8.3f}{self.redibujo.ultimo_costo_ms:8.3f}")
+        lineas.append(f"cuadro {self.redibujo.frame_ms} ms (ms; redibujo: media/último)")
+        self.lbl_hud.configure(text="\n".join(lineas))
+
+    def _sincronizar_auto_progreso(self):
+        valor = self.auto_progress.get()
+        self.motor_hilo.enviar(lambda motor: setattr(motor, "auto_progreso", valor))
 
     def _actualizar_botones_control(self):
         """Actualiza el estado de los botones según si la simulación está corriendo"""
@@ -821,352 +548,133 @@ class TaskManagerApp(tk.Tk):
             self.cpu_corriendo = True
             self._actualizar_botones_control()
             self._log("🚀 Simulación iniciada - El tiempo comenzó a correr")
-            self._tick_loop()
+            self.motor_hilo.reanudar()
 
     def _stop_cpu(self):
         self.cpu_corriendo = False
+        self.motor_hilo.pausar()
         self._actualizar_botones_control()
         self._log("⏸ Simulación pausada - El tiempo se detuvo")
 
-    # ---------- Bucle principal de ticks ----------
-    def _tick_loop(self):
-        if not self.cpu_corriendo:
-            return
-
-        # 0) Verificar que tengamos PIDs especiales según proporción dinámica
-        if self.procesos:
-            total_procesos = len(self.procesos)
-            zombis_objetivo = (total_procesos + 8) // 9  # 1 por cada grupo de 9
-            if len(self.pids_especiales) < zombis_objetivo:
-                self._log(f"⚠️ Faltan PIDs especiales ({len(self.pids_especiales)}/{zombis_objetivo}), actualizando...")
-                self._actualizar_pids_especiales()
-
-        # 0.1) Creación automática de procesos cada 5-6 ticks (máximo 3)
-        self.auto_process_timer += 1
-        if (self.auto_process_counter < self.max_auto_processes and 
-            self.auto_process_timer >= self.auto_process_interval):
-            # Crear proceso automático con nombre "System"
-            pid_anterior = max(self.procesos.keys()) if self.procesos else 0
-            self._crear_proceso(nombre="System")
-            # Encontrar el nuevo PID creado y agregarlo a la lista de automáticos
-            nuevo_pid = max(self.procesos.keys())
-            if nuevo_pid != pid_anterior:
-                self.procesos_automaticos.add(nuevo_pid)
-            
-            self.auto_process_counter += 1
-            self.auto_process_timer = 0
-            self.auto_process_interval = random.randint(5, 6)  # Nuevo intervalo aleatorio
-            self._log(f"🤖 Proceso automático creado ({self.auto_process_counter}/{self.max_auto_processes}) - PID {nuevo_pid}")
-
-        # 1) Cambios automáticos de estado
-        if self.auto_progress.get():
-            # Nuevo -> Listo ESTRICTAMENTE SECUENCIAL (tiempo variable: 4, 5, 7 ticks)
-            procesos_nuevos = [p for p in self.procesos.values() if p.estado == "Nuevo"]
-            
-            # Incrementar tiempo solo del proceso con menor PID en Nuevo
-            if procesos_nuevos:
-                proceso_siguiente = min(procesos_nuevos, key=lambda x: x.pid)
-                proceso_siguiente.tiempo_estado += 1
-                
-                # Cambiar a Listo cuando alcance su tiempo de admisión
-                if proceso_siguiente.tiempo_estado >= proceso_siguiente.tiempo_admision:
-                    self.planificador.admitir(proceso_siguiente)
-                    self._log(f"PID {proceso_siguiente.pid}: Nuevo → Listo ({proceso_siguiente.tiempo_admision} ticks)")
-
-            # Listo -> Ejecución: solo el primero en cola (tiempo variable)
-            for p in self.procesos.values():
-                if p.estado == "Listo":
-                    p.tiempo_estado += 1
-
-            # Asignar CPU con PRIORIDAD POR ANTIGÜEDAD (aging anti-starvation)
-            if self.planificador.en_ejecucion is None and self.planificador.cola_listos:
-                
-                # 1. Buscar procesos con MUCHO tiempo esperando (20+ ticks) - PRIORIDAD
-                procesos_hambrientos = []
-                for pid in self.planificador.cola_listos:
-                    p = self.procesos.get(pid)
-                    if p and p.estado == "Listo" and p.tiempo_estado >= 20:
-                        procesos_hambrientos.append(p)
-                
-                # 2. Si hay procesos hambrientos, dar prioridad al más antiguo
-                if procesos_hambrientos:
-                    proceso_elegido = min(procesos_hambrientos, key=lambda x: x.pid)  # Más antiguo por PID
-                    # Mover al frente de la cola para darle prioridad inmediata
-                    self.planificador.cola_listos.remove(proceso_elegido.pid)
-                    self.planificador.cola_listos.insert(0, proceso_elegido.pid)
-                    self._log(f"🚨 AGING: PID {proceso_elegido.pid} promovido por hambruna ({proceso_elegido.tiempo_estado} ticks esperando)")
-                
-                # 3. Ejecutar el primer proceso de la cola (FIFO normal o proceso promovido)
-                pid_primero = self.planificador.cola_listos[0]
-                p_primero = self.procesos.get(pid_primero)
-                if p_primero and p_primero.estado == "Listo" and p_primero.tiempo_estado >= p_primero.tiempo_espera_cpu:
-                    # Ha esperado suficiente, puede ejecutar
-                    self.planificador.cola_listos.pop(0)
-                    p_primero.estado = "Ejecución"
-                    p_primero.tiempo_estado = 0
-                    if p_primero.duracion_ejecucion <= 0:
-                        p_primero.duracion_ejecucion = generar_duracion_ejecucion_variada()
-                    self.planificador.en_ejecucion = p_primero.pid
-                    
-                    # Marcar si fue por aging y registrar
-                    es_por_aging = p_primero.pid in [p.pid for p in procesos_hambrientos]
-                    if es_por_aging:
-                        self.planificador.proceso_con_prioridad = p_primero.pid
-                    
-                    tipo_asignacion = "AGING" if es_por_aging else "FIFO"
-                    self._log(f"PID {p_primero.pid}: Listo → Ejecución ({tipo_asignacion}, esperó {p_primero.tiempo_estado + p_primero.tiempo_espera_cpu} ticks total)")
-
-            # Ejecución -> Bloqueado/Zombi/Finalizado (tiempo variable)
-            pid = self.planificador.en_ejecucion
-            if pid is not None:
-                p = self.procesos.get(pid)
-                if p and p.estado == "Ejecución":
-                    p.tiempo_estado += 1
-                    
-                    # Calcular probabilidad de bloqueo basada en la CARGA del sistema
-                    procesos_esperando = len(self.planificador.cola_listos)
-                    ya_hay_bloqueados = len(self.planificador.procesos_bloqueados) > 0
-                    
-                    # Probabilidad aumenta con más procesos esperando (simulando contención de recursos)
-                    probabilidad_base = 0.02  # 2% base
-                    factor_carga = min(procesos_esperando * 0.015, 0.08)  # Máximo 8% adicional
-                    probabilidad_bloqueo = probabilidad_base + factor_carga
-                    
-                    # Condiciones para bloqueo:
-                    # 1. Debe haber procesos esperando
-                    # 2. NO debe haber otros procesos ya bloqueados
-                    # 3. Debe haber ejecutado al menos 3 ticks
-                    # 4. Probabilidad variable según carga del sistema
-                    puede_bloquear = (procesos_esperando > 0 and 
-                                    not ya_hay_bloqueados and 
-                                    p.tiempo_estado >= 3 and 
-                                    random.random() < probabilidad_bloqueo)
-                    
-                    if puede_bloquear:
-                        # Si este proceso tenía prioridad, limpiar la marca antes de bloquearlo
-                        if self.planificador.proceso_con_prioridad == p.pid:
-                            self.planificador.proceso_con_prioridad = None
-                            self._log(f"🔓 PRIORIDAD LIBERADA: PID {p.pid} se bloqueó, procesos bloqueados pueden cambiar de estado")
-                        
-                        # Bloquear el proceso con dependencias
-                        self.planificador.bloquear_proceso(p, self.procesos)
-                        
-                        # Log con información de dependencia
-                        if p.proceso_dependencia:
-                            proceso_dep = self.procesos.get(p.proceso_dependencia)
-                            estado_dep = proceso_dep.estado if proceso_dep else "DESCONOCIDO"
-                            self._log(f"PID {p.pid}: Ejecución → Bloqueado (I/O, depende de PID {p.proceso_dependencia} [{estado_dep}])")
-                        else:
-                            self._log(f"PID {p.pid}: Ejecución → Bloqueado (I/O independiente, prob={probabilidad_bloqueo:.1%})")
-                    elif p.tiempo_estado >= p.duracion_ejecucion:
-                        # Terminar normalmente
-                        self.planificador.en_ejecucion = None
-                        
-                        # Si este proceso terminó y tenía prioridad, limpiar la marca
-                        if self.planificador.proceso_con_prioridad == p.pid:
-                            self.planificador.proceso_con_prioridad = None
-                            self._log(f"🔓 PRIORIDAD LIBERADA: PID {p.pid} terminó, procesos bloqueados pueden cambiar de estado")
-                        
-                        # TODOS los procesos van primero a Finalizado
-                        # Solo los PIDs especiales se convertirán en zombi después de 4 segundos
-                        self._finalizar_proceso(p, f"{p.duracion_ejecucion} ticks completados")
-            
-            # Bloqueado -> Listo (SOLO si no hay proceso con prioridad ejecutándose)
-            for p in self.procesos.values():
-                if p.estado == "Bloqueado":
-                    p.tiempo_estado += 1
-                    if p.tiempo_estado >= p.tiempo_bloqueo:
-                        # Verificar condiciones para desbloqueo
-                        hay_proceso_prioritario = self.planificador.proceso_con_prioridad is not None
-                        
-                        # Verificar dependencia del proceso
-                        dependencia_resuelta = True
-                        if p.proceso_dependencia:
-                            proceso_dependencia = self.procesos.get(p.proceso_dependencia)
-                            if proceso_dependencia and proceso_dependencia.estado in ["Listo", "Ejecución"]:
-                                dependencia_resuelta = False  # Aún depende de un proceso activo
-                            else:
-                                # La dependencia terminó (Finalizado/Zombi) o no existe, se resuelve
-                                dependencia_resuelta = True
-                        
-                        if not hay_proceso_prioritario and dependencia_resuelta:
-                            # No hay prioridad activa y dependencia resuelta, puede desbloquearse
-                            self.planificador.desbloquear_proceso(p)
-                            if p.proceso_dependencia:
-                                self._log(f"PID {p.pid}: Bloqueado → Listo (dependencia PID {p.proceso_dependencia} resuelta)")
-                            else:
-                                self._log(f"PID {p.pid}: Bloqueado → Listo ({p.tiempo_bloqueo} ticks, sin dependencia)")
-                        elif hay_proceso_prioritario:
-                            # Hay proceso prioritario, debe esperar
-                            pid_prioritario = self.planificador.proceso_con_prioridad
-                            self._log(f"⏳ PID {p.pid}: Listo para cambiar, esperando proceso prioritario PID {pid_prioritario}")
-                        elif not dependencia_resuelta:
-                            # Dependencia aún activa, debe esperar
-                            proceso_dep = self.procesos.get(p.proceso_dependencia)
-                            estado_dep = proceso_dep.estado if proceso_dep else "INEXISTENTE"
-                            self._log(f"🔗 PID {p.pid}: Esperando dependencia PID {p.proceso_dependencia} [{estado_dep}]")
-
-        # 2) Los zombis permanecen para siempre - NO se recolectan automáticamente
-        # Solo pueden ser eliminados manualmente con el botón "Kill Zombi"
-        for p in self.procesos.values():
-            if p.estado == "Zombi":
-                p.tiempo_estado += 1  # Solo incrementar contador, no hacer nada más
-
-        # 3) Incrementar tiempo de procesos Finalizados (para auto-eliminación)
-        for p in self.procesos.values():
-            if p.estado == "Finalizado":
-                p.tiempo_estado += 1
-
-        # 4) Revisar PIDs especiales finalizados para conversión automática a zombi (4 segundos)
-        tiempo_actual = time.time()
-        pids_a_convertir_zombi = []
-        
-        # Debug: mostrar PIDs pendientes y sus tiempos
-        if self.finalizados_pendientes_zombi:
-            self._log(f"⏰ Revisando PIDs pendientes para zombi:")
-            for pid, tiempo_finalizacion in self.finalizados_pendientes_zombi.items():
-                tiempo_transcurrido = tiempo_actual - tiempo_finalizacion
-                self._log(f"   PID {pid}: {tiempo_transcurrido:.1f}s transcurridos (necesita 4s)")
-        
-        for pid, tiempo_finalizacion in list(self.finalizados_pendientes_zombi.items()):
-            tiempo_transcurrido = tiempo_actual - tiempo_finalizacion
-            if tiempo_transcurrido >= 4:  # 4 segundos
-                pids_a_convertir_zombi.append(pid)
-                self._log(f"✅ PID {pid} listo para conversión a zombi ({tiempo_transcurrido:.1f}s >= 4s)")
-        
-        # Convertir PIDs especiales a zombi automáticamente
-        for pid in pids_a_convertir_zombi:
-            if pid in self.procesos:
-                p = self.procesos[pid]
-                if p.estado == "Finalizado":
-                    p.estado = "Zombi"
-                    p.tiempo_estado = 0
-                    p.linger_zombi = generar_linger_zombi_variado()
-                    self._log(f"PID {pid}: Finalizado → Zombi (conversión automática)")
-                del self.finalizados_pendientes_zombi[pid]
-        
-        # 5) Eliminar procesos finalizados después de 3 ticks (procesos normales) o conversión a zombi (PIDs especiales)
-        pids_a_eliminar = []
-        for p in self.procesos.values():
-            if p.estado == "Finalizado":
-                if p.pid not in self.pids_especiales:
-                    # Proceso normal: eliminar después de 3 ticks
-                    if p.tiempo_estado >= 3:
-                        pids_a_eliminar.append(p.pid)
-                else:
-                    # PID especial: usar tiempo real para conversión a zombi (4 segundos)
-                    if p.tiempo_finalizado > 0:
-                        tiempo_transcurrido = tiempo_actual - p.tiempo_finalizado
-                        if tiempo_transcurrido >= 80:
-                            # PID especial encontrado después de 80 segundos - verificar si ya se convirtió
-                            self._log(f"🛡️ PID {p.pid} protegido (PID especial en Finalizado, esperando conversión a zombi)")
-        
-        # Eliminar SOLO los procesos normales (no PIDs especiales)
-        for pid in pids_a_eliminar:
-            if pid in self.procesos:
-                proceso_eliminado = self.procesos[pid]
-                
-                # Verificar si era un proceso automático antes de eliminarlo
-                era_automatico = pid in self.procesos_automaticos
-                
-                del self.procesos[pid]
-                
-                # Si era automático, decrementar contador y remover de la lista
-                if era_automatico:
-                    self.procesos_automaticos.remove(pid)
-                    self.auto_process_counter -= 1
-                    self._log(f"🤖 Proceso automático PID {pid} eliminado. Contador: {self.auto_process_counter}/{self.max_auto_processes}")
-                
-                self._log(f"PID {pid} ({proceso_eliminado.nombre}) eliminado automáticamente tras 3 ticks (proceso normal).")
-        
-        # Actualizar proporción de PIDs especiales después de eliminar procesos
-        if pids_a_eliminar:
-            self._actualizar_pids_especiales()
-
-        # 5.5) Actualizar y distribuir recursos del sistema respetando límites
-        self._distribuir_recursos_sistema()
-
-        # 6) Refrescar vista
-        self._refrescar_tree()
-
-        # Programar siguiente tick
-        self.after(self.tick_ms, self._tick_loop)
+    def _cerrar(self):
+        if self.servidor_metricas is not None:
+            self.servidor_metricas.detener()
+        if self.servidor_control is not None:
+            self.servidor_control.detener()
+        self.motor_hilo.detener()
+        self.destroy()
 
     # ---------- Refresco de Treeview ----------
-    def _refrescar_tree(self):
-        # Sync items - solo mostrar procesos que no estén en estado "Nuevo"
-        existentes = set(self.tree.get_children())
-        por_pid = {self.tree.set(i, "PID"): i for i in existentes}
-
-        # Filtrar procesos: mostrar solo desde "Listo" en adelante
-        procesos_visibles = [p for p in self.procesos.values() if p.estado != "Nuevo"]
-
-        # actualizar/insertar solo procesos visibles
-        for p in procesos_visibles:
-            row = p.to_row()
-            pid_str = str(p.pid)
-            if pid_str in por_pid:
-                iid = por_pid[pid_str]
-                # Actualizar TODAS las columnas incluyendo CPU, Memoria, Disco
-                columnas = ("PID", "Nombre", "Estado", "Tiempo", "Duración", "CPU", "Memoria", "Disco")
-                for col, val in zip(columnas, row):
-                    self.tree.set(iid, col, val)
-                # actualizar tag de color según estado
-                self.tree.item(iid, tags=(p.estado,))
+    def _refrescar_tree(self, inst: Instantanea):
+        # La instantánea solo trae procesos que no estén en estado "Nuevo";
+        # la vista devuelve únicamente las filas que cambiaron desde la anterior
+        cambiadas, eliminados = self.vista.actualizar(inst.filas)
+        for pid in eliminados:
+            self.tree.delete(self.iids.pop(pid))
+        for row in cambiadas:
+            pid = int(row[0])
+            iid = self.iids.get(pid)
+            if iid is None:
+                self.iids[pid] = self.tree.insert("", "end", values=row, tags=(row[2],))
             else:
-                iid = self.tree.insert("", "end", values=row, tags=(p.estado,))
-                por_pid[pid_str] = iid
-
-        # eliminar los que ya no existen o están en estado "Nuevo"
-        pids_visibles = {str(p.pid) for p in procesos_visibles}
-        for pid_str, iid in list(por_pid.items()):
-            if pid_str not in pids_visibles:
-                self.tree.delete(iid)
-                del por_pid[pid_str]
+                # una sola llamada por fila: todas las columnas y el tag de color según estado
+                self.tree.item(iid, values=row, tags=(row[2],))
+        visibles = self._reordenar_tree()
 
         # actualizar resumen
-        total = len(self.procesos)
-        total_visibles = len(procesos_visibles)
-        por_estado: Dict[str, int] = {e: 0 for e in ESTADOS}
-        for p in self.procesos.values():
-            por_estado[p.estado] = por_estado.get(p.estado, 0) + 1
+        por_estado: Dict[str, int] = dict(inst.por_estado)
         
         # Mostrar estadísticas con contador persistente para Finalizado
         resumen_partes = []
         for e in ESTADOS:
             if e == "Finalizado":
                 # Usar contador persistente para finalizados
-                resumen_partes.append(f"{e}: {self.total_finalizados_historico}")
+                resumen_partes.append(f"{e}: {inst.total_finalizados}")
             else:
                 resumen_partes.append(f"{e}: {por_estado.get(e, 0)}")
         
         resumen = " | ".join(resumen_partes)
-        self.lbl_stats.configure(text=f"Total: {total} procesos | Visibles: {total_visibles} | {resumen}")
+        self.lbl_stats.configure(text=f"Total: {inst.total} procesos | Visibles: {visibles} | {resumen}")
         
         # Actualizar recursos totales del sistema
-        cpu_total = sum(p.cpu_percent for p in self.procesos.values())
-        memoria_total = sum(p.memoria_mb for p in self.procesos.values())
-        disco_total = sum(p.disco_percent for p in self.procesos.values())
-        
-        recursos_text = (f"Recursos del Sistema: CPU: {cpu_total:.1f}% | "
-                        f"RAM: {memoria_total:.0f} MB/{self.memoria_total_disponible:.0f} MB | "
-                        f"Disco: {disco_total:.1f}%")
+        recursos_text = (f"Recursos del Sistema: CPU: {inst.cpu_total:.1f}% | "
+                        f"RAM: {inst.memoria_total:.0f} MB/{inst.memoria_total_disponible:.0f} MB | "
+                        f"Disco: {inst.disco_total:.1f}%")
         self.lbl_recursos.configure(text=recursos_text)
+        
+        # Métricas de admisión
+        admision_text = (f"Admisión: espera en Nuevo prom {inst.espera_nuevo_promedio:.1f}t "
+                         f"(máx {inst.espera_nuevo_maxima}t) | Rechazos: {inst.rechazos_admision} | "
+                         f"Comprometida: {inst.memoria_comprometida:.0f}/{inst.presupuesto_memoria_mb:.0f} MB"
+                         f"{' | 🚧 CONTRAPRESIÓN' if inst.admision_retenida else ''}")
+        self.lbl_admision.configure(text=admision_text)
+
+    def _reordenar_tree(self) -> int:
+        """Deja en el Treeview solo las filas filtradas, en el orden de la vista; devuelve cuántas son"""
+        orden = [self.iids[pid] for pid in self.vista.visibles()]
+        if orden != self._orden_mostrado:
+            # set_children reubica y desprende (sin borrar) en una sola llamada a Tk
+            self.tree.set_children("", *orden)
+            self._orden_mostrado = orden
+        return len(orden)
+
+    def _ordenar_por(self, columna: str):
+        self.vista.ordenar_por(columna)
+        flecha = " ▼" if self.vista.descendente else " ▲"
+        for col in self.tree["columns"]:
+            texto = "Duración Ejec." if col == "Duración" else col
+            self.tree.heading(col, text=texto + (flecha if col == columna else ""))
+        self._reordenar_tree()
+
+    def _aplicar_filtros(self):
+        estado = self.filtro_estado.get()
+        self.vista.filtrar(None if estado == "Todos" else estado, self.filtro_texto.get())
+        self._reordenar_tree()
+
+    def _sondear_motor(self):
+        """Invalida la vista si el motor publicó algo; no dibuja por sí mismo"""
+        if not self.motor_hilo.instantaneas.empty() or not self.motor_hilo.logs.empty():
+            self.redibujo.invalidar()
+        if self.motor_hilo.corriendo != self.cpu_corriendo:
+            # La API de control inició o pausó la simulación: reflejarlo en los botones
+            self.cpu_corriendo = self.motor_hilo.corriendo
+            self._actualizar_botones_control()
+            self._log("🛰️ Simulación " + ("iniciada" if self.cpu_corriendo else "pausada") + " desde la API de control")
+        self.after(self.redibujo.frame_ms, self._sondear_motor)
 
     def _refrescar_ui(self):
-        # botón start/stop
-        self.btn_start.configure(state=("disabled" if self.cpu_corriendo else "normal"))
-        self.btn_stop.configure(state=("normal" if self.cpu_corriendo else "disabled"))
-        # refrescar árbol periódicamente
-        self._refrescar_tree()
-        self.after(500, self._refrescar_ui)
+        """Único punto de redibujo; lo llama ProgramadorRedibujo como mucho una vez por cuadro"""
+        # mensajes del motor acumulados desde el último cuadro
+        mensajes = self.motor_hilo.vaciar_logs()
+        if mensajes:
+            self._log_lote(mensajes)
+        # dibujar solo la instantánea más reciente (las intermedias se descartan)
+        inst = self.motor_hilo.ultima_instantanea()
+        if inst is not None:
+            self.instantanea_actual = inst
+            self._refrescar_tree(inst)
+            if self.hud_activo.get() and inst.perfil:
+                self._actualizar_hud(inst)
+            if self.ventana_graficos is not None:
+                self.ventana_graficos.refrescar()
 
 # ===============================
 # Entrada principal
 # ===============================
 
 def main():
-    app = TaskManagerApp()
+    import argparse
+    parser = argparse.ArgumentParser(description="Mini Administrador de Tareas - SO")
+    parser.add_argument("--metricas-puerto", type=int, default=None,
+                        help="sirve métricas Prometheus en http://127.0.0.1:<puerto>/metrics")
+    parser.add_argument("--control-puerto", type=int, default=None,
+                        help="API de control JSON por líneas en 127.0.0.1:<puerto> (ver api_control.py)")
+    parser.add_argument("--control-unix", default=None, help="API de control en un socket Unix")
+    args = parser.parse_args()
+    if args.control_puerto is not None and args.control_unix is not None:
+        parser.error("usar --control-puerto o --control-unix, no ambos")
+    app = TaskManagerApp(puerto_metricas=args.metricas_puerto, puerto_control=args.control_puerto,
+                         ruta_control=args.control_unix)
     app.mainloop()
 
 if __name__ == "__main__":
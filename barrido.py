@@ -0,0 +1,127 @@
+"""
+Barrido de parámetros en paralelo.
+
+Lanza simulaciones sin ventana (simulador.ejecutar_simulacion) repartidas entre
+los núcleos con ProcessPoolExecutor; cada ejecución usa su propia semilla y los
+resultados se combinan en una sola tabla CSV.
+
+Ejemplo:
+    python barrido.py --aging 10 20 30 --max-auto 3 6 --semillas 5 --ticks 2000 --salida barrido.csv
+    python barrido.py --politica rr --quantum 1 2 4 8 --costo-cambio 0 0.2 0.5 --nucleos 2 --salida costos.csv
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional
+
+from simulador import POLITICAS, ConfiguracionSimulacion, ejecutar_simulacion
+
+
+def generar_configuraciones(base: ConfiguracionSimulacion,
+                            umbrales_aging: Iterable[int],
+                            probs_base: Iterable[float],
+                            probs_por_espera: Iterable[float],
+                            probs_max_carga: Iterable[float],
+                            max_autos: Iterable[int],
+                            procesos_por_especial: Iterable[int],
+                            semillas: int,
+                            politicas: Iterable[str] = (),
+                            quantums: Iterable[int] = (),
+                            costos_cambio: Iterable[float] = ()) -> List[ConfiguracionSimulacion]:
+    """Producto cartesiano de los valores; cada combinación se repite con semillas distintas.
+    Política, quantum y costo de cambio de contexto vacíos = los de `base`."""
+    configuraciones = []
+    combinaciones = itertools.product(umbrales_aging, probs_base, probs_por_espera,
+                                      probs_max_carga, max_autos, procesos_por_especial,
+                                      politicas or [base.politica], quantums or [base.quantum],
+                                      costos_cambio or [base.costo_cambio_contexto])
+    semilla = base.semilla
+    for aging, p_base, p_espera, p_max, max_auto, por_especial, politica, quantum, costo in combinaciones:
+        for _ in range(semillas):
+            configuraciones.append(replace(
+                base,
+                semilla=semilla,
+                umbral_aging=aging,
+                prob_bloqueo_base=p_base,
+                prob_bloqueo_por_espera=p_espera,
+                prob_bloqueo_max_carga=p_max,
+                max_auto_processes=max_auto,
+                procesos_por_especial=por_especial,
+                politica=politica,
+                quantum=quantum,
+                costo_cambio_contexto=costo,
+            ))
+            semilla += 1  # semilla distinta por ejecución
+    return configuraciones
+
+
+def ejecutar_barrido(configuraciones: List[ConfiguracionSimulacion],
+                     workers: Optional[int] = None) -> List[Dict[str, float]]:
+    """Reparte las simulaciones entre procesos y devuelve las filas en el orden de entrada"""
+    if not configuraciones:
+        return []
+    workers = workers or os.cpu_count() or 1
+    # Lotes grandes para amortizar el envío entre procesos en barridos de miles de filas
+    chunksize = max(1, len(configuraciones) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(ejecutar_simulacion, configuraciones, chunksize=chunksize))
+
+
+def escribir_tabla(filas: List[Dict[str, float]], destino):
+    columnas = list(filas[0].keys())
+    escritor = csv.DictWriter(destino, fieldnames=columnas)
+    escritor.writeheader()
+    escritor.writerows(filas)
+
+
+def main(argv: Optional[List[str]] = None):
+    base = ConfiguracionSimulacion()
+    parser = argparse.ArgumentParser(description="Barrido de parámetros del simulador en paralelo")
+    parser.add_argument("--ticks", type=int, default=base.ticks)
+    parser.add_argument("--semilla", type=int, default=base.semilla, help="semilla inicial (se incrementa por ejecución)")
+    parser.add_argument("--semillas", type=int, default=1, help="repeticiones por combinación")
+    parser.add_argument("--aging", type=int, nargs="+", default=[base.umbral_aging])
+    parser.add_argument("--prob-base", type=float, nargs="+", default=[base.prob_bloqueo_base])
+    parser.add_argument("--prob-espera", type=float, nargs="+", default=[base.prob_bloqueo_por_espera])
+    parser.add_argument("--prob-max", type=float, nargs="+", default=[base.prob_bloqueo_max_carga])
+    parser.add_argument("--max-auto", type=int, nargs="+", default=[base.max_auto_processes])
+    parser.add_argument("--por-especial", type=int, nargs="+", default=[base.procesos_por_especial])
+    parser.add_argument("--politica", choices=POLITICAS, nargs="+", default=[base.politica])
+    parser.add_argument("--quantum", type=int, nargs="+", default=[base.quantum])
+    parser.add_argument("--costo-cambio", type=float, nargs="+", default=[base.costo_cambio_contexto],
+                        help="ticks de núcleo por cambio de contexto")
+    parser.add_argument("--costo-cache", type=float, default=base.costo_cache_fria)
+    parser.add_argument("--costo-migracion", type=float, default=base.costo_migracion)
+    parser.add_argument("--nucleos", type=int, default=base.nucleos)
+    parser.add_argument("--procesos-iniciales", type=int, default=base.procesos_iniciales)
+    parser.add_argument("--prob-llegada", type=float, default=base.prob_llegada)
+    parser.add_argument("--workers", type=int, default=None, help="procesos en paralelo (por defecto, todos los núcleos)")
+    parser.add_argument("--salida", default=None, help="archivo CSV (por defecto, salida estándar)")
+    args = parser.parse_args(argv)
+
+    base = replace(base, ticks=args.ticks, semilla=args.semilla,
+                   procesos_iniciales=args.procesos_iniciales, prob_llegada=args.prob_llegada,
+                   nucleos=args.nucleos, costo_cache_fria=args.costo_cache, costo_migracion=args.costo_migracion)
+    configuraciones = generar_configuraciones(base, args.aging, args.prob_base, args.prob_espera,
+                                              args.prob_max, args.max_auto, args.por_especial, args.semillas,
+                                              args.politica, args.quantum, args.costo_cambio)
+
+    inicio = time.perf_counter()
+    filas = ejecutar_barrido(configuraciones, args.workers)
+    duracion = time.perf_counter() - inicio
+
+    if args.salida:
+        with open(args.salida, "w", newline="", encoding="utf-8") as f:
+            escribir_tabla(filas, f)
+    else:
+        escribir_tabla(filas, sys.stdout)
+    print(f"{len(filas)} simulaciones en {duracion:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
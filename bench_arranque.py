@@ -0,0 +1,91 @@
+"""
+Benchmark de arranque.
+
+Lanza procesos nuevos de Python (como al abrir una instancia por
+experimento) y mide, para cada modo, el tiempo de pared desde que se crea
+el proceso hasta que termina y el tiempo interno hasta el hito del modo:
+
+- importar: `import app` (Tkinter, motor y módulos de la interfaz)
+- ventana:  crear TaskManagerApp hasta que la ventana principal está en
+            pantalla (requiere DISPLAY; sin pantalla se informa y se omite)
+- cli:      `python cli.py` con 1 tick, sin Tkinter
+
+Ejemplo:
+    python bench_arranque.py --repeticiones 20 --modos importar cli
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+PROGRAMAS = {
+    "importar": (
+        "import time; t = time.perf_counter(); import app; "
+        "print(time.perf_counter() - t)"
+    ),
+    "ventana": (
+        "import time; t = time.perf_counter(); import app; a = app.TaskManagerApp()\n"
+        "while not a.winfo_ismapped(): a.update()\n"
+        "print(time.perf_counter() - t); a._cerrar()"
+    ),
+    "cli": (
+        "import os, time; t = time.perf_counter(); import cli; "
+        "cli.main(['--ticks', '1', '--salida', os.devnull]); "
+        "print(time.perf_counter() - t)"
+    ),
+}
+
+
+def medir(modo: str) -> Tuple[Optional[float], float, str]:
+    """(tiempo interno en s o None si falló, tiempo de pared en s, error)"""
+    inicio = time.perf_counter()
+    resultado = subprocess.run([sys.executable, "-c", PROGRAMAS[modo]], cwd=DIRECTORIO,
+                               capture_output=True, text=True)
+    pared = time.perf_counter() - inicio
+    if resultado.returncode != 0:
+        ultima = (resultado.stderr.strip().splitlines() or ["error desconocido"])[-1]
+        return None, pared, ultima
+    return float(resultado.stdout.strip().splitlines()[-1]), pared, ""
+
+
+def resumir(valores: List[float]) -> Dict[str, float]:
+    ordenados = sorted(valores)
+    return {
+        "mediana": statistics.median(ordenados),
+        "p90": ordenados[min(len(ordenados) - 1, int(0.9 * len(ordenados)))],
+        "min": ordenados[0],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Mide el tiempo de arranque del simulador")
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("--modos", nargs="+", choices=tuple(PROGRAMAS), default=list(PROGRAMAS))
+    args = parser.parse_args(argv)
+
+    print(f"{'modo':<10}{'interno ms (mediana/p90/mín)':>32}{'proceso ms (mediana/p90/mín)':>32}")
+    for modo in args.modos:
+        internos, paredes = [], []
+        error = ""
+        for _ in range(args.repeticiones):
+            interno, pared, error = medir(modo)
+            if interno is None:
+                break
+            internos.append(interno)
+            paredes.append(pared)
+        if not internos:
+            print(f"{modo:<10}  omitido: {error}")
+            continue
+        i, p = resumir(internos), resumir(paredes)
+        print(f"{modo:<10}{i['mediana'] * 1000:>14.1f}{i['p90'] * 1000:>9.1f}{i['min'] * 1000:>9.1f}"
+              f"{p['mediana'] * 1000:>14.1f}{p['p90'] * 1000:>9.1f}{p['min'] * 1000:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
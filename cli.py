@@ -0,0 +1,160 @@
+"""
+Ejecución por lotes sin ventana.
+
+Corre una simulación con los parámetros dados y escribe el resumen de
+métricas en JSON o CSV y, opcionalmente, las series por tick (CPU, RAM,
+disco, cola de listos y procesos por estado). No importa Tkinter, así que
+arranca rápido y funciona en servidores sin pantalla.
+
+Ejemplo:
+    python cli.py --ticks 5000 --semilla 7 --politica rr --quantum 3 --nucleos 4 --salida resumen.json --series series.csv
+    python cli.py --prob-llegada 0 --grupo /ruidoso:llegada=0.5 --grupo /victima:llegada=0.04 --nucleos 2
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from dataclasses import asdict
+from typing import Dict, List, Optional, TextIO
+
+from grupos import parsear_grupo
+from simulador import POLITICAS, SERIES_HISTORIAL, ConfiguracionSimulacion, MotorSimulacion, ejecutar_simulacion
+
+
+def _formato(ruta: Optional[str], formato: Optional[str]) -> str:
+    if formato:
+        return formato
+    return "csv" if ruta and ruta.lower().endswith(".csv") else "json"
+
+
+def _abrir(ruta: Optional[str]) -> TextIO:
+    return open(ruta, "w", newline="", encoding="utf-8") if ruta else sys.stdout
+
+
+class EscritorSeries:
+    """Vuelca una fila por tick a medida que avanza la simulación (no acumula en memoria)"""
+
+    def __init__(self, destino: TextIO, formato: str):
+        self.destino = destino
+        self.formato = formato
+        self.columnas = ("tick",) + SERIES_HISTORIAL
+        self.filas = 0
+        if formato == "csv":
+            self._csv = csv.writer(destino)
+            self._csv.writerow(self.columnas)
+        else:
+            destino.write("[")
+
+    def __call__(self, motor: MotorSimulacion):
+        if motor.series is None:
+            return
+        ultima = motor.series.ultima
+        valores = [motor.tick_actual] + [ultima.get(nombre, 0.0) for nombre in SERIES_HISTORIAL]
+        if self.formato == "csv":
+            self._csv.writerow(valores)
+        else:
+            separador = ",\n" if self.filas else "\n"
+            self.destino.write(separador + json.dumps(dict(zip(self.columnas, valores)), ensure_ascii=False))
+        self.filas += 1
+
+    def cerrar(self):
+        if self.formato == "json":
+            self.destino.write("\n]\n")
+
+
+def escribir_resumen(resumen: Dict[str, float], config: ConfiguracionSimulacion, destino: TextIO, formato: str):
+    if formato == "csv":
+        # ejecutar_simulacion ya trae la configuración (con los grupos en una sola celda)
+        escritor = csv.DictWriter(destino, fieldnames=list(resumen))
+        escritor.writeheader()
+        escritor.writerow(resumen)
+    else:
+        metricas = {k: v for k, v in resumen.items() if k not in asdict(config)}
+        json.dump({"configuracion": asdict(config), "metricas": metricas}, destino, ensure_ascii=False, indent=2)
+        destino.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    base = ConfiguracionSimulacion()
+    parser = argparse.ArgumentParser(description="Simulación por lotes sin ventana (JSON/CSV)")
+    parser.add_argument("--ticks", type=int, default=base.ticks)
+    parser.add_argument("--semilla", type=int, default=base.semilla)
+    parser.add_argument("--politica", choices=POLITICAS, default=base.politica)
+    parser.add_argument("--quantum", type=int, default=base.quantum, help="ticks por turno con --politica rr")
+    parser.add_argument("--nucleos", type=int, default=base.nucleos)
+    parser.add_argument("--procesos-iniciales", type=int, default=base.procesos_iniciales)
+    parser.add_argument("--prob-llegada", type=float, default=base.prob_llegada)
+    parser.add_argument("--aging", type=int, default=base.umbral_aging)
+    parser.add_argument("--prob-base", type=float, default=base.prob_bloqueo_base)
+    parser.add_argument("--prob-espera", type=float, default=base.prob_bloqueo_por_espera)
+    parser.add_argument("--prob-max", type=float, default=base.prob_bloqueo_max_carga)
+    parser.add_argument("--max-auto", type=int, default=base.max_auto_processes)
+    parser.add_argument("--por-especial", type=int, default=base.procesos_por_especial)
+    parser.add_argument("--grupo", action="append", default=[], metavar="RUTA:OPCIONES",
+                        help="grupo de recursos, p. ej. /web:cuota=200,memoria=1024,disco=30,llegada=0.1 (repetible)")
+    parser.add_argument("--prob-fork", type=float, default=base.prob_fork,
+                        help="probabilidad por tick de que un proceso en ejecución haga fork")
+    parser.add_argument("--prob-sin-wait", type=float, default=base.prob_sin_wait,
+                        help="proporción de hijos que nunca hacen wait() y dejan zombis")
+    parser.add_argument("--costo-cambio", type=float, default=base.costo_cambio_contexto,
+                        help="ticks de núcleo por cambio de contexto")
+    parser.add_argument("--costo-cache", type=float, default=base.costo_cache_fria,
+                        help="ticks extra al volver a un núcleo con la cache fría")
+    parser.add_argument("--costo-migracion", type=float, default=base.costo_migracion,
+                        help="ticks extra al volver en otro núcleo")
+    parser.add_argument("--capacidad-cache", type=int, default=base.capacidad_cache,
+                        help="otros procesos que pueden pasar por el núcleo sin enfriar la cache")
+    parser.add_argument("--salida", default=None, help="archivo del resumen (por defecto, salida estándar)")
+    parser.add_argument("--formato", choices=("json", "csv"), default=None,
+                        help="por defecto según la extensión de --salida (json si no es .csv)")
+    parser.add_argument("--series", default=None, help="archivo con las series por tick")
+    parser.add_argument("--formato-series", choices=("json", "csv"), default=None)
+    args = parser.parse_args(argv)
+
+    if args.nucleos < 1 or args.quantum < 1:
+        parser.error("--nucleos y --quantum deben ser al menos 1")
+    if min(args.costo_cambio, args.costo_cache, args.costo_migracion, args.capacidad_cache) < 0:
+        parser.error("los costos y la capacidad de la cache no pueden ser negativos")
+    for spec in args.grupo:
+        try:
+            parsear_grupo(spec)
+        except ValueError as exc:
+            parser.error(f"--grupo {spec}: {exc}")
+
+    config = ConfiguracionSimulacion(
+        ticks=args.ticks, semilla=args.semilla, umbral_aging=args.aging,
+        prob_bloqueo_base=args.prob_base, prob_bloqueo_por_espera=args.prob_espera,
+        prob_bloqueo_max_carga=args.prob_max, max_auto_processes=args.max_auto,
+        procesos_por_especial=args.por_especial, procesos_iniciales=args.procesos_iniciales,
+        prob_llegada=args.prob_llegada, politica=args.politica, quantum=args.quantum, nucleos=args.nucleos,
+        grupos=tuple(args.grupo), prob_fork=args.prob_fork, prob_sin_wait=args.prob_sin_wait,
+        costo_cambio_contexto=args.costo_cambio, costo_cache_fria=args.costo_cache,
+        costo_migracion=args.costo_migracion, capacidad_cache=args.capacidad_cache,
+    )
+
+    inicio = time.perf_counter()
+    series = None
+    if args.series:
+        destino_series = _abrir(args.series)
+        series = EscritorSeries(destino_series, _formato(args.series, args.formato_series))
+    try:
+        fila = ejecutar_simulacion(config, al_tick=series)
+    finally:
+        if series is not None:
+            series.cerrar()
+            destino_series.close()
+    duracion = time.perf_counter() - inicio
+
+    destino = _abrir(args.salida)
+    try:
+        escribir_resumen(fila, config, destino, _formato(args.salida, args.formato))
+    finally:
+        if destino is not sys.stdout:
+            destino.close()
+    print(f"{config.ticks} ticks en {duracion:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
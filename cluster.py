@@ -0,0 +1,273 @@
+"""
+Simulación de un clúster de planificadores.
+
+Cada nodo es un MotorSimulacion en su propio proceso del sistema operativo
+y se comunica con el despachador global por un multiprocessing.Pipe. El
+tiempo avanza por épocas de E ticks: el despachador reparte las llegadas de
+la época (round-robin, menos cargado o dos opciones al azar), todos los
+nodos ejecutan sus E ticks en paralelo y responden con su carga, los
+tiempos de retorno de lo que terminó y los procesos que se les pidió
+migrar. La carga que ve el despachador tiene, por lo tanto, hasta una
+época de antigüedad, como en un clúster real.
+
+La carga de trabajo se genera en el despachador con su propia semilla (o
+se lee de una traza con trazas.py), de modo que la misma secuencia de
+llegadas se reparte con cada política y cantidad de nodos.
+
+Ejemplo:
+    python cluster.py --nodos 1 2 4 8 --despacho dos_opciones --migrar --ticks 5000 --salida cluster.csv
+"""
+import argparse
+import multiprocessing as mp
+import random
+import sys
+import time
+from dataclasses import replace
+from typing import Dict, Iterator, List, Optional
+
+from simulador import (ConfiguracionSimulacion, Proceso, ProcesoTraza, crear_motor,
+                       generar_tiempo_bloqueo, generar_tiempo_ejecucion_variado)
+
+POLITICAS_DESPACHO = ("rr", "menos_cargado", "dos_opciones")
+
+# Estados que cuentan como carga de un nodo
+ESTADOS_CARGA = frozenset(("Nuevo", "Listo", "Ejecución", "Bloqueado"))
+
+
+# ===============================
+# Nodo (proceso hijo)
+# ===============================
+
+def _nodo(conexion, config: ConfiguracionSimulacion):
+    """Bucle de un nodo: recibe épocas del despachador y responde con su estado"""
+    motor = crear_motor(config)
+    motor.max_auto_processes = 0   # solo la carga que reparte el despachador
+    motor.series = None
+    retornos: List[int] = []
+    motor.al_finalizar = lambda p: retornos.append(motor.tick_actual - p.tick_llegada)
+
+    while True:
+        mensaje = conexion.recv()
+        if mensaje[0] == "fin":
+            conexion.send(motor.resumen())
+            return
+        _, hasta_tick, llegadas, entrantes, salientes = mensaje
+        motor.recibir_migrados(entrantes)
+        while motor.tick_actual < hasta_tick:
+            lote = llegadas.get(motor.tick_actual)
+            if lote:
+                motor.crear_procesos_traza(lote)
+            motor.tick()
+        migrados = motor.extraer_para_migrar(salientes) if salientes else []
+        carga = sum(1 for p in motor.procesos.values() if p.estado in ESTADOS_CARGA)
+        conexion.send((carga, retornos[:], migrados))
+        retornos.clear()
+
+
+# ===============================
+# Despachador
+# ===============================
+
+class Despachador:
+    """Elige el nodo de cada llegada a partir de una estimación de carga por nodo"""
+
+    def __init__(self, politica: str, nodos: int, rng: random.Random):
+        if politica not in POLITICAS_DESPACHO:
+            raise ValueError(f"política de despacho desconocida: {politica}")
+        self.politica = politica
+        self.rng = rng
+        self.cargas = [0.0] * nodos
+        self._siguiente = 0
+
+    def actualizar(self, cargas: List[int]):
+        self.cargas = [float(c) for c in cargas]
+
+    def menos_cargado(self) -> int:
+        return min(range(len(self.cargas)), key=self.cargas.__getitem__)
+
+    def elegir(self) -> int:
+        n = len(self.cargas)
+        if self.politica == "rr":
+            nodo = self._siguiente
+            self._siguiente = (self._siguiente + 1) % n
+        elif self.politica == "menos_cargado" or n == 1:
+            nodo = self.menos_cargado()
+        else:
+            a, b = self.rng.sample(range(n), 2)
+            nodo = a if self.cargas[a] <= self.cargas[b] else b
+        # Lo asignado en esta época todavía no aparece en el reporte del nodo
+        self.cargas[nodo] += 1
+        return nodo
+
+
+def generar_llegadas(rng: random.Random, tasa: float, ticks: int) -> Iterator[ProcesoTraza]:
+    """Carga sintética: en promedio `tasa` llegadas por tick, de 1 a 3 ráfagas con E/S entre ellas"""
+    pid = 0
+    for tick in range(ticks):
+        cantidad = int(tasa) + (1 if rng.random() < tasa - int(tasa) else 0)
+        for _ in range(cantidad):
+            pid += 1
+            rafagas = tuple(generar_tiempo_ejecucion_variado(rng) for _ in range(rng.randint(1, 3)))
+            bloqueos = tuple(generar_tiempo_bloqueo(rng) for _ in range(len(rafagas) - 1))
+            yield ProcesoTraza(tick, pid, "Carga", rafagas, bloqueos)
+
+
+def percentil(ordenados: List[int], q: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not ordenados:
+        return 0.0
+    return float(ordenados[min(len(ordenados) - 1, max(0, int(round(q * len(ordenados))) - 1))])
+
+
+class Cluster:
+    def __init__(self, nodos: int, config: ConfiguracionSimulacion, despacho: str = "dos_opciones",
+                 ticks_por_epoca: int = 10, migrar: bool = False, umbral_migracion: int = 4,
+                 max_migracion: int = 16):
+        self.config = config
+        self.ticks_por_epoca = ticks_por_epoca
+        self.migrar = migrar
+        self.umbral_migracion = umbral_migracion
+        self.max_migracion = max_migracion
+        self.despachador = Despachador(despacho, nodos, random.Random(config.semilla))
+        self.migraciones = 0
+        self._conexiones = []
+        self._procesos = []
+        for i in range(nodos):
+            propia, del_nodo = mp.Pipe()
+            # Semilla distinta por nodo (la carga no depende de ella: viene del despachador)
+            hijo = mp.Process(target=_nodo, args=(del_nodo, replace(config, semilla=config.semilla * 1000 + i)),
+                              name=f"nodo-{i}", daemon=True)
+            hijo.start()
+            del_nodo.close()
+            self._conexiones.append(propia)
+            self._procesos.append(hijo)
+
+    def _plan_migracion(self, cargas: List[int]) -> List[int]:
+        """Cuántos procesos pedir a cada nodo para acercarlo al promedio"""
+        if not self.migrar or len(cargas) < 2:
+            return [0] * len(cargas)
+        promedio = sum(cargas) / len(cargas)
+        return [min(self.max_migracion, int(c - promedio)) if c - promedio > self.umbral_migracion else 0
+                for c in cargas]
+
+    def ejecutar(self, llegadas: Iterator[ProcesoTraza], ticks: int) -> Dict[str, float]:
+        n = len(self._conexiones)
+        retornos: List[int] = []
+        llegados = 0
+        siguiente = next(llegadas, None)
+        salientes = [0] * n
+        entrantes: List[List[Proceso]] = [[] for _ in range(n)]
+        inicio = time.perf_counter()
+
+        tick = 0
+        while tick < ticks:
+            hasta = min(ticks, tick + self.ticks_por_epoca)
+            por_nodo: List[Dict[int, List[ProcesoTraza]]] = [{} for _ in range(n)]
+            while siguiente is not None and siguiente.llegada < hasta:
+                nodo = self.despachador.elegir()
+                por_nodo[nodo].setdefault(max(siguiente.llegada, tick), []).append(siguiente)
+                llegados += 1
+                siguiente = next(llegadas, None)
+
+            for i, conexion in enumerate(self._conexiones):
+                conexion.send(("epoca", hasta, por_nodo[i], entrantes[i], salientes[i]))
+            cargas, migrados = [], []
+            for conexion in self._conexiones:
+                carga, terminados, salida = conexion.recv()
+                cargas.append(carga)
+                retornos.extend(terminados)
+                migrados.extend(salida)
+
+            # Los migrados van a los nodos menos cargados en la próxima época
+            self.despachador.actualizar(cargas)
+            entrantes = [[] for _ in range(n)]
+            for p in migrados:
+                destino = self.despachador.menos_cargado()
+                entrantes[destino].append(p)
+                self.despachador.cargas[destino] += 1
+            self.migraciones += len(migrados)
+            salientes = self._plan_migracion(cargas)
+            tick = hasta
+
+        duracion = time.perf_counter() - inicio
+        resumenes = self.detener()
+        retornos.sort()
+        completados = len(retornos)
+        return {
+            "nodos": n,
+            "despacho": self.despachador.politica,
+            "migrar": int(self.migrar),
+            "ticks": ticks,
+            "llegadas": llegados,
+            "completados": completados,
+            "pendientes": sum(sum(r[f"vivos_{e}"] for e in ESTADOS_CARGA) for r in resumenes),
+            "throughput": completados / max(ticks, 1),
+            "throughput_por_nodo": completados / max(ticks, 1) / n,
+            "utilizacion_cpu": sum(r["utilizacion_cpu"] for r in resumenes) / n,
+            "retorno_medio": sum(retornos) / completados if completados else 0.0,
+            "retorno_p50": percentil(retornos, 0.50),
+            "retorno_p95": percentil(retornos, 0.95),
+            "retorno_p99": percentil(retornos, 0.99),
+            "retorno_max": float(retornos[-1]) if retornos else 0.0,
+            "migraciones": self.migraciones,
+            "segundos": duracion,
+            "ticks_por_segundo": ticks / duracion if duracion > 0 else 0.0,
+        }
+
+    def detener(self) -> List[Dict[str, float]]:
+        resumenes = []
+        for conexion in self._conexiones:
+            conexion.send(("fin",))
+            resumenes.append(conexion.recv())
+            conexion.close()
+        for hijo in self._procesos:
+            hijo.join(timeout=5)
+        return resumenes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from barrido import escribir_tabla
+
+    base = ConfiguracionSimulacion()
+    parser = argparse.ArgumentParser(description="Clúster de planificadores en procesos separados")
+    parser.add_argument("--nodos", type=int, nargs="+", default=[1, 2, 4], help="una ejecución por valor")
+    parser.add_argument("--despacho", choices=POLITICAS_DESPACHO, nargs="+", default=["dos_opciones"])
+    parser.add_argument("--migrar", action="store_true", help="migrar procesos de nodos sobrecargados")
+    parser.add_argument("--umbral-migracion", type=int, default=4, help="exceso sobre el promedio que dispara la migración")
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--ticks-por-epoca", type=int, default=10)
+    parser.add_argument("--llegadas-por-nodo", type=float, default=0.05, help="llegadas por tick y por nodo")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--politica", choices=("fifo", "rr"), default=base.politica, help="planificación en cada nodo")
+    parser.add_argument("--quantum", type=int, default=base.quantum)
+    parser.add_argument("--nucleos", type=int, default=base.nucleos, help="núcleos por nodo")
+    parser.add_argument("--traza", default=None, help="usar una captura (trazas.py) en lugar de la carga sintética")
+    parser.add_argument("--segundos-por-tick", type=float, default=1.0)
+    parser.add_argument("--salida", default=None, help="archivo CSV (por defecto, salida estándar)")
+    args = parser.parse_args(argv)
+
+    config = replace(base, semilla=args.semilla, politica=args.politica, quantum=args.quantum, nucleos=args.nucleos)
+    filas = []
+    for despacho in args.despacho:
+        for nodos in args.nodos:
+            if args.traza:
+                from trazas import leer_traza
+                llegadas = leer_traza(args.traza, segundos_por_tick=args.segundos_por_tick)
+            else:
+                llegadas = generar_llegadas(random.Random(args.semilla), args.llegadas_por_nodo * nodos, args.ticks)
+            cluster = Cluster(nodos, config, despacho, args.ticks_por_epoca, args.migrar, args.umbral_migracion)
+            fila = cluster.ejecutar(llegadas, args.ticks)
+            filas.append(fila)
+            print(f"{despacho} x{nodos}: {fila['completados']} completados, "
+                  f"p99 {fila['retorno_p99']:.0f} ticks, {fila['segundos']:.1f}s", file=sys.stderr)
+
+    if args.salida:
+        with open(args.salida, "w", newline="", encoding="utf-8") as f:
+            escribir_tabla(filas, f)
+    else:
+        escribir_tabla(filas, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
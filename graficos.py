@@ -0,0 +1,142 @@
+"""
+Ventana de historial (gráficos) del administrador de tareas.
+
+Se importa y se construye recién la primera vez que el usuario la abre.
+"""
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict, List
+
+from series import AlmacenSeries
+
+
+class VentanaGraficos(tk.Toplevel):
+    """Historial de recursos y de procesos por estado dibujado en un Canvas.
+
+    Las líneas se crean una sola vez; cada refresco solo reemplaza sus
+    coordenadas con canvas.coords, y nada se toca si el almacén no tiene
+    muestras nuevas o la ventana está oculta.
+    """
+
+    # Ventanas visibles (ticks); el almacén elige el nivel de reducción que las cubre
+    VENTANAS = (("600 ticks", 600), ("6k ticks", 6000), ("60k ticks", 60000),
+                ("600k ticks", 600000), ("6M ticks", 6000000))
+    RECURSOS = (("cpu", "CPU %", "#1F77B4"), ("memoria", "RAM %", "#2CA02C"), ("disco", "Disco %", "#FF7F0E"))
+    COLOR_LINEA = {
+        "Nuevo": "#5B8DEF",
+        "Listo": "#4CAF50",
+        "Ejecución": "#E0B000",
+        "Bloqueado": "#E53935",
+        "Zombi": "#8E24AA",
+        "Finalizado": "#757575",
+    }
+
+    def __init__(self, parent, almacen: AlmacenSeries, memoria_disponible: float):
+        super().__init__(parent)
+        self.almacen = almacen
+        self.memoria_disponible = memoria_disponible
+        self.title("Historial del Sistema")
+        self.geometry("720x440")
+        self.minsize(420, 300)
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        barra = ttk.Frame(self)
+        barra.grid(row=0, column=0, sticky="ew", padx=8, pady=(8, 0))
+        ttk.Label(barra, text="Ventana:").pack(side=tk.LEFT)
+        self.ventana = tk.StringVar(value=self.VENTANAS[0][0])
+        selector = ttk.Combobox(barra, textvariable=self.ventana, state="readonly", width=12,
+                                values=[nombre for nombre, _ in self.VENTANAS])
+        selector.pack(side=tk.LEFT, padx=4)
+        selector.bind("<<ComboboxSelected>>", lambda _e: self.refrescar(forzar=True))
+        self.lbl_escala = ttk.Label(barra, text="", font=("Segoe UI", 8))
+        self.lbl_escala.pack(side=tk.LEFT, padx=8)
+        ttk.Button(barra, text="Cerrar", command=self.withdraw).pack(side=tk.RIGHT)
+
+        self.canvas = tk.Canvas(self, bg="white", highlightthickness=0)
+        self.canvas.grid(row=1, column=0, sticky="nsew", padx=8, pady=8)
+        self.canvas.bind("<Configure>", lambda _e: self._maquetar())
+
+        # Ítems persistentes del Canvas: marcos, etiquetas y una línea por serie
+        self._marcos = [self.canvas.create_rectangle(0, 0, 0, 0, outline="#BBB") for _ in range(2)]
+        self._titulos = [self.canvas.create_text(0, 0, anchor="nw", font=("Segoe UI", 8), text=t)
+                         for t in ("Recursos (%)", "Procesos por estado")]
+        self._maximos = [self.canvas.create_text(0, 0, anchor="ne", font=("Segoe UI", 8), fill="#666")
+                         for _ in range(2)]
+        self._lineas: Dict[str, int] = {}
+        for nombre, _etiqueta, color in self.RECURSOS:
+            self._lineas[nombre] = self.canvas.create_line(0, 0, 0, 0, fill=color, width=1.5)
+        for estado, color in self.COLOR_LINEA.items():
+            self._lineas[estado] = self.canvas.create_line(0, 0, 0, 0, fill=color)
+        leyenda = [(etq, color) for _n, etq, color in self.RECURSOS] + list(self.COLOR_LINEA.items())
+        for i, (texto, color) in enumerate(leyenda):
+            self.canvas.create_text(0, 0, anchor="nw", font=("Segoe UI", 8), fill=color, text=texto,
+                                    tags=("leyenda", f"leyenda{i}"))
+
+        self._areas = [(0, 0, 1, 1), (0, 0, 1, 1)]
+        self._version_dibujada = -1
+
+        self.withdraw()
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+    def mostrar(self):
+        self.deiconify()
+        self.lift()
+        self.refrescar(forzar=True)
+
+    def _maquetar(self):
+        """Recalcula las áreas de dibujo al cambiar el tamaño del Canvas"""
+        ancho = max(self.canvas.winfo_width(), 100)
+        alto = max(self.canvas.winfo_height(), 100)
+        margen, leyenda = 8, 18
+        alto_grafico = (alto - leyenda - 3 * margen) / 2
+        for i in range(2):
+            y0 = margen + i * (alto_grafico + margen)
+            area = (margen, y0 + 14, ancho - margen, y0 + alto_grafico)
+            self._areas[i] = area
+            self.canvas.coords(self._marcos[i], *area)
+            self.canvas.coords(self._titulos[i], area[0], y0)
+            self.canvas.coords(self._maximos[i], area[2], y0)
+        x = margen
+        for i in range(len(self.RECURSOS) + len(self.COLOR_LINEA)):
+            self.canvas.coords(f"leyenda{i}", x, alto - leyenda)
+            x += 70
+        self.refrescar(forzar=True)
+
+    def _puntos(self, valores: List[float], area, maximo: float) -> List[float]:
+        x0, y0, x1, y1 = area
+        paso = (x1 - x0) / max(len(valores) - 1, 1)
+        escala = (y1 - y0) / maximo if maximo > 0 else 0.0
+        coords: List[float] = []
+        for i, v in enumerate(valores):
+            coords.append(x0 + i * paso)
+            coords.append(y1 - v * escala)
+        return coords
+
+    def refrescar(self, forzar: bool = False):
+        if self.state() == "withdrawn":
+            return
+        if not forzar and self.almacen.version == self._version_dibujada:
+            return
+        ventana = dict(self.VENTANAS)[self.ventana.get()]
+        nivel = self.almacen.nivel_para(ventana)
+        ticks_por_punto = self.almacen.ticks_por_punto(nivel)
+        n = max(2, min(self.almacen.capacidad, ventana // ticks_por_punto))
+        version, datos = self.almacen.leer(list(self._lineas), nivel, n)
+        self._version_dibujada = version
+
+        datos["memoria"] = [m * 100.0 / self.memoria_disponible for m in datos["memoria"]]
+        maximo_estados = max((max(datos[e], default=0.0) for e in self.COLOR_LINEA), default=0.0)
+        maximo_estados = max(maximo_estados, 1.0)
+        for nombre, linea in self._lineas.items():
+            valores = datos[nombre]
+            if len(valores) < 2:
+                self.canvas.coords(linea, 0, 0, 0, 0)
+                continue
+            if nombre in self.COLOR_LINEA:
+                self.canvas.coords(linea, *self._puntos(valores, self._areas[1], maximo_estados))
+            else:
+                self.canvas.coords(linea, *self._puntos(valores, self._areas[0], 100.0))
+        self.canvas.itemconfigure(self._maximos[0], text="100%")
+        self.canvas.itemconfigure(self._maximos[1], text=f"máx {maximo_estados:.0f}")
+        self.lbl_escala.configure(text=f"{ticks_por_punto} tick(s)/punto | {self.almacen.muestras} muestras")
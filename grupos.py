@@ -0,0 +1,200 @@
+"""
+Grupos de recursos jerárquicos (al estilo de los cgroups).
+
+Cada grupo tiene una ruta ("/", "/a", "/a/web"), una cuota de CPU relativa a
+sus hermanos, un límite de memoria y un tope de disco opcionales. Los
+procesos se asignan a un grupo (por defecto "/").
+
+- CPU: al despachar, el motor baja desde la raíz y en cada nivel elige el
+  hijo con menor uso reciente por unidad de cuota (uso con decaimiento
+  exponencial, como en un planificador de reparto justo). Los procesos que
+  cuelgan directamente de un grupo compiten con sus subgrupos como un hijo
+  más de cuota CUOTA_POR_DEFECTO. Dentro de un grupo el orden sigue siendo
+  FIFO.
+- Memoria: la admisión (Nuevo → Listo) proyecta la memoria comprometida de
+  cada grupo y sus ancestros contra sus límites; un grupo lleno retiene solo
+  a sus procesos. El modelo de recursos escala la memoria de un grupo que
+  supera su límite.
+- Disco: el modelo de recursos escala el disco de los procesos en
+  ejecución de un grupo que supera su tope.
+
+La contabilidad de cada grupo incluye a sus subgrupos. Con solo la raíz
+definida nada de esto se aplica y el motor se comporta como siempre.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+RAIZ = "/"
+CUOTA_POR_DEFECTO = 100
+DECAIMIENTO_USO = 0.95   # por tick: el uso reciente olvida la mitad en ~14 ticks
+
+
+@dataclass
+class Grupo:
+    ruta: str
+    padre: Optional["Grupo"] = None
+    cuota_cpu: int = CUOTA_POR_DEFECTO
+    limite_memoria_mb: Optional[float] = None
+    limite_disco_percent: Optional[float] = None
+    hijos: List["Grupo"] = field(default_factory=list, repr=False)
+    # Reparto justo: uso reciente del subárbol y de los procesos propios
+    uso: float = 0.0
+    uso_propio: float = 0.0
+    # Contabilidad (subárbol)
+    ticks_cpu: int = 0
+    ticks_espera: int = 0            # ticks-proceso en Listo
+    creados: int = 0
+    finalizados: int = 0
+    suma_retorno: int = 0            # ticks desde la llegada hasta Finalizado
+    rechazos_admision: int = 0       # ticks con admisiones retenidas por el límite de memoria
+    memoria_mb: float = 0.0
+    memoria_pico_mb: float = 0.0
+    disco_percent: float = 0.0
+    recortes_memoria: int = 0        # ticks en que se escaló la memoria por el límite
+    recortes_disco: int = 0
+
+    def linaje(self) -> Iterable["Grupo"]:
+        """El grupo y sus ancestros hasta la raíz"""
+        grupo: Optional[Grupo] = self
+        while grupo is not None:
+            yield grupo
+            grupo = grupo.padre
+
+    def contabilidad(self) -> Dict[str, float]:
+        return {
+            "ticks_cpu": self.ticks_cpu,
+            "ticks_espera": self.ticks_espera,
+            "creados": self.creados,
+            "finalizados": self.finalizados,
+            "retorno_medio": self.suma_retorno / self.finalizados if self.finalizados else 0.0,
+            "rechazos_admision": self.rechazos_admision,
+            "memoria_mb": self.memoria_mb,
+            "memoria_pico_mb": self.memoria_pico_mb,
+            "disco_percent": self.disco_percent,
+            "recortes_memoria": self.recortes_memoria,
+            "recortes_disco": self.recortes_disco,
+        }
+
+
+def normalizar_ruta(ruta: str) -> str:
+    """'/a//web/' -> '/a/web'"""
+    if not ruta.startswith(RAIZ):
+        raise ValueError(f"la ruta del grupo debe empezar con '/': {ruta!r}")
+    return RAIZ + "/".join(filter(None, ruta.split("/")))
+
+
+def parsear_grupo(spec: str) -> Tuple[str, Dict[str, float]]:
+    """'/a/web:cuota=200,memoria=1024,disco=30,llegada=0.2' -> ('/a/web', {...})"""
+    ruta, _, opciones = spec.partition(":")
+    valores: Dict[str, float] = {}
+    for opcion in filter(None, opciones.split(",")):
+        clave, _, valor = opcion.partition("=")
+        clave = clave.strip()
+        if clave not in ("cuota", "memoria", "disco", "llegada"):
+            raise ValueError(f"opción de grupo desconocida: {clave!r} (cuota, memoria, disco, llegada)")
+        valores[clave] = float(valor)
+    return normalizar_ruta(ruta.strip()), valores
+
+
+class ArbolGrupos:
+    def __init__(self):
+        self.raiz = Grupo(RAIZ)
+        self.grupos: Dict[str, Grupo] = {RAIZ: self.raiz}
+
+    @property
+    def activo(self) -> bool:
+        """Hay grupos además de la raíz (si no, el motor ignora el árbol)"""
+        return len(self.grupos) > 1
+
+    def __contains__(self, ruta: str) -> bool:
+        return ruta in self.grupos
+
+    def __getitem__(self, ruta: str) -> Grupo:
+        return self.grupos[ruta]
+
+    def __iter__(self):
+        return iter(self.grupos.values())
+
+    def definir(self, ruta: str, cuota_cpu: int = CUOTA_POR_DEFECTO, limite_memoria_mb: Optional[float] = None,
+                limite_disco_percent: Optional[float] = None) -> Grupo:
+        """Crea (o actualiza) un grupo; los ancestros que falten se crean con valores por defecto"""
+        if cuota_cpu <= 0:
+            raise ValueError("la cuota de CPU debe ser positiva")
+        ruta = normalizar_ruta(ruta)
+        if ruta == RAIZ:
+            raise ValueError("la raíz usa los recursos de todo el sistema y no se configura")
+        grupo = self._asegurar(ruta)
+        grupo.cuota_cpu = int(cuota_cpu)
+        grupo.limite_memoria_mb = limite_memoria_mb
+        grupo.limite_disco_percent = limite_disco_percent
+        return grupo
+
+    def _asegurar(self, ruta: str) -> Grupo:
+        grupo = self.grupos.get(ruta)
+        if grupo is None:
+            padre = self._asegurar(ruta.rsplit("/", 1)[0] or RAIZ)
+            grupo = Grupo(ruta, padre)
+            padre.hijos.append(grupo)
+            self.grupos[ruta] = grupo
+        return grupo
+
+    # ---------- Contabilidad ----------
+    def cargar(self, ruta: str, campo: str, cantidad: int = 1):
+        for grupo in self.grupos[ruta].linaje():
+            setattr(grupo, campo, getattr(grupo, campo) + cantidad)
+
+    def cargar_cpu(self, ruta: str):
+        """Un tick de CPU de un proceso del grupo"""
+        grupo = self.grupos[ruta]
+        grupo.uso_propio += 1
+        for g in grupo.linaje():
+            g.uso += 1
+            g.ticks_cpu += 1
+
+    def decaer(self):
+        for grupo in self.grupos.values():
+            grupo.uso *= DECAIMIENTO_USO
+            grupo.uso_propio *= DECAIMIENTO_USO
+
+    # ---------- Reparto justo de CPU ----------
+    def elegir(self, candidatos: Dict[str, Tuple[int, int]]) -> str:
+        """
+        candidatos: ruta del grupo -> (posición en la cola, PID) del primer
+        proceso elegible de ese grupo. Devuelve la ruta del grupo con turno.
+        """
+        # Mejor posición en la cola de cada subárbol con candidatos (desempate FIFO)
+        posicion: Dict[str, int] = {}
+        for ruta, (pos, _) in candidatos.items():
+            for grupo in self.grupos[ruta].linaje():
+                if posicion.get(grupo.ruta, pos + 1) > pos:
+                    posicion[grupo.ruta] = pos
+        nodo = self.raiz
+        while True:
+            mejor: Optional[Grupo] = None
+            clave = None
+            if nodo.ruta in candidatos:
+                clave = (nodo.uso_propio / CUOTA_POR_DEFECTO, candidatos[nodo.ruta][0])
+            for hijo in nodo.hijos:
+                if hijo.ruta not in posicion:
+                    continue
+                clave_hijo = (hijo.uso / hijo.cuota_cpu, posicion[hijo.ruta])
+                if clave is None or clave_hijo < clave:
+                    mejor, clave = hijo, clave_hijo
+            if mejor is None:
+                return nodo.ruta
+            nodo = mejor
+
+    # ---------- Límites ----------
+    # La memoria comprometida por grupo (con subgrupos) la mantiene el planificador
+    # de forma incremental en cada cambio de estado (Planificador.comprometida_grupo)
+    def cabe(self, ruta: str, comprometida: Dict[str, float], incremento: float) -> bool:
+        """True si sumar `incremento` MB al grupo respeta su límite y el de sus ancestros"""
+        return all(g.limite_memoria_mb is None or comprometida.get(g.ruta, 0.0) + incremento <= g.limite_memoria_mb
+                   for g in self.grupos[ruta].linaje())
+
+    def por_profundidad(self) -> List[Grupo]:
+        """Grupos de las hojas a la raíz (para aplicar límites de abajo hacia arriba)"""
+        return sorted(self.grupos.values(), key=lambda g: g.ruta.count("/") if g.ruta != RAIZ else 0, reverse=True)
+
+    def resumen(self) -> Dict[str, Dict[str, float]]:
+        return {ruta: grupo.contabilidad() for ruta, grupo in self.grupos.items()}
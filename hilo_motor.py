@@ -0,0 +1,208 @@
+"""
+Motor de simulación en un hilo de trabajo.
+
+El hilo ejecuta los ticks a su propio ritmo y publica instantáneas inmutables
+en una cola acotada; la interfaz consume solo la más reciente a su frecuencia
+de cuadro y descarta las intermedias. Las acciones del usuario llegan como
+comandos que el hilo aplica entre ticks, de modo que el motor nunca se toca
+desde dos hilos a la vez.
+
+En modo turbo el hilo no espera tick_ms: ejecuta lotes de K ticks, con K
+ajustado para que cada lote quepa en un presupuesto de tiempo, publica una
+instantánea cada N ticks y reemplaza el log detallado por resúmenes.
+"""
+import queue
+import threading
+import time
+from typing import Callable, List, Optional
+
+from simulador import Instantanea, MotorSimulacion
+
+Comando = Callable[[MotorSimulacion], None]
+
+
+class MotorEnHilo:
+    def __init__(self, motor: MotorSimulacion, capacidad: int = 2):
+        self.motor = motor
+        self.instantaneas: "queue.Queue[Instantanea]" = queue.Queue(maxsize=capacidad)
+        self.comandos: "queue.SimpleQueue[Comando]" = queue.SimpleQueue()
+        self.logs: "queue.SimpleQueue[str]" = queue.SimpleQueue()
+        self.ultima_publicada: Optional[Instantanea] = None  # para lectores que no consumen la cola
+        self.motor.log = self.logs.put  # el log del motor se vacía desde el hilo de la interfaz
+
+        # Modo turbo
+        self.turbo = False
+        self.presupuesto_lote_ms = 20.0  # tiempo máximo de un lote antes de atender comandos
+        self.ticks_por_lote = 1          # K, se ajusta automáticamente
+        self.max_ticks_por_lote = 10000
+        self.decimacion = 50             # en turbo se publica una instantánea cada N ticks
+        self.intervalo_resumen_s = 1.0   # cada cuánto se registra un resumen en turbo
+        self.max_intervalo_publicacion_s = 0.5  # con ticks lentos se publica igual cada medio segundo
+        self._ultimo_publicado = 0
+        self._instante_publicado = 0.0
+        self._marca_resumen = (0.0, 0, 0, 0)  # (instante, tick, finalizados, creados)
+
+        self._corriendo = False
+        self._detenido = False
+        self._despertar = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle, name="motor-simulacion", daemon=True)
+
+    # ---------- Control (desde la interfaz) ----------
+    def arrancar(self):
+        """Arranca el hilo (en pausa) y publica la instantánea inicial"""
+        self._hilo.start()
+        self.enviar(lambda motor: None)
+
+    @property
+    def corriendo(self) -> bool:
+        """True si los ticks avanzan (puede cambiar desde la interfaz o desde la API de control)"""
+        return self._corriendo
+
+    def reanudar(self):
+        self._corriendo = True
+        self._despertar.set()
+
+    def pausar(self):
+        self._corriendo = False
+        self._despertar.set()
+
+    def detener(self):
+        self._detenido = True
+        self._despertar.set()
+        if self._hilo.is_alive():
+            self._hilo.join(timeout=1.0)
+
+    def activar_turbo(self, activo: bool):
+        self.enviar(lambda motor: self._cambiar_turbo(activo))
+
+    def enviar(self, comando: Comando):
+        """Encola un comando; se aplica en el hilo del motor antes del próximo tick"""
+        self.comandos.put(comando)
+        self._despertar.set()
+
+    def ultima_instantanea(self) -> Optional[Instantanea]:
+        """Devuelve la instantánea más reciente (o None) descartando las intermedias"""
+        ultima = None
+        while True:
+            try:
+                ultima = self.instantaneas.get_nowait()
+            except queue.Empty:
+                return ultima
+
+    def vaciar_logs(self) -> List[str]:
+        mensajes = []
+        while True:
+            try:
+                mensajes.append(self.logs.get_nowait())
+            except queue.Empty:
+                return mensajes
+
+    # ---------- Hilo del motor ----------
+    def _cambiar_turbo(self, activo: bool):
+        if activo == self.turbo:
+            return
+        self.turbo = activo
+        self.ticks_por_lote = 1
+        # En turbo el log por evento se descarta; solo se emiten resúmenes periódicos
+        self.motor.log = None if activo else self.logs.put
+        self._marcar_resumen()
+        if activo:
+            self.logs.put(f"⏩ Turbo activado: lotes de ≤{self.presupuesto_lote_ms:.0f} ms, "
+                          f"vista cada {self.decimacion} ticks, log solo en resúmenes")
+        else:
+            self.logs.put(f"▶ Turbo desactivado en el tick {self.motor.tick_actual}: vuelve el ritmo de {self.motor.tick_ms} ms/tick")
+
+    def _marcar_resumen(self):
+        self._marca_resumen = (time.perf_counter(), self.motor.tick_actual,
+                               self.motor.total_finalizados_historico, self.motor.estadisticas["creados"])
+
+    def _resumen_turbo(self):
+        instante, tick, finalizados, creados = self._marca_resumen
+        transcurrido = time.perf_counter() - instante
+        if transcurrido < self.intervalo_resumen_s:
+            return
+        motor = self.motor
+        ticks = motor.tick_actual - tick
+        self.logs.put(f"⏩ Turbo: ticks {tick + 1}-{motor.tick_actual} ({ticks / transcurrido:.0f} ticks/s, "
+                      f"K={self.ticks_por_lote}) | creados +{motor.estadisticas['creados'] - creados}, "
+                      f"finalizados +{motor.total_finalizados_historico - finalizados} | "
+                      f"vivos {len(motor.procesos)}, cola {len(motor.planificador.cola_listos)}")
+        self._marcar_resumen()
+
+    def _lote_turbo(self) -> bool:
+        """Ejecuta K ticks seguidos y ajusta K al presupuesto; True si toca publicar"""
+        inicio = time.perf_counter()
+        for _ in range(self.ticks_por_lote):
+            self.motor.tick()
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+
+        # Ajuste de K: crecer como mucho al doble, reducir en proporción al exceso
+        if duracion_ms > self.presupuesto_lote_ms:
+            self.ticks_por_lote = max(1, int(self.ticks_por_lote * self.presupuesto_lote_ms / duracion_ms))
+        elif duracion_ms < self.presupuesto_lote_ms * 0.5:
+            self.ticks_por_lote = min(self.max_ticks_por_lote, self.ticks_por_lote * 2)
+
+        self._resumen_turbo()
+        return (self.motor.tick_actual - self._ultimo_publicado >= self.decimacion
+                or time.perf_counter() - self._instante_publicado >= self.max_intervalo_publicacion_s)
+
+    def _publicar(self):
+        self._ultimo_publicado = self.motor.tick_actual
+        self._instante_publicado = time.perf_counter()
+        instantanea = self.motor.instantanea()
+        self.ultima_publicada = instantanea
+        while True:
+            try:
+                self.instantaneas.put_nowait(instantanea)
+                return
+            except queue.Full:
+                # La interfaz va atrasada: se descarta la más vieja
+                try:
+                    self.instantaneas.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _aplicar_comandos(self) -> bool:
+        aplicados = False
+        while True:
+            try:
+                comando = self.comandos.get_nowait()
+            except queue.Empty:
+                return aplicados
+            try:
+                comando(self.motor)
+            except Exception as exc:  # un comando fallido no debe tumbar el hilo
+                self.motor._log(f"ERROR aplicando comando: {exc!r}")
+            aplicados = True
+
+    def _bucle(self):
+        proximo_tick = time.perf_counter()
+        while not self._detenido:
+            self._despertar.clear()
+            cambios = self._aplicar_comandos()
+
+            ahora = time.perf_counter()
+            if self._corriendo and self.turbo:
+                cambios = self._lote_turbo() or cambios
+                proximo_tick = ahora
+            elif self._corriendo and ahora >= proximo_tick:
+                self.motor.tick()
+                cambios = True
+                proximo_tick += self.motor.tick_ms / 1000.0
+                if proximo_tick < ahora:  # ticks atrasados: no intentar recuperarlos en ráfaga
+                    proximo_tick = ahora + self.motor.tick_ms / 1000.0
+
+            if cambios:
+                self._publicar()
+
+            if self._corriendo and self.turbo:
+                espera = 0.0  # solo ceder el GIL a la interfaz entre lotes
+            elif self._corriendo:
+                espera = max(0.0, proximo_tick - time.perf_counter())
+            else:
+                espera = None
+                proximo_tick = time.perf_counter()  # al reanudar, el primer tick es inmediato
+            self._despertar.wait(espera)
+        # cProfile queda instalado en este hilo hasta que se lo deshabilita desde acá
+        if self.motor.perfilador is not None:
+            self.motor.perfilador.cancelar()
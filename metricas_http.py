@@ -0,0 +1,127 @@
+"""
+Exportación de métricas en formato de texto de Prometheus.
+
+Un ThreadingHTTPServer en un hilo daemon responde GET /metrics a partir de la
+última Instantanea publicada por el motor. La instantánea ya trae los
+agregados (conteos por estado, totales de recursos, perfil por fase), así
+que cada consulta cuesta lo mismo con 10 que con 100k procesos y nunca
+bloquea el bucle de Tk ni el hilo del motor. El texto se cachea por
+instantánea.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional, Tuple
+
+from perfilador import FASES
+from simulador import ESTADOS, Instantanea
+
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+NAN = float("nan")
+
+
+def _etiqueta(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _valor(valor: float) -> str:
+    """Número en la sintaxis de Prometheus (NaN, +Inf y -Inf en lugar de nan/inf de Python)"""
+    if valor != valor:
+        return "NaN"
+    if valor in (float("inf"), float("-inf")):
+        return "+Inf" if valor > 0 else "-Inf"
+    return str(valor)
+
+
+def formatear_metricas(inst: Instantanea) -> str:
+    """Convierte una instantánea al formato de exposición de Prometheus"""
+    lineas: List[str] = []
+
+    def metrica(nombre: str, tipo: str, ayuda: str, muestras: List[Tuple[str, float]]):
+        lineas.append(f"# HELP {nombre} {ayuda}")
+        lineas.append(f"# TYPE {nombre} {tipo}")
+        for etiquetas, valor in muestras:
+            lineas.append(f"{nombre}{etiquetas} {_valor(valor)}")
+
+    por_estado = dict(inst.por_estado)
+    metrica("simulador_procesos", "gauge", "Procesos vivos por estado.",
+            [(f'{{estado="{_etiqueta(e)}"}}', por_estado.get(e, 0)) for e in ("Nuevo",) + ESTADOS])
+    metrica("simulador_procesos_en_tabla", "gauge", "Procesos en la tabla.", [("", inst.total)])
+    metrica("simulador_finalizados_total", "counter", "Procesos finalizados desde el inicio (total_finalizados_historico).",
+            [("", inst.total_finalizados)])
+    metrica("simulador_cola_listos", "gauge", "Longitud de la cola de listos.", [("", inst.cola_listos)])
+    metrica("simulador_ticks_total", "counter", "Ticks de simulación ejecutados.", [("", inst.tick)])
+    metrica("simulador_cpu_percent", "gauge", "CPU total asignada (%).", [("", inst.cpu_total)])
+    metrica("simulador_memoria_mb", "gauge", "Memoria total asignada (MB).", [("", inst.memoria_total)])
+    metrica("simulador_memoria_disponible_mb", "gauge", "Memoria total del sistema (MB).",
+            [("", inst.memoria_total_disponible)])
+    metrica("simulador_disco_percent", "gauge", "Disco total asignado (%).", [("", inst.disco_total)])
+    metrica("simulador_memoria_comprometida_mb", "gauge", "Memoria proyectada por el control de admisión (MB).",
+            [("", inst.memoria_comprometida)])
+    metrica("simulador_admision_rechazos_total", "counter", "Intentos de admisión rechazados por capacidad.",
+            [("", inst.rechazos_admision)])
+    metrica("simulador_admision_espera_promedio_ticks", "gauge", "Espera media en Nuevo de los admitidos.",
+            [("", inst.espera_nuevo_promedio)])
+    metrica("simulador_admision_retenida", "gauge", "1 si la contrapresión retiene procesos en Nuevo.",
+            [("", 1 if inst.admision_retenida else 0)])
+    # El perfilador se enciende junto con el servidor (app.py); sin él (p. ej. una instantánea
+    # anterior) las series siguen presentes: ticks/s en 0, cuantiles NaN y conteos en 0
+    metrica("simulador_ticks_por_segundo", "gauge", "Ticks por segundo medidos por el perfilador.",
+            [("", inst.ticks_por_segundo)])
+    perfil = inst.perfil or tuple((fase, NAN, NAN, 0.0, 0) for fase in FASES + ("tick",))
+    muestras = []
+    for fase, _media_ms, p99_ms, suma_s, cantidad in perfil:
+        fase = _etiqueta(fase)
+        # Convención de los summary: cuantiles con la etiqueta quantile, más <nombre>_sum y <nombre>_count
+        muestras.append((f'{{fase="{fase}",quantile="0.99"}}', p99_ms / 1000))
+        muestras.append((f'_sum{{fase="{fase}"}}', suma_s))
+        muestras.append((f'_count{{fase="{fase}"}}', cantidad))
+    metrica("simulador_fase_duracion_segundos", "summary", "Duración de cada fase del tick.", muestras)
+    return "\n".join(lineas) + "\n"
+
+
+class ServidorMetricas:
+    def __init__(self, fuente: Callable[[], Optional[Instantanea]], host: str = "127.0.0.1", puerto: int = 9100):
+        self.fuente = fuente  # devuelve la última instantánea publicada (lectura sin bloqueo)
+        self._cache: Tuple[Optional[Instantanea], bytes] = (None, b"")
+        servidor = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                cuerpo = servidor.texto()
+                self.send_response(200)
+                self.send_header("Content-Type", TIPO_CONTENIDO)
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, format, *args):
+                pass  # sin ruido en la consola por cada consulta
+
+        self.httpd = ThreadingHTTPServer((host, puerto), Manejador)
+        self.httpd.daemon_threads = True
+        self._hilo = threading.Thread(target=self.httpd.serve_forever, name="metricas-http", daemon=True)
+
+    @property
+    def direccion(self) -> str:
+        host, puerto = self.httpd.server_address[:2]
+        return f"http://{host}:{puerto}/metrics"
+
+    def texto(self) -> bytes:
+        inst = self.fuente()
+        if inst is None:
+            return b""
+        cacheada, cuerpo = self._cache
+        if cacheada is not inst:
+            cuerpo = formatear_metricas(inst).encode("utf-8")
+            self._cache = (inst, cuerpo)
+        return cuerpo
+
+    def iniciar(self):
+        self._hilo.start()
+
+    def detener(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
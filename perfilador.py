@@ -0,0 +1,218 @@
+"""
+Instrumentación opcional por fase del tick.
+
+El motor marca el final de cada fase numerada de tick() con
+perf_counter_ns; las duraciones van a histogramas logarítmicos (potencias
+de 2 en nanosegundos), así que el costo por marca es constante y la memoria
+no crece. Además permite capturar una ventana de ticks con cProfile y
+volcarla junto con un archivo de pilas plegadas (formato de flamegraph.pl).
+
+cProfile no guarda pilas completas sino aristas llamador -> llamado con sus
+tiempos. Las pilas plegadas se reconstruyen desde cada función raíz hacia
+abajo, repartiendo el tiempo de cada llamado entre sus llamadores en
+proporción al tiempo que cada uno le atribuye. Es una aproximación (la
+misma de gprof2dot y flameprof): exacta cuando cada función tiene un solo
+llamador.
+"""
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Fases de MotorSimulacion.tick() en el orden en que se marcan
+FASES = (
+    "0 especiales",
+    "0.1 auto-creación",
+    "1 transiciones",
+    "2-3 contadores",
+    "4 zombis",
+    "5 purga",
+    "5.5 recursos",
+)
+
+
+class Histograma:
+    """
+    Histograma de duraciones en cubetas de potencias de 2 (ns).
+
+    La cubeta i guarda las duraciones en [2^(i-1), 2^i). Los percentiles se
+    interpolan linealmente dentro de la cubeta y se acotan al mínimo y al
+    máximo observados (exactos). Con muestras repartidas dentro de la cubeta
+    el error es chico; en el peor caso queda dentro del ancho de la cubeta
+    (la mitad de su cota superior), nunca por encima del máximo real.
+    """
+
+    def __init__(self):
+        self.cubetas = [0] * 64
+        self.cantidad = 0
+        self.total_ns = 0
+        self.minimo_ns = 0
+        self.maximo_ns = 0
+
+    def registrar(self, ns: int):
+        self.cubetas[min(ns.bit_length(), 63)] += 1
+        if not self.cantidad or ns < self.minimo_ns:
+            self.minimo_ns = ns
+        self.cantidad += 1
+        self.total_ns += ns
+        if ns > self.maximo_ns:
+            self.maximo_ns = ns
+
+    @property
+    def media_ns(self) -> float:
+        return self.total_ns / self.cantidad if self.cantidad else 0.0
+
+    def percentil_ns(self, q: float) -> float:
+        """Percentil q (0-1), interpolado dentro de su cubeta y acotado a [mínimo, máximo]"""
+        if not self.cantidad:
+            return 0.0
+        objetivo = q * self.cantidad
+        acumulado = 0
+        for i, n in enumerate(self.cubetas):
+            if n and acumulado + n >= objetivo:
+                desde = 1 << (i - 1) if i else 0
+                valor = desde + (objetivo - acumulado) / n * ((1 << i) - desde)
+                return min(max(valor, self.minimo_ns), self.maximo_ns)
+            acumulado += n
+        return float(self.maximo_ns)
+
+
+Funcion = Tuple[str, int, str]  # (archivo, línea, nombre), como en pstats
+PROFUNDIDAD_MAXIMA = 64
+
+
+def _marco(funcion: Funcion) -> str:
+    archivo, linea, nombre = funcion
+    if archivo == "~":  # funciones integradas
+        return nombre.replace(";", ",")
+    return f"{nombre} ({os.path.basename(archivo)}:{linea})".replace(";", ",")
+
+
+def pilas_plegadas(stats: Dict) -> Dict[str, float]:
+    """Pilas plegadas "raíz;...;hoja" -> segundos propios, a partir de pstats.Stats(...).stats"""
+    # Aristas hacia abajo: llamador -> [(llamado, tiempo propio y acumulado del llamado desde ahí)]
+    llamados: Dict[Funcion, List[Tuple[Funcion, float, float]]] = {}
+    for funcion, (_cc, _nc, _tt, _ct, llamadores) in stats.items():
+        for llamador, (_cc2, _nc2, tt, ct) in llamadores.items():
+            llamados.setdefault(llamador, []).append((funcion, tt, ct))
+    salida: Dict[str, float] = {}
+
+    def bajar(funcion: Funcion, pila: Tuple[str, ...], en_pila: frozenset, fraccion: float):
+        _cc, _nc, tt, _ct, _ = stats[funcion]
+        propio = tt * fraccion
+        if propio > 0:
+            clave = ";".join(pila)
+            salida[clave] = salida.get(clave, 0.0) + propio
+        if len(pila) >= PROFUNDIDAD_MAXIMA:
+            return
+        for hijo, tt_arista, ct_arista in llamados.get(funcion, ()):
+            if hijo in en_pila:  # recursión: su tiempo ya quedó en el primer marco
+                continue
+            _cc_h, _nc_h, tt_h, ct_h, _ = stats[hijo]
+            # Fracción del hijo que cae bajo esta pila: la parte de su tiempo que le
+            # atribuye este llamador, escalada por la fracción del llamador que está acá
+            if ct_h > 0:
+                sub = fraccion * ct_arista / ct_h
+            else:
+                sub = fraccion * tt_arista / tt_h if tt_h > 0 else 0.0
+            if sub > 1e-9:
+                bajar(hijo, pila + (_marco(hijo),), en_pila | {hijo}, sub)
+
+    for funcion, (_cc, _nc, _tt, _ct, llamadores) in stats.items():
+        if not llamadores:
+            bajar(funcion, (_marco(funcion),), frozenset((funcion,)), 1.0)
+    return salida
+
+
+class PerfiladorFases:
+    def __init__(self, ventana_tasa_s: float = 1.0):
+        self.histogramas: Dict[str, Histograma] = {fase: Histograma() for fase in FASES}
+        self.tick_total = Histograma()
+        self.ticks = 0
+        self._inicio_tick = 0
+        self._ultima_marca = 0
+
+        # Tasa de ticks por segundo sobre una ventana deslizante simple
+        self.ventana_tasa_s = ventana_tasa_s
+        self.ticks_por_segundo = 0.0
+        self._ventana = (time.perf_counter(), 0)
+
+        # Captura con cProfile de una ventana de ticks
+        self._perfil = None
+        self._perfil_restantes = 0
+        self._perfil_ruta = ""
+        self._al_terminar: Optional[Callable[[Tuple[str, str]], None]] = None
+        self.ultimo_volcado: Optional[Tuple[str, str]] = None
+
+    # ---------- Marcas (desde el hilo del motor) ----------
+    def inicio_tick(self):
+        if self._perfil_restantes and self._perfil is None:
+            import cProfile
+            self._perfil = cProfile.Profile()
+            self._perfil.enable()
+        self._inicio_tick = self._ultima_marca = time.perf_counter_ns()
+
+    def marca(self, fase: str):
+        """Cierra la fase en curso y le atribuye el tiempo desde la marca anterior"""
+        ahora = time.perf_counter_ns()
+        duracion = ahora - self._ultima_marca
+        self.histogramas[fase].registrar(duracion)
+        self._ultima_marca = ahora
+
+    def fin_tick(self):
+        self.tick_total.registrar(self._ultima_marca - self._inicio_tick)
+        self.ticks += 1
+        instante, ticks = self._ventana
+        transcurrido = time.perf_counter() - instante
+        if transcurrido >= self.ventana_tasa_s:
+            self.ticks_por_segundo = (self.ticks - ticks) / transcurrido
+            self._ventana = (time.perf_counter(), self.ticks)
+        if self._perfil is not None:
+            self._perfil_restantes -= 1
+            if self._perfil_restantes <= 0:
+                self._volcar_perfil()
+
+    # ---------- Perfil de una ventana de ticks ----------
+    def solicitar_perfil(self, ticks: int, ruta_base: str,
+                         al_terminar: Optional[Callable[[Tuple[str, str]], None]] = None):
+        """Perfila los próximos `ticks` ticks; escribe <ruta_base>.prof y <ruta_base>.folded.
+        Una captura en curso se descarta."""
+        self.cancelar()
+        self._perfil_restantes = ticks
+        self._perfil_ruta = ruta_base
+        self._al_terminar = al_terminar
+
+    def cancelar(self):
+        """Descarta la captura en curso sin volcarla y desinstala cProfile.
+        Llamar desde el hilo del motor antes de reemplazar o soltar el perfilador."""
+        if self._perfil is not None:
+            self._perfil.disable()
+        self._perfil = None
+        self._perfil_restantes = 0
+        self._al_terminar = None
+
+    def _volcar_perfil(self):
+        import pstats
+        self._perfil.disable()
+        ruta_prof = f"{self._perfil_ruta}.prof"
+        ruta_folded = f"{self._perfil_ruta}.folded"
+        self._perfil.dump_stats(ruta_prof)
+        # Pilas plegadas "raíz;...;hoja microsegundos" (flamegraph.pl / speedscope)
+        pilas = pilas_plegadas(pstats.Stats(self._perfil).stats)
+        with open(ruta_folded, "w", encoding="utf-8") as f:
+            for pila, segundos in sorted(pilas.items()):
+                us = round(segundos * 1e6)
+                if us:
+                    f.write(f"{pila} {us}\n")
+        self._perfil = None
+        self._perfil_restantes = 0
+        self.ultimo_volcado = (ruta_prof, ruta_folded)
+        if self._al_terminar is not None:
+            self._al_terminar(self.ultimo_volcado)
+
+    # ---------- Lectura ----------
+    def resumen(self) -> Tuple[Tuple[str, float, float, float, int], ...]:
+        """(fase, media ms, p99 ms, suma s, cantidad) por fase más el total del tick"""
+        filas: List[Tuple[str, float, float, float, int]] = []
+        for fase, h in list(self.histogramas.items()) + [("tick", self.tick_total)]:
+            filas.append((fase, h.media_ns / 1e6, h.percentil_ns(0.99) / 1e6, h.total_ns / 1e9, h.cantidad))
+        return tuple(filas)
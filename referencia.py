@@ -0,0 +1,476 @@
+"""
+Modelo de referencia del motor (semántica congelada).
+
+Reimplementación directa y sin optimizar de las reglas de MotorSimulacion
+con la configuración por defecto: admisión con contrapresión, FIFO con
+aging por núcleo libre, expropiación por quantum (rr), bloqueos con
+dependencia, PIDs especiales que pasan a Zombi, purga de finalizados y
+reparto de recursos. Todo se resuelve recorriendo listas y la tabla
+completa; no hay índices ni atajos.
+
+Consume el generador aleatorio en el mismo orden que el motor, así que con
+la misma semilla y las mismas acciones los dos producen exactamente las
+mismas transiciones. verificacion.py los compara tick a tick: cualquier
+optimización del motor que cambie el comportamiento aparece como una
+divergencia. Este archivo NO se optimiza; si una regla cambia a propósito,
+se cambia aquí también.
+
+Fuera del modelo: grupos de recursos, trazas, migración y árbol de
+procesos (fork/wait). Con esas opciones verificacion.py solo comprueba
+invariantes.
+"""
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+TICK_MS = 1500
+MEMORIA_TOTAL_MB = 8192.0
+PRESUPUESTO_MEMORIA_MB = MEMORIA_TOTAL_MB * 0.9
+MAX_COLA_LISTOS = 100
+MAX_LOTE_ADMISION = 8
+SEGUNDOS_HASTA_ZOMBI = 4
+TICKS_HASTA_PURGA = 3
+RESERVA_MB = {"Nuevo": 5.0, "Listo": 50.0, "Ejecución": 200.0, "Bloqueado": 100.0, "Zombi": 1.0, "Finalizado": 0.0}
+
+# (pid, estado anterior, estado nuevo); None = fuera de la tabla (alta/baja)
+Transicion = Tuple[int, Optional[str], Optional[str]]
+
+
+@dataclass
+class ProcesoRef:
+    pid: int
+    nombre: str
+    tick_llegada: int
+    duracion_ejecucion: int
+    tiempo_espera_cpu: int
+    tiempo_bloqueo: int
+    estado: str = "Nuevo"
+    tiempo_admision: int = 3
+    tiempo_estado: int = 0
+    ejecutado_previo: int = 0
+    proceso_dependencia: Optional[int] = None
+    linger_zombi: int = 0
+    tiempo_finalizado: float = 0
+    cpu_percent: float = 0.0
+    memoria_mb: float = 5.0
+    disco_percent: float = 0.0
+
+
+def _quitar(lista: List[int], pid: int) -> bool:
+    """Baja de un sorteo: el último elemento ocupa el hueco (el orden decide los sorteos siguientes)"""
+    if pid not in lista:
+        return False
+    i = lista.index(pid)
+    ultimo = lista.pop()
+    if i < len(lista):
+        lista[i] = ultimo
+    return True
+
+
+class ModeloReferencia:
+    def __init__(self, semilla: int, primer_pid: int, nucleos: int = 1, politica: str = "fifo", quantum: int = 4,
+                 umbral_aging: int = 20, prob_bloqueo_base: float = 0.02, prob_bloqueo_por_espera: float = 0.015,
+                 prob_bloqueo_max_carga: float = 0.08, max_auto_processes: int = 3, procesos_por_especial: int = 9):
+        self.rng = random.Random(semilla)
+        self.ultimo_pid = primer_pid - 1
+        self.politica = politica
+        self.quantum = quantum
+        self.umbral_aging = umbral_aging
+        self.prob_bloqueo_base = prob_bloqueo_base
+        self.prob_bloqueo_por_espera = prob_bloqueo_por_espera
+        self.prob_bloqueo_max_carga = prob_bloqueo_max_carga
+        self.max_auto_processes = max_auto_processes
+        self.procesos_por_especial = procesos_por_especial
+
+        self.tick_actual = 0
+        self.procesos: Dict[int, ProcesoRef] = {}
+        self.nucleos: List[Optional[int]] = [None] * nucleos
+        self.cola_listos: List[int] = []
+        self.procesos_bloqueados: List[int] = []
+        self.proceso_con_prioridad: Optional[int] = None
+        self.admision_retenida = False
+        self.especiales: List[int] = []
+        self.candidatos: List[int] = []
+        self.pendientes_zombi: Dict[int, float] = {}
+        self.automaticos: List[int] = []
+        self.auto_contador = 0
+        self.auto_temporizador = 0
+        self.auto_intervalo = self.rng.randint(5, 6)
+        self.transiciones: List[Transicion] = []
+        self.contadores = dict.fromkeys(("creados", "finalizados", "bloqueos", "expropiaciones",
+                                         "promociones_aging", "rechazos_admision", "ticks_cpu_ocupada"), 0)
+        self.totales = (0.0, 0.0, 0.0)  # CPU, memoria y disco tras el reparto de recursos
+
+    # ---------- Reglas comunes ----------
+    def ahora(self) -> float:
+        return self.tick_actual * TICK_MS / 1000.0
+
+    def _cambiar(self, p: ProcesoRef, nuevo: str):
+        self.transiciones.append((p.pid, p.estado, nuevo))
+        p.estado = nuevo
+
+    def _liberar(self, pid: int):
+        if pid in self.nucleos:
+            self.nucleos[self.nucleos.index(pid)] = None
+
+    def _retirar(self, pid: int):
+        """Salida fuera del tick: deja el núcleo, la cola, la lista de bloqueados y la prioridad"""
+        self._liberar(pid)
+        if pid in self.cola_listos:
+            self.cola_listos.remove(pid)
+        if pid in self.procesos_bloqueados:
+            self.procesos_bloqueados.remove(pid)
+        if self.proceso_con_prioridad == pid:
+            self.proceso_con_prioridad = None
+
+    def _duracion_variada(self) -> int:
+        tipo = self.rng.random()
+        if tipo < 0.3:
+            return self.rng.randint(3, 5)
+        if tipo < 0.7:
+            return self.rng.randint(6, 10)
+        if tipo < 0.95:
+            return self.rng.randint(12, 18)
+        return self.rng.randint(20, 30)
+
+    def _nuevo_proceso(self, nombre: str) -> ProcesoRef:
+        self.ultimo_pid += 1
+        pid = self.ultimo_pid
+        duracion = self.rng.choice((4, 7, 9))
+        espera = self.rng.choice((4, 7, 9))
+        bloqueo = self.rng.randint(3, 5)
+        p = ProcesoRef(pid, f"{nombre}-{pid}", self.tick_actual, duracion, espera, bloqueo)
+        self.procesos[pid] = p
+        if pid not in self.candidatos:
+            self.candidatos.append(pid)
+        self.transiciones.append((pid, None, "Nuevo"))
+        return p
+
+    def _actualizar_especiales(self):
+        """1 PID especial por cada `procesos_por_especial` procesos (redondeando hacia arriba)"""
+        n = self.procesos_por_especial
+        objetivo = (len(self.procesos) + n - 1) // n
+        while len(self.especiales) < objetivo and self.candidatos:
+            pid = self.candidatos[self.rng.randrange(len(self.candidatos))]
+            _quitar(self.candidatos, pid)
+            self.especiales.append(pid)
+        while len(self.especiales) > objetivo:
+            pid = self.especiales[self.rng.randrange(len(self.especiales))]
+            _quitar(self.especiales, pid)
+            self.candidatos.append(pid)
+
+    def _eliminar(self, pid: int):
+        p = self.procesos.pop(pid)
+        self.transiciones.append((pid, p.estado, None))
+        _quitar(self.candidatos, pid)
+        _quitar(self.especiales, pid)
+
+    def _finalizar(self, p: ProcesoRef):
+        self._cambiar(p, "Finalizado")
+        p.tiempo_estado = 0
+        p.tiempo_finalizado = self.ahora()
+        self.contadores["finalizados"] += 1
+        if p.pid in self.especiales:
+            self.pendientes_zombi[p.pid] = self.ahora()
+
+    def _memoria_comprometida(self) -> float:
+        return sum(RESERVA_MB[p.estado] for p in self.procesos.values())
+
+    def _admitir(self, p: ProcesoRef, memoria: float) -> bool:
+        if p.estado != "Nuevo":
+            return False
+        incremento = RESERVA_MB["Listo"] - RESERVA_MB["Nuevo"]
+        if len(self.cola_listos) >= MAX_COLA_LISTOS or memoria + incremento > PRESUPUESTO_MEMORIA_MB:
+            self.contadores["rechazos_admision"] += 1
+            return False
+        self._cambiar(p, "Listo")
+        p.tiempo_estado = 0
+        self.cola_listos.append(p.pid)
+        return True
+
+    # ---------- Acciones ----------
+    def crear_proceso(self, nombre: str = "Tarea") -> ProcesoRef:
+        p = self._nuevo_proceso(nombre)
+        self.contadores["creados"] += 1
+        self._actualizar_especiales()
+        return p
+
+    def crear_procesos(self, n: int, nombre: str = "Tarea") -> List[ProcesoRef]:
+        if n <= 0:
+            return []
+        nuevos = [self._nuevo_proceso(nombre) for _ in range(n)]
+        self.contadores["creados"] += n
+        self._actualizar_especiales()
+        return nuevos
+
+    def admitir(self, pids: List[int]):
+        for pid in pids:
+            p = self.procesos.get(pid)
+            if p and p.estado == "Nuevo":
+                self._admitir(p, self._memoria_comprometida())
+
+    def finalizar(self, pids: List[int]):
+        for pid in pids:
+            p = self.procesos.get(pid)
+            if p:
+                self._retirar(pid)
+                self._finalizar(p)
+
+    def enviar_a_zombi(self, pids: List[int]):
+        for pid in pids:
+            p = self.procesos.get(pid)
+            if p:
+                self._retirar(pid)
+                self._cambiar(p, "Zombi")
+                p.tiempo_estado = 0
+                p.linger_zombi = self.rng.randint(5, 12)
+
+    def recolectar_zombis(self):
+        for pid in sorted(p.pid for p in self.procesos.values() if p.estado == "Zombi"):
+            self._finalizar(self.procesos[pid])
+
+    def kill_zombi(self):
+        zombis = [p.pid for p in self.procesos.values() if p.estado == "Zombi"]
+        if not zombis:
+            return
+        pid = min(zombis)
+        self._eliminar(pid)
+        if pid in self.automaticos:
+            self.automaticos.remove(pid)
+            self.auto_contador -= 1
+        self._actualizar_especiales()
+
+    def forzar_ejecucion(self, pid: int):
+        p = self.procesos.get(pid)
+        if not p:
+            return
+        if p.estado == "Nuevo":
+            self._admitir(p, self._memoria_comprometida())
+            return
+        if p.estado != "Listo" or not self.cola_listos or self.cola_listos[0] != pid:
+            return
+        self.cola_listos.pop(0)
+        if None in self.nucleos:
+            nucleo = self.nucleos.index(None)
+        else:
+            # Sin núcleo libre se desaloja al del último núcleo, que conserva lo ejecutado de
+            # la ráfaga y vuelve al frente de la cola
+            nucleo = len(self.nucleos) - 1
+            actual = self.procesos.get(self.nucleos[nucleo])
+            self.nucleos[nucleo] = None
+            if actual and actual.estado == "Ejecución":
+                if self.proceso_con_prioridad == actual.pid:
+                    self.proceso_con_prioridad = None
+                self._cambiar(actual, "Listo")
+                actual.ejecutado_previo += actual.tiempo_estado
+                actual.tiempo_estado = 0
+                self.cola_listos.insert(0, actual.pid)
+                self.contadores["expropiaciones"] += 1
+        self._cambiar(p, "Ejecución")
+        p.tiempo_estado = 0
+        if p.duracion_ejecucion <= 0:
+            p.duracion_ejecucion = self._duracion_variada()
+        self.nucleos[nucleo] = pid
+
+    # ---------- Tick ----------
+    def tick(self):
+        self.tick_actual += 1
+        n = self.procesos_por_especial
+        if self.procesos and len(self.especiales) < (len(self.procesos) + n - 1) // n:
+            self._actualizar_especiales()
+
+        self.auto_temporizador += 1
+        if self.auto_contador < self.max_auto_processes and self.auto_temporizador >= self.auto_intervalo:
+            self.automaticos.append(self.crear_proceso("System").pid)
+            self.auto_contador += 1
+            self.auto_temporizador = 0
+            self.auto_intervalo = self.rng.randint(5, 6)
+
+        self._admision()
+        for p in self.procesos.values():
+            if p.estado == "Listo":
+                p.tiempo_estado += 1
+        self._despacho()
+        self._ejecucion()
+        self._desbloqueo()
+        for p in self.procesos.values():
+            if p.estado in ("Zombi", "Finalizado"):
+                p.tiempo_estado += 1
+        self._conversion_zombis()
+        self._purga()
+        self._recursos()
+
+    def _admision(self):
+        """Nuevo -> Listo: avanza solo el menor PID (o todos con contrapresión); lote acotado"""
+        nuevos = sorted((p for p in self.procesos.values() if p.estado == "Nuevo"), key=lambda p: p.pid)
+        if not nuevos:
+            return
+        if self.admision_retenida:
+            for p in nuevos:
+                if p.tiempo_estado < p.tiempo_admision:
+                    p.tiempo_estado += 1
+        else:
+            nuevos[0].tiempo_estado += 1
+        preparados = [p for p in nuevos if p.tiempo_estado >= p.tiempo_admision]
+        memoria = self._memoria_comprometida()
+        admitidos = 0
+        sin_capacidad = False
+        for p in preparados:
+            if admitidos >= MAX_LOTE_ADMISION:
+                break
+            if not self._admitir(p, memoria):
+                sin_capacidad = True
+                break
+            memoria += RESERVA_MB["Listo"] - RESERVA_MB["Nuevo"]
+            admitidos += 1
+        # El corte por tamaño de lote no es contrapresión
+        self.admision_retenida = sin_capacidad
+
+    def _despacho(self):
+        """Un proceso por núcleo libre: el hambriento de menor PID pasa al frente; si el primero
+        todavía no esperó su tiempo, nadie lo adelanta"""
+        while None in self.nucleos and self.cola_listos:
+            hambrientos = [pid for pid in self.cola_listos
+                           if pid in self.procesos and self.procesos[pid].estado == "Listo"
+                           and self.procesos[pid].tiempo_estado >= self.umbral_aging]
+            if hambrientos:
+                elegido = min(hambrientos)
+                self.cola_listos.remove(elegido)
+                self.cola_listos.insert(0, elegido)
+                self.contadores["promociones_aging"] += 1
+            p = self.procesos.get(self.cola_listos[0])
+            if not (p and p.estado == "Listo" and p.tiempo_estado >= p.tiempo_espera_cpu):
+                break
+            self.cola_listos.pop(0)
+            self._cambiar(p, "Ejecución")
+            p.tiempo_estado = 0
+            if p.duracion_ejecucion <= 0:
+                p.duracion_ejecucion = self._duracion_variada()
+            self.nucleos[self.nucleos.index(None)] = p.pid
+            if p.pid in hambrientos:
+                self.proceso_con_prioridad = p.pid
+
+    def _ejecucion(self):
+        """Ejecución -> Bloqueado / Finalizado / Listo (quantum), en orden de núcleo"""
+        for pid in [pid for pid in self.nucleos if pid is not None]:
+            p = self.procesos.get(pid)
+            if not p or p.estado != "Ejecución":
+                continue
+            p.tiempo_estado += 1
+            self.contadores["ticks_cpu_ocupada"] += 1
+            ejecutado = p.ejecutado_previo + p.tiempo_estado
+            esperando = len(self.cola_listos)
+            probabilidad = self.prob_bloqueo_base + min(esperando * self.prob_bloqueo_por_espera,
+                                                        self.prob_bloqueo_max_carga)
+            if (esperando > 0 and not self.procesos_bloqueados and p.tiempo_estado >= 3
+                    and self.rng.random() < probabilidad):
+                if self.proceso_con_prioridad == pid:
+                    self.proceso_con_prioridad = None
+                self._cambiar(p, "Bloqueado")
+                p.tiempo_estado = 0
+                p.tiempo_bloqueo = self.rng.randint(3, 5)
+                dependencias = [q.pid for q in self.procesos.values()
+                                if q.pid != pid and q.estado in ("Listo", "Ejecución")]
+                p.proceso_dependencia = min(dependencias) if dependencias else None
+                p.ejecutado_previo = 0
+                self.procesos_bloqueados.append(pid)
+                self._liberar(pid)
+                self.contadores["bloqueos"] += 1
+            elif ejecutado >= p.duracion_ejecucion:
+                self._liberar(pid)
+                p.ejecutado_previo = 0
+                if self.proceso_con_prioridad == pid:
+                    self.proceso_con_prioridad = None
+                self._finalizar(p)
+            elif self.politica == "rr" and p.tiempo_estado >= self.quantum and self.cola_listos:
+                if self.proceso_con_prioridad == pid:
+                    self.proceso_con_prioridad = None
+                self._cambiar(p, "Listo")
+                p.ejecutado_previo += p.tiempo_estado
+                p.tiempo_estado = 0
+                self._liberar(pid)
+                self.cola_listos.append(pid)
+                self.contadores["expropiaciones"] += 1
+
+    def _desbloqueo(self):
+        """Bloqueado -> Listo al cumplir su tiempo, sin proceso con prioridad y con la dependencia resuelta"""
+        for p in self.procesos.values():
+            if p.estado != "Bloqueado":
+                continue
+            p.tiempo_estado += 1
+            if p.tiempo_estado < p.tiempo_bloqueo or self.proceso_con_prioridad is not None:
+                continue
+            dependencia = self.procesos.get(p.proceso_dependencia) if p.proceso_dependencia else None
+            if dependencia and dependencia.estado in ("Listo", "Ejecución"):
+                continue
+            if p.pid in self.procesos_bloqueados:
+                self._cambiar(p, "Listo")
+                p.tiempo_estado = 0
+                p.proceso_dependencia = None
+                self.procesos_bloqueados.remove(p.pid)
+                self.cola_listos.append(p.pid)
+
+    def _conversion_zombis(self):
+        ahora = self.ahora()
+        for pid in [pid for pid, t in self.pendientes_zombi.items() if ahora - t >= SEGUNDOS_HASTA_ZOMBI]:
+            p = self.procesos.get(pid)
+            if p and p.estado == "Finalizado":
+                self._cambiar(p, "Zombi")
+                p.tiempo_estado = 0
+                p.linger_zombi = self.rng.randint(5, 12)
+            del self.pendientes_zombi[pid]
+
+    def _purga(self):
+        """Los finalizados que no son especiales se eliminan de la tabla a los 3 ticks"""
+        purgados = [p.pid for p in self.procesos.values()
+                    if p.estado == "Finalizado" and p.pid not in self.especiales
+                    and p.tiempo_estado >= TICKS_HASTA_PURGA]
+        for pid in purgados:
+            self._eliminar(pid)
+            if pid in self.automaticos:
+                self.automaticos.remove(pid)
+                self.auto_contador -= 1
+        if purgados:
+            self._actualizar_especiales()
+
+    def _recursos(self):
+        rng = self.rng
+        for p in self.procesos.values():
+            if p.estado == "Nuevo":
+                p.cpu_percent, p.memoria_mb, p.disco_percent = 0.0, 5.0, 0.0
+            elif p.estado == "Listo":
+                p.cpu_percent, p.memoria_mb, p.disco_percent = 0.0, rng.uniform(10.0, 50.0), 0.0
+            elif p.estado == "Ejecución":
+                p.cpu_percent = rng.uniform(15.0, 45.0)
+                p.memoria_mb = rng.uniform(50.0, 200.0)
+                p.disco_percent = rng.uniform(5.0, 25.0) if rng.random() < 0.4 else 0.0
+            elif p.estado == "Bloqueado":
+                p.cpu_percent = 0.0
+                if p.memoria_mb == 0:
+                    p.memoria_mb = rng.uniform(30.0, 100.0)
+                p.disco_percent = 0.0
+            elif p.estado == "Finalizado":
+                p.cpu_percent, p.memoria_mb, p.disco_percent = 0.0, 0.0, 0.0
+            elif p.estado == "Zombi":
+                p.cpu_percent, p.memoria_mb, p.disco_percent = 0.0, 1.0, 0.0
+
+        ejecutando = [p for p in self.procesos.values() if p.estado == "Ejecución"]
+        if ejecutando:
+            cpu = sum(p.cpu_percent for p in ejecutando)
+            if cpu > 100.0:
+                for p in ejecutando:
+                    p.cpu_percent *= 100.0 / cpu
+            disco = sum(p.disco_percent for p in ejecutando if p.disco_percent > 0)
+            if disco > 100.0:
+                for p in ejecutando:
+                    if p.disco_percent > 0:
+                        p.disco_percent *= 100.0 / disco
+        memoria = sum(p.memoria_mb for p in self.procesos.values())
+        if memoria > MEMORIA_TOTAL_MB:
+            factor = MEMORIA_TOTAL_MB / memoria
+            for p in self.procesos.values():
+                if p.memoria_mb > 0:
+                    p.memoria_mb *= factor
+        self.totales = (sum(p.cpu_percent for p in ejecutando),
+                        sum(p.memoria_mb for p in self.procesos.values()),
+                        sum(p.disco_percent for p in ejecutando))
@@ -0,0 +1,95 @@
+"""
+Historial de series temporales con memoria fija.
+
+Todas las series comparten el mismo reloj (una muestra por tick), así que
+cada nivel guarda un array('d') de capacidad fija por serie y un único
+índice circular. El nivel 0 tiene una muestra por tick y cada nivel
+siguiente el promedio de `factor` muestras del anterior: con capacidad 600,
+factor 10 y 5 niveles el último nivel cubre 6M ticks y la memoria no crece
+con la duración de la simulación.
+"""
+import threading
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+
+class _Nivel:
+    """Anillos paralelos (uno por serie) con un índice circular común"""
+
+    def __init__(self, series: int, capacidad: int):
+        self.capacidad = capacidad
+        self.datos = [array("d", bytes(8 * capacidad)) for _ in range(series)]
+        self.inicio = 0
+        self.cantidad = 0
+        # Acumuladores para promediar hacia el nivel siguiente
+        self.sumas = [0.0] * series
+        self.acumuladas = 0
+
+    def agregar(self, valores: List[float]):
+        fin = (self.inicio + self.cantidad) % self.capacidad
+        for datos, valor in zip(self.datos, valores):
+            datos[fin] = valor
+        if self.cantidad < self.capacidad:
+            self.cantidad += 1
+        else:
+            self.inicio = (self.inicio + 1) % self.capacidad
+
+    def valores(self, indice: int, n: int) -> List[float]:
+        """Los últimos n valores de una serie en orden cronológico"""
+        datos = self.datos[indice]
+        n = min(n, self.cantidad)
+        primero = (self.inicio + self.cantidad - n) % self.capacidad
+        if primero + n <= self.capacidad:
+            return datos[primero:primero + n].tolist()
+        return datos[primero:].tolist() + datos[:primero + n - self.capacidad].tolist()
+
+
+class AlmacenSeries:
+    """Conjunto de series con un mismo reloj; se escribe desde el motor y se lee desde la interfaz"""
+
+    def __init__(self, nombres: Iterable[str], capacidad: int = 600, factor: int = 10, niveles: int = 5):
+        self.nombres = tuple(nombres)
+        self.indices = {nombre: i for i, nombre in enumerate(self.nombres)}
+        self.capacidad = capacidad
+        self.factor = factor
+        self.niveles = [_Nivel(len(self.nombres), capacidad) for _ in range(niveles)]
+        self.muestras = 0   # muestras registradas en el nivel 0
+        self.version = 0    # cambia con cada registro (para redibujar solo si hay datos nuevos)
+        self.ultima: Dict[str, float] = {}  # último registro tal cual (para volcar series tick a tick)
+        self._lock = threading.Lock()
+
+    def registrar(self, valores: Dict[str, float]):
+        self.ultima = valores
+        fila = [valores.get(nombre, 0.0) for nombre in self.nombres]
+        with self._lock:
+            for i, nivel in enumerate(self.niveles):
+                nivel.agregar(fila)
+                if i + 1 == len(self.niveles):
+                    break
+                sumas = nivel.sumas
+                for j, valor in enumerate(fila):
+                    sumas[j] += valor
+                nivel.acumuladas += 1
+                if nivel.acumuladas < self.factor:
+                    break
+                fila = [s / nivel.acumuladas for s in sumas]
+                nivel.sumas = [0.0] * len(fila)
+                nivel.acumuladas = 0
+            self.muestras += 1
+            self.version += 1
+
+    def ticks_por_punto(self, nivel: int) -> int:
+        return self.factor ** nivel
+
+    def nivel_para(self, ventana_ticks: int) -> int:
+        """Nivel más fino cuyo anillo cubre la ventana pedida"""
+        for nivel in range(len(self.niveles)):
+            if self.capacidad * self.ticks_por_punto(nivel) >= ventana_ticks:
+                return nivel
+        return len(self.niveles) - 1
+
+    def leer(self, nombres: Iterable[str], nivel: int, n: int) -> Tuple[int, Dict[str, List[float]]]:
+        """(versión, últimos n puntos de cada serie en el nivel dado)"""
+        with self._lock:
+            datos = self.niveles[nivel]
+            return self.version, {nombre: datos.valores(self.indices[nombre], n) for nombre in nombres}
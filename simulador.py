@@ -0,0 +1,1842 @@
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Iterable, Iterator, List, Optional, Dict, Sequence, Set, Tuple
+
+from grupos import CUOTA_POR_DEFECTO, RAIZ, ArbolGrupos, parsear_grupo
+from series import AlmacenSeries
+
+# ===============================
+# Modelo de Procesos y Estados
+# ===============================
+# Este módulo no depende de tkinter: lo usan la interfaz (app.py) y las
+# ejecuciones sin ventana (barrido de parámetros).
+
+
+# Tiempo
+
+def generar_duracion_ejecucion_variada(rng=random) -> int:
+    """
+    Genera duración de ejecución variada y observable:
+    - 30% procesos cortos (3-5 ticks = 9-15 segundos)
+    - 40% procesos normales (6-10 ticks = 18-30 segundos)
+    - 25% procesos largos (12-18 ticks = 36-54 segundos)
+    - 5% procesos muy largos (20-30 ticks = 60-90 segundos)
+    """
+    tipo = rng.random()
+    if tipo < 0.3:  # Procesos cortos
+        return rng.randint(3, 5)
+    elif tipo < 0.7:  # Procesos normales
+        return rng.randint(6, 10)
+    elif tipo < 0.95:  # Procesos largos
+        return rng.randint(12, 18)
+    else:  # Procesos muy largos
+        return rng.randint(20, 30)
+
+def generar_tiempo_ejecucion_variado(rng=random) -> int:
+    """Genera tiempo variado para Listo -> Ejecución (4, 7, o 9 ticks)"""
+    opciones = [4, 7, 9]
+    return rng.choice(opciones)
+
+def generar_tiempo_bloqueo(rng=random) -> int:
+    """Genera tiempo de bloqueo (3-5 ticks)"""
+    return rng.randint(3, 5)
+
+def generar_tiempo_admision_variado(rng=random) -> int:
+    """Genera tiempo de admisión FIJO para Nuevo -> Listo (siempre 3 ticks)"""
+    return 3
+
+def generar_tiempo_espera_cpu(rng=random) -> int:
+    """Genera tiempo de espera variado en Listo antes de poder ejecutar (4, 7, o 9 ticks)"""
+    return generar_tiempo_ejecucion_variado(rng)
+
+def generar_linger_zombi_variado(rng=random) -> int:
+    """Genera tiempo de linger para zombis (5-12 ticks = 15-36 segundos)"""
+    return rng.randint(5, 12)
+
+# ===============================
+# Modelo de Proceso y Planificador
+# ===============================
+
+ESTADOS = (
+    "Listo",
+    "Ejecución",
+    "Bloqueado",
+    "Zombi",
+    "Finalizado",
+)
+
+# Series del historial: totales de recursos, cola de listos y un conteo por estado
+SERIES_HISTORIAL = ("cpu", "memoria", "disco", "cola_listos", "Nuevo") + ESTADOS
+
+# Políticas de planificación de corto plazo
+POLITICAS = ("fifo", "rr")
+
+ESTADO_COLOR = {
+    "Nuevo": "#D0E1FF",        # azul claro
+    "Listo": "#E7FFD0",        # verde claro
+    "Ejecución": "#FFF3B0",    # amarillo claro
+    "Bloqueado": "#FFB3B3",    # rojo claro
+    "Zombi": "#D6C6F5",        # lila
+    "Finalizado": "#E0E0E0",    # gris
+}
+
+# Memoria comprometida por estado (peor caso de cada rango de _distribuir_recursos_sistema).
+# La usa el control de admisión para proyectar el uso antes de la normalización.
+MEMORIA_RESERVA_MB = {
+    "Nuevo": 5.0,
+    "Listo": 50.0,
+    "Ejecución": 200.0,
+    "Bloqueado": 100.0,
+    "Zombi": 1.0,
+    "Finalizado": 0.0,
+}
+
+class ConjuntoAleatorio:
+    """
+    Conjunto de PIDs con pertenencia, alta, baja y elección aleatoria en O(1).
+    Guarda los elementos en una lista y su posición en un diccionario; al
+    quitar, el último elemento ocupa el hueco.
+    """
+
+    def __init__(self):
+        self._elementos: List[int] = []
+        self._posicion: Dict[int, int] = {}
+
+    def agregar(self, pid: int):
+        if pid not in self._posicion:
+            self._posicion[pid] = len(self._elementos)
+            self._elementos.append(pid)
+
+    def quitar(self, pid: int) -> bool:
+        i = self._posicion.pop(pid, None)
+        if i is None:
+            return False
+        ultimo = self._elementos.pop()
+        if i < len(self._elementos):
+            self._elementos[i] = ultimo
+            self._posicion[ultimo] = i
+        return True
+
+    def elegir(self, rng) -> int:
+        return self._elementos[rng.randrange(len(self._elementos))]
+
+    def __contains__(self, pid) -> bool:
+        return pid in self._posicion
+
+    def __len__(self) -> int:
+        return len(self._elementos)
+
+    def __iter__(self):
+        return iter(self._elementos)
+
+    def __repr__(self) -> str:
+        return f"ConjuntoAleatorio({sorted(self._elementos)})"
+
+_id_counter = 1000
+# Init virtual: adopta a los huérfanos y recolecta a sus zombis (no figura en la tabla)
+PID_INIT = 1
+
+def next_pid() -> int:
+    global _id_counter
+    _id_counter += 1
+    return _id_counter
+
+def reservar_pids(n: int) -> range:
+    """Reserva n PIDs consecutivos de una sola vez (creación masiva)"""
+    global _id_counter
+    inicio = _id_counter + 1
+    _id_counter += n
+    return range(inicio, _id_counter + 1)
+
+@dataclass
+class Proceso:
+    pid: int
+    nombre: str
+    estado: str = "Nuevo"
+    tiempo_llegada: float = field(default_factory=time.time)
+    tick_llegada: int = 0            # tick de simulación en que se creó (métricas de admisión)
+    # Simulación automática
+    tiempo_estado: int = 0           # ticks acumulados en el estado actual
+    duracion_ejecucion: int = 0      # ticks que requiere en Ejecución
+    ejecutado_previo: int = 0        # ticks de la ráfaga ya ejecutados en quantums anteriores (rr)
+    tiempo_admision: int = 0         # ticks requeridos para pasar de Nuevo a Listo
+    tiempo_espera_cpu: int = 0       # ticks que debe esperar en Listo antes de poder ejecutar
+    tiempo_bloqueo: int = 0          # ticks que permanecerá en Bloqueado (3-5 ticks)
+    proceso_dependencia: Optional[int] = None  # PID del proceso del cual depende cuando está bloqueado
+    linger_zombi: int = 0            # ticks que permanecerá en Zombi
+    tiempo_finalizado: float = 0     # timestamp cuando pasó a Finalizado (para auto-eliminación)
+    padre: Optional[int] = None      # PID del padre si nació por fork (PID_INIT si quedó huérfano)
+    recolecta: bool = True           # como padre, hace wait() al recibir SIGCHLD (False: deja zombis)
+    sigchld: int = 0                 # SIGCHLD recibidos sin atender
+    # Costos de planificación (CostosCambio): dónde corrió por última vez y sobrecarga pendiente
+    ultimo_nucleo: Optional[int] = None
+    ultima_entrada: int = 0          # entradas al núcleo contadas hasta la suya (para la cache)
+    sobrecarga: float = 0.0          # ticks de núcleo adeudados; se pagan de a uno entero
+    grupo: str = RAIZ                # grupo de recursos (grupos.py)
+    automatizado: bool = True        # False: sin bloqueos aleatorios (p. ej. procesos reproducidos de una traza)
+    # Comportamiento grabado (trazas.py): ráfagas de CPU que siguen a la actual y E/S previa a cada una
+    rafagas: Tuple[int, ...] = ()
+    bloqueos: Tuple[int, ...] = ()
+    # Recursos del sistema
+    cpu_percent: float = 0.0         # Porcentaje de CPU (0-100%)
+    memoria_mb: float = 0.0          # Memoria en MB
+    disco_percent: float = 0.0       # Porcentaje de disco (0-100%)
+
+    # Última fila mostrada y los valores con que se formateó: cada texto se
+    # rehace solo si cambió su valor, y si no cambió nada se devuelve la
+    # misma tupla (la interfaz la reconoce sin comparar columna por columna).
+    _fila: Tuple[tuple, Tuple[str, ...]] = field(default=((None,) * 8, ("",) * 8),
+                                                 init=False, repr=False, compare=False)
+
+    def to_row(self) -> Tuple[str, ...]:
+        valores = (self.estado, self.proceso_dependencia, self.nombre, self.tiempo_estado,
+                   self.duracion_ejecucion, self.cpu_percent, self.memoria_mb, self.disco_percent)
+        anteriores, textos = self._fila
+        if anteriores == valores:
+            return textos
+        estado, dependencia, nombre, tiempo, duracion, cpu, memoria, disco = valores
+
+        if anteriores[:3] == valores[:3]:
+            nombre_display = textos[1]
+        elif estado == "Bloqueado" and dependencia:
+            # Mostrar dependencia en el nombre si está bloqueado
+            nombre_display = f"{nombre} (→{dependencia})"
+        else:
+            nombre_display = nombre
+
+        if anteriores[4] == duracion:
+            duracion_str = textos[4]
+        else:
+            duracion_str = f"{duracion}" if duracion > 0 else "Auto"
+
+        fila = (
+            textos[0] or str(self.pid),
+            nombre_display,
+            estado,
+            textos[3] if anteriores[3] == tiempo else str(tiempo),
+            duracion_str,
+            textos[5] if anteriores[5] == cpu else f"{cpu:.1f}%",
+            textos[6] if anteriores[6] == memoria else f"{memoria:.0f} MB",
+            textos[7] if anteriores[7] == disco else f"{disco:.1f}%",
+        )
+        self._fila = (valores, fila)
+        return fila
+
+@dataclass(frozen=True)
+class ProcesoTraza:
+    """Proceso reconstruido de una captura real (trazas.py): llegada y comportamiento en ticks"""
+    llegada: int                     # tick de llegada relativo al inicio de la traza
+    pid: int                         # PID en el equipo donde se grabó
+    nombre: str
+    rafagas: Tuple[int, ...]         # ráfagas de CPU (al menos una)
+    bloqueos: Tuple[int, ...] = ()   # E/S entre ráfagas: bloqueos[i] va entre rafagas[i] y rafagas[i+1]
+
+@dataclass
+class CostosCambio:
+    """
+    Sobrecarga del planificador en ticks de núcleo, cobrada al proceso que entra. Los
+    costos pueden ser fracciones: se acumulan en el proceso y cada tick entero adeudado
+    lo pasa ocupando el núcleo sin que la ráfaga avance. Todo en 0 = gratis.
+    - cambio_contexto: guardar el contexto del que sale y cargar el del que entra; no se
+      cobra si el proceso vuelve a su núcleo sin que otro lo haya usado entretanto.
+    - cache_fria: vuelve a su núcleo pero por él pasaron más de `capacidad_cache` procesos.
+    - migracion: vuelve en un núcleo distinto del último (su cache quedó en el otro).
+    """
+    cambio_contexto: float = 0.0
+    cache_fria: float = 0.0
+    migracion: float = 0.0
+    capacidad_cache: int = 1         # otros procesos que caben en la cache de un núcleo sin desalojarlo
+
+@dataclass
+class MetricasCambios:
+    """Entradas a núcleo con costo y ticks de núcleo gastados en sobrecarga"""
+    cambios_contexto: int = 0
+    caches_frias: int = 0
+    migraciones: int = 0
+    ticks_sobrecarga: int = 0
+
+@dataclass
+class MetricasAdmision:
+    """Tiempo que pasan los procesos en Nuevo y rechazos por falta de capacidad"""
+    admitidos: int = 0
+    rechazos: int = 0
+    espera_total: int = 0            # ticks acumulados en Nuevo de los admitidos
+    espera_maxima: int = 0
+
+    def registrar(self, espera: int):
+        self.admitidos += 1
+        self.espera_total += espera
+        self.espera_maxima = max(self.espera_maxima, espera)
+
+    @property
+    def espera_promedio(self) -> float:
+        return self.espera_total / self.admitidos if self.admitidos else 0.0
+
+@dataclass(frozen=True)
+class Instantanea:
+    """Foto inmutable del estado tras un tick; la interfaz solo dibuja a partir de ellas"""
+    tick: int
+    filas: Tuple[Tuple[str, ...], ...]   # to_row de los procesos visibles (no Nuevo)
+    total: int
+    por_estado: Tuple[Tuple[str, int], ...]
+    total_finalizados: int
+    cola_listos: int
+    cpu_total: float
+    memoria_total: float
+    disco_total: float
+    memoria_total_disponible: float
+    espera_nuevo_promedio: float
+    espera_nuevo_maxima: int
+    rechazos_admision: int
+    memoria_comprometida: float
+    presupuesto_memoria_mb: float
+    admision_retenida: bool
+    ticks_por_segundo: float = 0.0
+    # Historial del motor (series.py). Es el único objeto vivo que viaja en la instantánea:
+    # el motor escribe y la interfaz lee, sincronizados por el lock propio del almacén
+    series: Optional[AlmacenSeries] = None
+    perfil: Tuple[Tuple[str, float, float, float, int], ...] = ()  # PerfiladorFases.resumen(), si hay perfilador
+
+class Planificador:
+    def __init__(self, presupuesto_memoria_mb: float = 8192.0, max_cola_listos: int = 100,
+                 max_lote_admision: int = 8, rng=random, nucleos: int = 1,
+                 politica: str = "fifo", quantum: int = 4):
+        if politica not in POLITICAS:
+            raise ValueError(f"política desconocida: {politica} (opciones: {', '.join(POLITICAS)})")
+        if nucleos < 1:
+            raise ValueError("se necesita al menos un núcleo")
+        self.cola_listos: List[int] = []  # pids
+        self.procesos_bloqueados: List[int] = []  # pids de procesos bloqueados
+        self.zombis: Set[int] = set()  # pids en Zombi (índice que mantiene cambiar_estado)
+        self.nucleos: List[Optional[int]] = [None] * nucleos  # PID en ejecución por núcleo
+        self._nucleo_de: Dict[int, int] = {}
+        self.proceso_con_prioridad: Optional[int] = None  # PID del proceso ejecutándose por aging
+        self.politica = politica   # "fifo": corre hasta terminar o bloquearse; "rr": expropia al agotar el quantum
+        self.quantum = quantum
+        self.rng = rng
+        # Control de admisión (planificador de largo plazo)
+        self.presupuesto_memoria_mb = presupuesto_memoria_mb
+        self.max_cola_listos = max_cola_listos
+        self.max_lote_admision = max_lote_admision
+        self.metricas_admision = MetricasAdmision()
+        # Costos de cambio de contexto, cache y migración entre núcleos
+        self.costos = CostosCambio()
+        self.metricas_cambios = MetricasCambios()
+        self._entradas: List[int] = [0] * nucleos  # procesos que entraron a cada núcleo
+        self.grupos: Optional[ArbolGrupos] = None  # límites de memoria por grupo en la admisión
+        # Índices que mantienen cambiar_estado, registrar_altas y registrar_baja (sin recorrer la tabla):
+        # memoria comprometida total y por grupo (con subgrupos), y procesos en Listo por grupo propio
+        self._comprometida = 0.0
+        self.comprometida_grupo: Dict[str, float] = {}
+        self.listos_grupo: Counter = Counter()
+        # Observador de transiciones: (proceso, anterior, nuevo); None = fuera de la tabla
+        self.al_transicion: Optional[Callable[[Proceso, Optional[str], Optional[str]], None]] = None
+
+    def cambiar_estado(self, proceso: Proceso, nuevo: str):
+        anterior = proceso.estado
+        proceso.estado = nuevo
+        if anterior == "Zombi":
+            self.zombis.discard(proceso.pid)
+        if nuevo == "Zombi":
+            self.zombis.add(proceso.pid)
+        delta = MEMORIA_RESERVA_MB.get(nuevo, 0.0) - MEMORIA_RESERVA_MB.get(anterior, 0.0)
+        if delta:
+            self._reservar(proceso.grupo, delta)
+        if anterior == "Listo":
+            self.listos_grupo[proceso.grupo] -= 1
+        if nuevo == "Listo":
+            self.listos_grupo[proceso.grupo] += 1
+        if self.al_transicion is not None:
+            self.al_transicion(proceso, anterior, nuevo)
+
+    def _reservar(self, ruta: str, mb: float):
+        self._comprometida += mb
+        if self.grupos is not None:
+            comprometida = self.comprometida_grupo
+            for grupo in self.grupos[ruta].linaje():
+                comprometida[grupo.ruta] = comprometida.get(grupo.ruta, 0.0) + mb
+
+    def registrar_altas(self, procesos: Iterable[Proceso]):
+        """Procesos que entran a la tabla (creados, de traza o migrados) en su estado actual"""
+        for p in procesos:
+            self._reservar(p.grupo, MEMORIA_RESERVA_MB.get(p.estado, 0.0))
+            if p.estado == "Listo":
+                self.listos_grupo[p.grupo] += 1
+
+    def registrar_baja(self, proceso: Proceso):
+        """Proceso que sale de la tabla (purga, kill o migración)"""
+        self._reservar(proceso.grupo, -MEMORIA_RESERVA_MB.get(proceso.estado, 0.0))
+        if proceso.estado == "Listo":
+            self.listos_grupo[proceso.grupo] -= 1
+
+    def memoria_comprometida(self) -> float:
+        """Memoria proyectada en el peor caso según el estado de cada proceso (índice, O(1))"""
+        return self._comprometida
+
+    def puede_admitir(self, memoria_comprometida: float) -> bool:
+        """Hay capacidad si la cola de listos y la memoria proyectada quedan dentro del presupuesto"""
+        if len(self.cola_listos) >= self.max_cola_listos:
+            return False
+        incremento = MEMORIA_RESERVA_MB["Listo"] - MEMORIA_RESERVA_MB["Nuevo"]
+        return memoria_comprometida + incremento <= self.presupuesto_memoria_mb
+
+    def admitir(self, proceso: Proceso, memoria_comprometida: Optional[float] = None,
+                tick_actual: Optional[int] = None) -> bool:
+        """Pasa un proceso de Nuevo a Listo. Devuelve False si no hay capacidad."""
+        if proceso.estado != "Nuevo":
+            return False
+        if memoria_comprometida is not None and not self.puede_admitir(memoria_comprometida):
+            self.metricas_admision.rechazos += 1
+            return False
+        self.cambiar_estado(proceso, "Listo")
+        proceso.tiempo_estado = 0
+        self.cola_listos.append(proceso.pid)
+        if tick_actual is not None:
+            self.metricas_admision.registrar(tick_actual - proceso.tick_llegada)
+        return True
+
+    def admitir_lote(self, candidatos: List[Proceso], procesos: Dict[int, Proceso],
+                     tick_actual: int) -> Tuple[List[Proceso], bool, Set[str]]:
+        """Admite candidatos en orden hasta agotar la capacidad o el tamaño de lote.
+
+        Devuelve los admitidos, si alguno quedó afuera por falta de capacidad
+        del sistema (memoria o cola de listos) y los grupos que retuvieron a sus
+        procesos por su propio límite de memoria. Un grupo lleno no es
+        contrapresión del sistema, y cortar por el tamaño de lote tampoco.
+        """
+        incremento = MEMORIA_RESERVA_MB["Listo"] - MEMORIA_RESERVA_MB["Nuevo"]
+        grupos = self.grupos if self.grupos is not None and self.grupos.activo else None
+        llenos: Set[str] = set()
+        if grupos is not None:
+            candidatos = self._intercalar_por_grupo(candidatos, llenos)
+        admitidos = []
+        sin_capacidad = False
+        for proceso in candidatos:
+            if len(admitidos) >= self.max_lote_admision:
+                break
+            # Un grupo en su límite de memoria retiene solo a sus procesos
+            if grupos is not None and not grupos.cabe(proceso.grupo, self.comprometida_grupo, incremento):
+                llenos.add(proceso.grupo)
+                grupos.cargar(proceso.grupo, "rechazos_admision")
+                continue
+            # Contrapresión: si el primero no cabe, los siguientes esperan (orden FIFO)
+            if not self.admitir(proceso, self._comprometida, tick_actual):
+                sin_capacidad = True
+                break
+            admitidos.append(proceso)
+        return admitidos, sin_capacidad, llenos
+
+    def _intercalar_por_grupo(self, candidatos: List[Proceso], llenos: Set[str]) -> Iterator[Proceso]:
+        """Con grupos la admisión va por turnos entre grupos, empezando por el que menos
+        ocupa la cola de listos por unidad de cuota (un grupo inundado no acapara la cola).
+        Es perezoso: admitir_lote deja de pedir al completar el lote, y los procesos de un
+        grupo que se llenó (`llenos`, que admitir_lote va completando) se saltean sin recorrerlos."""
+        por_grupo: Dict[str, List[Proceso]] = {}
+        for proceso in candidatos:
+            por_grupo.setdefault(proceso.grupo, []).append(proceso)
+        orden = sorted(por_grupo, key=lambda ruta: self.listos_grupo[ruta] / self.grupos[ruta].cuota_cpu)
+        colas = [iter(por_grupo[ruta]) for ruta in orden]
+        while colas:
+            siguientes = []
+            for ruta, cola in zip(orden, colas):
+                if ruta in llenos:
+                    continue
+                proceso = next(cola, None)
+                if proceso is not None:
+                    yield proceso
+                    siguientes.append((ruta, cola))
+            orden = [ruta for ruta, _ in siguientes]
+            colas = [cola for _, cola in siguientes]
+
+    # ---------- Núcleos ----------
+    def nucleo_libre(self) -> Optional[int]:
+        for i, pid in enumerate(self.nucleos):
+            if pid is None:
+                return i
+        return None
+
+    def ejecutando(self) -> List[int]:
+        """PIDs en ejecución, en orden de núcleo"""
+        return [pid for pid in self.nucleos if pid is not None]
+
+    def ocupar(self, pid: int, nucleo: Optional[int] = None) -> int:
+        if nucleo is None:
+            nucleo = self.nucleo_libre()
+        self.nucleos[nucleo] = pid
+        self._nucleo_de[pid] = nucleo
+        return nucleo
+
+    def entrar(self, proceso: Proceso, nucleo: Optional[int] = None) -> int:
+        """Ocupa un núcleo con el proceso y le carga la sobrecarga de la entrada; devuelve el núcleo"""
+        nucleo = self.ocupar(proceso.pid, nucleo)
+        costos, metricas = self.costos, self.metricas_cambios
+        sobrecarga = 0.0
+        otros = self._entradas[nucleo] - proceso.ultima_entrada  # entradas de otros desde la suya
+        if proceso.ultimo_nucleo != nucleo or otros > 0:
+            sobrecarga += costos.cambio_contexto
+            metricas.cambios_contexto += 1
+            # La primera vez en CPU (ultimo_nucleo None) no hay cache que perder
+            if proceso.ultimo_nucleo is not None and proceso.ultimo_nucleo != nucleo:
+                sobrecarga += costos.migracion
+                metricas.migraciones += 1
+            elif proceso.ultimo_nucleo == nucleo and otros > costos.capacidad_cache:
+                sobrecarga += costos.cache_fria
+                metricas.caches_frias += 1
+        self._entradas[nucleo] += 1
+        proceso.ultima_entrada = self._entradas[nucleo]
+        proceso.ultimo_nucleo = nucleo
+        proceso.sobrecarga += sobrecarga
+        return nucleo
+
+    def liberar(self, pid: int) -> Optional[int]:
+        """Libera el núcleo de pid (si estaba ejecutando) y devuelve cuál era"""
+        nucleo = self._nucleo_de.pop(pid, None)
+        if nucleo is not None:
+            self.nucleos[nucleo] = None
+        return nucleo
+
+    def retirar(self, pid: int):
+        """Salida fuera del tick (finalizar, Zombi a mano): deja el núcleo, la cola de listos,
+        la lista de bloqueados y la prioridad por aging. Sin esto un PID muerto al frente de
+        la cola frena el despacho y uno en bloqueados apaga los bloqueos aleatorios."""
+        self.liberar(pid)
+        if pid in self.cola_listos:
+            self.cola_listos.remove(pid)
+        if pid in self.procesos_bloqueados:
+            self.procesos_bloqueados.remove(pid)
+        if self.proceso_con_prioridad == pid:
+            self.proceso_con_prioridad = None
+
+    def asignar_cpu(self, procesos: Dict[int, Proceso]):
+        # FIFO estricto: el primero en la cola es el próximo en ejecutar, mientras haya núcleos libres
+        while self.nucleo_libre() is not None and self.cola_listos:
+            # Tomar siempre el primer proceso de la cola (FIFO)
+            pid = self.cola_listos[0]
+            p = procesos.get(pid)
+            # Verificar si ha esperado el tiempo mínimo
+            if not (p and p.estado == "Listo" and p.tiempo_estado >= p.tiempo_espera_cpu):
+                return
+            # Ha esperado suficiente, puede ejecutar
+            self.cola_listos.pop(0)
+            self.cambiar_estado(p, "Ejecución")
+            p.tiempo_estado = 0
+            if p.duracion_ejecucion <= 0:
+                p.duracion_ejecucion = generar_duracion_ejecucion_variada(self.rng)
+            self.entrar(p)
+
+    def expropiar(self, proceso: Proceso, al_frente: bool = False):
+        """Saca de la CPU a un proceso conservando lo ya ejecutado de la ráfaga. Fin del quantum (rr):
+        vuelve al final de la cola; desalojo por forzar_ejecucion: al frente"""
+        if self.proceso_con_prioridad == proceso.pid:
+            self.proceso_con_prioridad = None
+        self.cambiar_estado(proceso, "Listo")
+        proceso.ejecutado_previo += proceso.tiempo_estado
+        proceso.tiempo_estado = 0
+        self.liberar(proceso.pid)
+        if al_frente:
+            self.cola_listos.insert(0, proceso.pid)
+        else:
+            self.cola_listos.append(proceso.pid)
+
+    def bloquear_proceso(self, proceso: Proceso, procesos_disponibles: Dict[int, Proceso]):
+        """Bloquea un proceso que está en ejecución y establece dependencia"""
+        if proceso.estado == "Ejecución":
+            self.cambiar_estado(proceso, "Bloqueado")
+            proceso.tiempo_estado = 0
+            proceso.tiempo_bloqueo = generar_tiempo_bloqueo(self.rng)
+
+            # Buscar un proceso del cual depender (solo Listo o Ejecución)
+            candidatos_dependencia = [
+                p for p in procesos_disponibles.values()
+                if p.pid != proceso.pid and p.estado in ["Listo", "Ejecución"]
+            ]
+
+            if candidatos_dependencia:
+                # Elegir el proceso con menor PID (más antiguo) como dependencia
+                proceso_dependencia = min(candidatos_dependencia, key=lambda x: x.pid)
+                proceso.proceso_dependencia = proceso_dependencia.pid
+            else:
+                proceso.proceso_dependencia = None
+
+            proceso.ejecutado_previo = 0
+            self.procesos_bloqueados.append(proceso.pid)
+            self.liberar(proceso.pid)
+
+    def bloquear_por_traza(self, proceso: Proceso, ticks: int):
+        """Bloqueo por E/S grabada: duración conocida y sin dependencia de otro proceso"""
+        if proceso.estado == "Ejecución":
+            self.cambiar_estado(proceso, "Bloqueado")
+            proceso.tiempo_estado = 0
+            proceso.tiempo_bloqueo = ticks
+            proceso.proceso_dependencia = None
+            proceso.ejecutado_previo = 0
+            self.procesos_bloqueados.append(proceso.pid)
+            self.liberar(proceso.pid)
+
+    def desbloquear_proceso(self, proceso: Proceso):
+        """Desbloquea un proceso y lo devuelve a Listo"""
+        if proceso.estado == "Bloqueado" and proceso.pid in self.procesos_bloqueados:
+            self.cambiar_estado(proceso, "Listo")
+            proceso.tiempo_estado = 0
+            proceso.proceso_dependencia = None  # Limpiar dependencia
+            self.procesos_bloqueados.remove(proceso.pid)
+            self.cola_listos.append(proceso.pid)  # Va al final de la cola FIFO
+
+    def tick(self, procesos: Dict[int, Proceso]):
+        # En el modo automático solo aseguramos que haya asignación si hay núcleos libres
+        self.asignar_cpu(procesos)
+
+# ===============================
+# Motor de simulación
+# ===============================
+
+class MotorSimulacion:
+    """
+    Estado y reglas de la simulación, sin interfaz gráfica.
+    La interfaz llama a tick() en cada callback de after(); las ejecuciones
+    sin ventana lo llaman en un bucle con tiempo simulado.
+    """
+
+    def __init__(self, log: Optional[Callable[[str], None]] = None, semilla: Optional[int] = None,
+                 tiempo_real: bool = True, nucleos: int = 1, politica: str = "fifo", quantum: int = 4):
+        self.log = log  # destino de los mensajes de auditoría (None = descartar)
+        self.rng = random.Random(semilla)
+        self.tiempo_real = tiempo_real  # False: los segundos se derivan de los ticks (sin ventana)
+        self.tick_ms = 1500  # ms por tick (1.5 segundos - más rápido para mejor dinamismo)
+
+        # Límites de recursos del sistema
+        self.cpu_total_disponible = 100.0      # 100% CPU total
+        self.memoria_total_disponible = 8192.0  # 8 GB de RAM total
+        self.disco_total_disponible = 100.0    # 100% disco total
+
+        # Modelo (la admisión reserva un 10% de la RAM como margen)
+        self.procesos: Dict[int, Proceso] = {}
+        self.planificador = Planificador(presupuesto_memoria_mb=self.memoria_total_disponible * 0.9,
+                                         rng=self.rng, nucleos=nucleos, politica=politica, quantum=quantum)
+        self.grupos = ArbolGrupos()  # grupos de recursos; con solo la raíz no cambian nada
+        self.planificador.grupos = self.grupos
+        self.tick_actual = 0  # ticks de simulación transcurridos
+        self.admision_retenida = False  # True mientras la contrapresión frena Nuevo -> Listo
+        self.grupos_retenidos: Set[str] = set()  # grupos que retienen Nuevo por su límite de memoria
+        self.auto_progreso = True
+        self.perfilador = None  # PerfiladorFases opcional (perfilador.py)
+        self.series: Optional[AlmacenSeries] = AlmacenSeries(SERIES_HISTORIAL)  # historial (None = desactivado)
+        self.al_finalizar: Optional[Callable[[Proceso], None]] = None  # aviso por cada proceso que termina
+
+        # Árbol de procesos: hijos sin recolectar (vivos o zombis) y zombis pendientes de wait() por padre
+        self.hijos: Dict[int, Set[int]] = {}
+        self.zombis_de: Dict[int, Set[int]] = {}
+        self.sigchld_pendientes: Set[int] = set()  # padres que recibieron SIGCHLD en este tick
+        self.procesos_en_arbol = 0  # procesos con padre (no entran al sorteo de PIDs especiales)
+        self.prob_fork = 0.0        # probabilidad por tick de que un proceso en Ejecución haga fork
+        self.prob_sin_wait = 0.2    # proporción de hijos que, como padres, nunca hacen wait()
+
+        # Parámetros ajustables (barrido de parámetros)
+        self.umbral_aging = 20              # ticks en Listo para ser promovido por hambruna
+        self.prob_bloqueo_base = 0.02       # 2% base
+        self.prob_bloqueo_por_espera = 0.015  # por cada proceso esperando en la cola
+        self.prob_bloqueo_max_carga = 0.08  # máximo adicional por carga
+        self.procesos_por_especial = 9      # 1 PID especial (futuro zombi) por cada N procesos
+
+        # Lista de PIDs especiales que se convertirán en zombis automáticamente
+        # Se mantienen de forma incremental: candidatos = procesos vivos que aún no son especiales
+        self.pids_especiales = ConjuntoAleatorio()
+        self.candidatos_especiales = ConjuntoAleatorio()
+        self.finalizados_pendientes_zombi = {}  # PID -> tiempo_finalizacion para conversión a zombi
+
+        # Contador persistente de procesos finalizados (no se reinicia al eliminar)
+        self.total_finalizados_historico = 0
+
+        # Variables para creación automática de procesos
+        self.auto_process_counter = 0
+        self.max_auto_processes = 3
+        self.auto_process_timer = 0
+        self.auto_process_interval = self.rng.randint(5, 6)  # 5-6 ticks
+        self.procesos_automaticos = set()  # PIDs de procesos creados automáticamente
+
+        # Contadores acumulados para el resumen de una ejecución
+        self.estadisticas = {
+            "creados": 0,
+            "promociones_aging": 0,
+            "bloqueos": 0,
+            "ticks_cpu_ocupada": 0,
+            "expropiaciones": 0,
+            "suma_cola_listos": 0,
+            "migrados_salida": 0,
+            "migrados_entrada": 0,
+            "forks": 0,
+            "sigchld": 0,
+            "recolectados_por_padre": 0,
+            "reparentados": 0,
+        }
+
+    # ---------- Utilidades ----------
+    def _log(self, msg: str):
+        if self.log is not None:
+            self.log(msg)
+
+    def ahora(self) -> float:
+        """Segundos de reloj: reales en la interfaz, simulados sin ventana"""
+        if self.tiempo_real:
+            return time.time()
+        return self.tick_actual * self.tick_ms / 1000.0
+
+    def _actualizar_pids_especiales(self):
+        """Ajusta los PIDs especiales a 1 por cada grupo de 9 procesos con altas/bajas O(1) por cambio"""
+        total_procesos = len(self.procesos) - self.procesos_en_arbol
+        n = self.procesos_por_especial
+        # Calcular cuántos PIDs especiales necesitamos: 1 por cada 9 procesos (redondeando hacia arriba)
+        zombis_objetivo = (total_procesos + n - 1) // n  # Equivale a math.ceil(total_procesos / 9)
+
+        agregados = quitados = 0
+        # Faltan especiales (se agregaron procesos): promover candidatos al azar
+        while len(self.pids_especiales) < zombis_objetivo and self.candidatos_especiales:
+            nuevo_especial = self.candidatos_especiales.elegir(self.rng)
+            self.candidatos_especiales.quitar(nuevo_especial)
+            self.pids_especiales.agregar(nuevo_especial)
+            agregados += 1
+
+        # Sobran especiales (por eliminación de procesos): devolver algunos al azar a candidatos
+        while len(self.pids_especiales) > zombis_objetivo:
+            pid_a_remover = self.pids_especiales.elegir(self.rng)
+            self.pids_especiales.quitar(pid_a_remover)
+            self.candidatos_especiales.agregar(pid_a_remover)
+            quitados += 1
+
+        if agregados or quitados:
+            self._log(f"🎯 PIDs especiales: +{agregados}/-{quitados} → {len(self.pids_especiales)} zombis "
+                      f"para {total_procesos} procesos (1 cada {n})")
+
+    @property
+    def al_transicion(self) -> Optional[Callable[[Proceso, Optional[str], Optional[str]], None]]:
+        """Observador de cambios de estado; las altas llegan con anterior=None y las bajas con nuevo=None"""
+        return self.planificador.al_transicion
+
+    @al_transicion.setter
+    def al_transicion(self, observador: Optional[Callable[[Proceso, Optional[str], Optional[str]], None]]):
+        self.planificador.al_transicion = observador
+
+    def _avisar_altas(self, procesos: List[Proceso]):
+        self.planificador.registrar_altas(procesos)
+        observador = self.planificador.al_transicion
+        if observador is not None:
+            for p in procesos:
+                observador(p, None, p.estado)
+
+    def _eliminar_proceso(self, pid: int):
+        """Quita un proceso de la tabla y de los conjuntos de PIDs especiales"""
+        p = self.procesos.pop(pid)
+        self.planificador.registrar_baja(p)
+        if self.planificador.al_transicion is not None:
+            self.planificador.al_transicion(p, p.estado, None)
+        self.planificador.zombis.discard(pid)
+        self.candidatos_especiales.quitar(pid)
+        self.pids_especiales.quitar(pid)
+        if p.padre is not None:
+            self._desvincular(p)
+            self.procesos_en_arbol -= 1
+        if pid in self.hijos:
+            self._reparentar_hijos(pid)
+
+    # ---------- Árbol de procesos ----------
+    def _desvincular(self, p: Proceso):
+        """Quita al proceso de los hijos y de los zombis pendientes de su padre"""
+        for indice in (self.hijos, self.zombis_de):
+            hermanos = indice.get(p.padre)
+            if hermanos is not None:
+                hermanos.discard(p.pid)
+                if not hermanos:
+                    del indice[p.padre]
+
+    def _reparentar_hijos(self, pid: int):
+        """Init adopta a los hijos de un proceso que sale; sus zombis le llegan con un SIGCHLD (O(hijos))"""
+        hijos = self.hijos.pop(pid, None)
+        if not hijos:
+            return
+        for hijo in hijos:
+            self.procesos[hijo].padre = PID_INIT
+        self.hijos.setdefault(PID_INIT, set()).update(hijos)
+        zombis = self.zombis_de.pop(pid, None)
+        if zombis:
+            self.zombis_de.setdefault(PID_INIT, set()).update(zombis)
+            self.sigchld_pendientes.add(PID_INIT)
+        self.estadisticas["reparentados"] += len(hijos)
+        self._log(f"👪 PID {pid} sale: init adopta {len(hijos)} hijo(s) ({len(zombis or ())} zombi(s))")
+
+    def _salir(self, p: Proceso, razon: str):
+        """exit() de un hijo: queda Zombi hasta que su padre haga wait() y el padre recibe SIGCHLD"""
+        self.planificador.retirar(p.pid)
+        self.planificador.cambiar_estado(p, "Zombi")
+        p.tiempo_estado = 0
+        p.ejecutado_previo = 0
+        self.zombis_de.setdefault(p.padre, set()).add(p.pid)
+        self._reparentar_hijos(p.pid)
+        self.sigchld_pendientes.add(p.padre)
+        self.estadisticas["sigchld"] += 1
+        padre = self.procesos.get(p.padre)
+        if padre is not None:
+            padre.sigchld += 1
+        self._log(f"PID {p.pid} terminó ({razon}) → Zombi hasta que PID {p.padre} haga wait() (SIGCHLD)")
+
+    def _recolectar(self, p: Proceso, razon: str):
+        """Un zombi hijo recolectado pasa a Finalizado como cualquier proceso normal"""
+        self._desvincular(p)
+        self._finalizar_proceso(p, razon)
+
+    def esperar(self, pid_padre: int, pid_hijo: Optional[int] = None) -> Optional[int]:
+        """wait()/waitpid(): recolecta un hijo zombi (el de menor PID si no se indica). None si no hay."""
+        zombis = self.zombis_de.get(pid_padre)
+        if not zombis:
+            return None
+        if pid_hijo is None:
+            pid_hijo = min(zombis)
+        elif pid_hijo not in zombis:
+            return None
+        self._recolectar(self.procesos[pid_hijo], f"wait() de PID {pid_padre}")
+        self.estadisticas["recolectados_por_padre"] += 1
+        return pid_hijo
+
+    def _atender_sigchld(self):
+        """Cada padre que hace wait() recolecta a todos sus zombis; init siempre, los demás si están vivos"""
+        pendientes, self.sigchld_pendientes = self.sigchld_pendientes, set()
+        for pid in sorted(pendientes):
+            if pid != PID_INIT:
+                padre = self.procesos.get(pid)
+                if padre is None or not padre.recolecta or padre.estado in ("Zombi", "Finalizado"):
+                    continue
+                padre.sigchld = 0
+            for hijo in sorted(self.zombis_de.get(pid, ())):
+                self.esperar(pid, hijo)
+
+    def fork(self, pid_padre: int, n: int = 1, nombre: str = "Hijo") -> List[Proceso]:
+        """Crea n hijos del proceso en Nuevo, en su mismo grupo de recursos"""
+        padre = self.procesos.get(pid_padre)
+        if padre is None or padre.estado in ("Zombi", "Finalizado"):
+            raise ValueError(f"PID {pid_padre} no puede hacer fork "
+                             f"({padre.estado if padre else 'inexistente'})")
+        return self.crear_procesos(n, nombre, padre.grupo, padres=[pid_padre] * n)
+
+    def crear_arbol(self, profundidad: int, ramas: int, nombre: str = "Bomba") -> List[Proceso]:
+        """Fork bomb: una raíz y `profundidad` niveles con `ramas` hijos por proceso (un lote por nivel)"""
+        raiz = self.crear_proceso(nombre)
+        creados = [raiz]
+        nivel = [raiz.pid]
+        for _ in range(profundidad):
+            nivel = [p.pid for p in self.crear_procesos(len(nivel) * ramas, nombre, raiz.grupo,
+                                                        padres=[pid for pid in nivel for _ in range(ramas)])]
+            creados.extend(self.procesos[pid] for pid in nivel)
+        return creados
+
+    def _finalizar_proceso(self, proceso: Proceso, razon: str = ""):
+        """Marca un proceso como finalizado y registra el timestamp"""
+        self.planificador.cambiar_estado(proceso, "Finalizado")
+        proceso.tiempo_estado = 0
+        proceso.tiempo_finalizado = self.ahora()
+
+        # Incrementar contador persistente de finalizados
+        self.total_finalizados_historico += 1
+        self.grupos.cargar(proceso.grupo, "finalizados")
+        self.grupos.cargar(proceso.grupo, "suma_retorno", self.tick_actual - proceso.tick_llegada)
+        if self.al_finalizar is not None:
+            self.al_finalizar(proceso)
+        if proceso.pid in self.hijos:
+            self._reparentar_hijos(proceso.pid)
+
+        # Si es un PID especial, marcarlo para conversión automática a zombi en 4 segundos
+        if proceso.pid in self.pids_especiales:
+            self.finalizados_pendientes_zombi[proceso.pid] = self.ahora()
+            self._log(f"⭐ PID {proceso.pid} es ESPECIAL - programado para zombi en 4 segundos")
+        else:
+            self._log(f"📋 PID {proceso.pid} es NORMAL - será eliminado en 3 ticks")
+
+        msg = f"PID {proceso.pid} finalizado"
+        if razon:
+            msg += f" ({razon})"
+        self._log(msg + ".")
+
+        # Debug: mostrar estado de PIDs especiales
+        self._log(f"📊 PIDs especiales actuales: {len(self.pids_especiales)} | "
+                  f"Pendientes para zombi: {len(self.finalizados_pendientes_zombi)}")
+
+    def _distribuir_recursos_sistema(self):
+        """Distribuye recursos aleatoriamente entre procesos pero respetando límites del sistema"""
+        rng = self.rng
+        por_estado = dict.fromkeys(("Nuevo",) + ESTADOS, 0)
+        # Primero, asignar recursos base según estado
+        for proceso in self.procesos.values():
+            por_estado[proceso.estado] += 1
+            if proceso.estado == "Nuevo":
+                proceso.cpu_percent = 0.0
+                proceso.memoria_mb = 5.0  # Estructuras base
+                proceso.disco_percent = 0.0
+
+            elif proceso.estado == "Listo":
+                proceso.cpu_percent = 0.0  # No ejecuta aún
+                proceso.memoria_mb = rng.uniform(10.0, 50.0)  # Memoria reservada
+                proceso.disco_percent = 0.0
+
+            elif proceso.estado == "Ejecución":
+                # ASIGNAR CPU DIRECTAMENTE AQUÍ
+                cpu_asignada = rng.uniform(15.0, 45.0)
+                proceso.cpu_percent = cpu_asignada
+                proceso.memoria_mb = rng.uniform(50.0, 200.0)  # Memoria para ejecución
+                # Disco (40% probabilidad de usar)
+                if rng.random() < 0.4:
+                    proceso.disco_percent = rng.uniform(5.0, 25.0)
+                else:
+                    proceso.disco_percent = 0.0
+
+            elif proceso.estado == "Bloqueado":
+                proceso.cpu_percent = 0.0  # No ejecuta
+                # Mantiene la memoria que tenía (no la cambio aquí)
+                if proceso.memoria_mb == 0:  # Si es la primera vez
+                    proceso.memoria_mb = rng.uniform(30.0, 100.0)
+                proceso.disco_percent = 0.0  # Esperando evento externo
+
+            elif proceso.estado == "Finalizado":
+                proceso.cpu_percent = 0.0
+                proceso.memoria_mb = 0.0  # Se libera
+                proceso.disco_percent = 0.0
+
+            elif proceso.estado == "Zombi":
+                proceso.cpu_percent = 0.0  # NUNCA consume CPU
+                proceso.memoria_mb = 1.0   # Solo entrada en tabla de procesos
+                proceso.disco_percent = 0.0
+
+        # Normalizar CPU para que no exceda 100% total
+        procesos_ejecutando = [p for p in self.procesos.values() if p.estado == "Ejecución"]
+        if procesos_ejecutando:
+            cpu_total = sum(p.cpu_percent for p in procesos_ejecutando)
+            if cpu_total > 100.0:
+                factor_cpu = 100.0 / cpu_total
+                for proceso in procesos_ejecutando:
+                    proceso.cpu_percent *= factor_cpu
+
+            # Normalizar disco si excede 100%
+            disco_total = sum(p.disco_percent for p in procesos_ejecutando if p.disco_percent > 0)
+            if disco_total > 100.0:
+                factor_disco = 100.0 / disco_total
+                for proceso in procesos_ejecutando:
+                    if proceso.disco_percent > 0:
+                        proceso.disco_percent *= factor_disco
+
+        # Verificar límite de memoria total
+        memoria_total = sum(p.memoria_mb for p in self.procesos.values())
+        if memoria_total > self.memoria_total_disponible:
+            # Escalar proporcionalmente
+            factor = self.memoria_total_disponible / memoria_total
+            for proceso in self.procesos.values():
+                if proceso.memoria_mb > 0:
+                    proceso.memoria_mb *= factor
+            memoria_total = self.memoria_total_disponible
+
+        if self.grupos.activo:
+            memoria_total -= self._aplicar_limites_grupos()
+
+        if self.series is not None:
+            valores = {
+                "cpu": sum(p.cpu_percent for p in procesos_ejecutando),
+                "memoria": memoria_total,
+                "disco": sum(p.disco_percent for p in procesos_ejecutando),
+                "cola_listos": len(self.planificador.cola_listos),
+            }
+            valores.update(por_estado)
+            self.series.registrar(valores)
+
+    def _aplicar_limites_grupos(self) -> float:
+        """Escala memoria y disco de los grupos que superan sus límites; devuelve los MB recortados"""
+        # Una pasada por la tabla con las sumas propias de cada grupo
+        memoria: Dict[str, float] = dict.fromkeys(self.grupos.grupos, 0.0)
+        disco: Dict[str, float] = dict.fromkeys(self.grupos.grupos, 0.0)
+        for p in self.procesos.values():
+            memoria[p.grupo] += p.memoria_mb
+            if p.estado == "Ejecución":
+                disco[p.grupo] += p.disco_percent
+        # De las hojas a la raíz: sumas del subárbol ya recortado y el factor de cada grupo excedido
+        factor_memoria: Dict[str, float] = {}
+        factor_disco: Dict[str, float] = {}
+        recortado = 0.0
+        orden = self.grupos.por_profundidad()
+        for grupo in orden:
+            ruta = grupo.ruta
+            for hijo in grupo.hijos:
+                memoria[ruta] += memoria[hijo.ruta]
+                disco[ruta] += disco[hijo.ruta]
+            if grupo.limite_memoria_mb is not None and memoria[ruta] > grupo.limite_memoria_mb:
+                factor_memoria[ruta] = grupo.limite_memoria_mb / memoria[ruta]
+                recortado += memoria[ruta] - grupo.limite_memoria_mb
+                memoria[ruta] = grupo.limite_memoria_mb
+                grupo.recortes_memoria += 1
+            if grupo.limite_disco_percent is not None and disco[ruta] > grupo.limite_disco_percent:
+                factor_disco[ruta] = grupo.limite_disco_percent / disco[ruta]
+                disco[ruta] = grupo.limite_disco_percent
+                grupo.recortes_disco += 1
+        # De la raíz a las hojas: un recorte del padre también achica a los hijos
+        escala_memoria: Dict[str, float] = {}
+        escala_disco: Dict[str, float] = {}
+        for grupo in reversed(orden):
+            ruta = grupo.ruta
+            padre_memoria = escala_memoria[grupo.padre.ruta] if grupo.padre else 1.0
+            padre_disco = escala_disco[grupo.padre.ruta] if grupo.padre else 1.0
+            escala_memoria[ruta] = padre_memoria * factor_memoria.get(ruta, 1.0)
+            escala_disco[ruta] = padre_disco * factor_disco.get(ruta, 1.0)
+            # Contabilidad con los valores ya recortados
+            grupo.memoria_mb = memoria[ruta] * padre_memoria
+            grupo.memoria_pico_mb = max(grupo.memoria_pico_mb, grupo.memoria_mb)
+            grupo.disco_percent = disco[ruta] * padre_disco
+        if factor_memoria or factor_disco:
+            for p in self.procesos.values():
+                p.memoria_mb *= escala_memoria[p.grupo]
+                if p.estado == "Ejecución":
+                    p.disco_percent *= escala_disco[p.grupo]
+        return recortado
+
+    def _turno_por_grupo(self) -> Optional[Tuple[str, int]]:
+        """Reparto justo: el primero de cada grupo, si ya es elegible, compite según el uso por cuota
+        de su grupo. Devuelve (grupo con turno, su primer PID en la cola)."""
+        candidatos: Dict[str, Tuple[int, int]] = {}
+        vistos = set()
+        for posicion, pid in enumerate(self.planificador.cola_listos):
+            p = self.procesos.get(pid)
+            if p is None or p.grupo in vistos:
+                continue
+            vistos.add(p.grupo)  # FIFO dentro del grupo: solo cuenta el primero
+            if p.estado == "Listo" and p.tiempo_estado >= p.tiempo_espera_cpu:
+                candidatos[p.grupo] = (posicion, pid)
+        if not candidatos:
+            return None
+        ruta = self.grupos.elegir(candidatos)
+        return ruta, candidatos[ruta][1]
+
+    # ---------- Acciones ----------
+    def crear_proceso(self, nombre: str = "Tarea", grupo: str = RAIZ) -> Proceso:
+        # Todos los procesos son automáticos por defecto
+        if grupo not in self.grupos:
+            raise ValueError(f"grupo de recursos inexistente: {grupo}")
+        pid = next_pid()
+        p = Proceso(
+            pid=pid,
+            nombre=f"{nombre}-{pid}",
+            automatizado=True,
+            tick_llegada=self.tick_actual,
+            grupo=grupo,
+        )
+
+        # Asignar tiempos automáticamente para simular SO real
+        p.duracion_ejecucion = generar_tiempo_ejecucion_variado(self.rng)  # 4, 7, 9 ticks para ejecución
+        p.tiempo_admision = generar_tiempo_admision_variado(self.rng)      # Siempre 3 ticks
+        p.tiempo_espera_cpu = generar_tiempo_espera_cpu(self.rng)          # 4, 7, 9 ticks para espera CPU
+        p.tiempo_bloqueo = generar_tiempo_bloqueo(self.rng)                # 3-5 ticks para bloqueo
+
+        # Inicializar recursos básicos según estado inicial
+        if p.estado == "Nuevo":
+            p.cpu_percent = 0.0
+            p.memoria_mb = 5.0
+            p.disco_percent = 0.0
+
+        self.procesos[pid] = p
+        self.candidatos_especiales.agregar(pid)
+        self.estadisticas["creados"] += 1
+        self.grupos.cargar(grupo, "creados")
+        self._avisar_altas([p])
+
+        # Actualizar PIDs especiales según la proporción 1:9
+        self._actualizar_pids_especiales()
+
+        self._log(f"Creado proceso {p.nombre} (PID={pid}, Nuevo→Listo: {p.tiempo_admision}t, Listo→Ejec: {p.tiempo_espera_cpu}t, Duración: {p.duracion_ejecucion}t). Estado: Nuevo.")
+        return p
+
+    def crear_procesos(self, n: int, nombre: str = "Tarea", grupo: str = RAIZ,
+                       padres: Optional[Sequence[int]] = None) -> List[Proceso]:
+        """
+        Creación masiva: reserva el rango de PIDs en un paso, construye los
+        registros en lote y actualiza la cuota de PIDs especiales y el log una sola vez.
+        Con `padres` (un PID por proceso) los crea como hijos por fork.
+        """
+        if n <= 0:
+            return []
+        if grupo not in self.grupos:
+            raise ValueError(f"grupo de recursos inexistente: {grupo}")
+        rng = self.rng
+        ahora = time.time()
+        tick = self.tick_actual
+        nuevos = [
+            Proceso(
+                pid=pid,
+                nombre=f"{nombre}-{pid}",
+                tiempo_llegada=ahora,
+                tick_llegada=tick,
+                duracion_ejecucion=generar_tiempo_ejecucion_variado(rng),
+                tiempo_admision=generar_tiempo_admision_variado(rng),
+                tiempo_espera_cpu=generar_tiempo_espera_cpu(rng),
+                tiempo_bloqueo=generar_tiempo_bloqueo(rng),
+                memoria_mb=5.0,
+                grupo=grupo,
+            )
+            for pid in reservar_pids(n)
+        ]
+        self.procesos.update((p.pid, p) for p in nuevos)
+        if padres is None:
+            for p in nuevos:
+                self.candidatos_especiales.agregar(p.pid)
+        else:
+            # Los hijos terminan como zombis de su padre, no por el sorteo de PIDs especiales
+            for p, padre in zip(nuevos, padres):
+                p.padre = padre
+                self.hijos.setdefault(padre, set()).add(p.pid)
+            self.procesos_en_arbol += n
+            self.estadisticas["forks"] += n
+        self.estadisticas["creados"] += n
+        self.grupos.cargar(grupo, "creados", n)
+        self._avisar_altas(nuevos)
+
+        self._actualizar_pids_especiales()
+        self._log(f"Creados {n} procesos {nombre} (PID {nuevos[0].pid}-{nuevos[-1].pid}). Estado: Nuevo.")
+        return nuevos
+
+    def crear_procesos_traza(self, trazas: List[ProcesoTraza]) -> List[Proceso]:
+        """Crea en Nuevo los procesos de una traza que llegan en este tick (ver trazas.py)"""
+        if not trazas:
+            return []
+        ahora = time.time()
+        tick = self.tick_actual
+        nuevos = [
+            Proceso(
+                pid=pid,
+                nombre=f"{t.nombre}:{t.pid}",
+                tiempo_llegada=ahora,
+                tick_llegada=tick,
+                duracion_ejecucion=t.rafagas[0],
+                tiempo_admision=generar_tiempo_admision_variado(self.rng),
+                tiempo_bloqueo=t.bloqueos[0] if t.bloqueos else 0,
+                automatizado=False,
+                rafagas=t.rafagas[1:],
+                bloqueos=t.bloqueos,
+                memoria_mb=5.0,
+            )
+            for pid, t in zip(reservar_pids(len(trazas)), trazas)
+        ]
+        self.procesos.update((p.pid, p) for p in nuevos)
+        for p in nuevos:
+            self.candidatos_especiales.agregar(p.pid)
+        self.estadisticas["creados"] += len(nuevos)
+        self.grupos.cargar(RAIZ, "creados", len(nuevos))
+        self._avisar_altas(nuevos)
+
+        self._actualizar_pids_especiales()
+        self._log(f"📼 Traza: llegan {len(nuevos)} proceso(s) (PID {nuevos[0].pid}-{nuevos[-1].pid}). Estado: Nuevo.")
+        return nuevos
+
+    def admitir(self, pids: List[int]):
+        for pid in pids:
+            p = self.procesos.get(pid)
+            if p and p.estado == "Nuevo":
+                if self.admitir_con_control(p):
+                    self._log(f"Admitido manualmente a Listo: PID {pid}.")
+
+    def admitir_todos_nuevos(self):
+        nuevos = sorted((p for p in self.procesos.values() if p.estado == "Nuevo"), key=lambda x: x.pid)
+        admitidos = sum(1 for p in nuevos if self.admitir_con_control(p))
+        self._log(f"{admitidos} de {len(nuevos)} 'Nuevo' admitidos a Listo.")
+
+    def admitir_con_control(self, p: Proceso) -> bool:
+        """Admisión manual respetando los presupuestos de memoria y de cola"""
+        memoria = self.planificador.memoria_comprometida()
+        if self.planificador.admitir(p, memoria, self.tick_actual):
+            return True
+        self._log(f"🚧 PID {p.pid} no admitido: sin capacidad (memoria comprometida {memoria:.0f} MB, "
+                  f"cola {len(self.planificador.cola_listos)}/{self.planificador.max_cola_listos})")
+        return False
+
+    def forzar_ejecucion(self, pid: int):
+        p = self.procesos.get(pid)
+        if not p:
+            return
+
+        # FIFO ESTRICTO: Solo permitir ejecutar si es el primero en la cola de Listo
+        if p.estado == "Listo":
+            if not self.planificador.cola_listos or self.planificador.cola_listos[0] != pid:
+                self._log(f"ERROR FIFO: El proceso {pid} no es el primero en la cola de Listo")
+                return
+        elif p.estado == "Nuevo":
+            # Si está en Nuevo, primero admitirlo a Listo
+            if self.admitir_con_control(p):
+                self._log(f"Proceso {pid} admitido a Listo desde Nuevo")
+            return
+        else:
+            self._log(f"ERROR: El proceso {pid} no puede ejecutar desde estado {p.estado}")
+            return
+
+        # Quitar de cola listos (es el primero) antes de devolver a ella al desalojado
+        self.planificador.cola_listos.pop(0)
+
+        # Preempt actual si no hay núcleo libre (se desaloja el del último núcleo, que conserva
+        # su avance y vuelve al frente de la cola)
+        nucleo = self.planificador.nucleo_libre()
+        if nucleo is None:
+            nucleo = len(self.planificador.nucleos) - 1
+            actual = self.procesos.get(self.planificador.nucleos[nucleo])
+            if actual and actual.estado == "Ejecución":
+                self.planificador.expropiar(actual, al_frente=True)
+                self.estadisticas["expropiaciones"] += 1
+            else:
+                self.planificador.liberar(self.planificador.nucleos[nucleo])
+
+        self.planificador.cambiar_estado(p, "Ejecución")
+        p.tiempo_estado = 0
+        if p.duracion_ejecucion <= 0:
+            p.duracion_ejecucion = generar_duracion_ejecucion_variada(self.rng)
+        self.planificador.entrar(p, nucleo)
+        self._log(f"Proceso {pid} ejecutando (FIFO respetado)")
+        self._log(f"Forzado a Ejecución: PID {p.pid}.")
+
+    def finalizar(self, pids: List[int]):
+        for pid in pids:
+            p = self.procesos.get(pid)
+            if not p:
+                continue
+            self.planificador.retirar(pid)
+            if p.padre is None:
+                self._finalizar_proceso(p, "manualmente")
+            elif p.estado == "Zombi":
+                self._recolectar(p, "recolección manual de zombi")
+            elif p.estado != "Finalizado":
+                self._salir(p, "finalizado manualmente")
+
+    def enviar_a_zombi(self, pids: List[int]):
+        for pid in pids:
+            p = self.procesos.get(pid)
+            if not p:
+                continue
+            if p.padre is not None and p.estado not in ("Zombi", "Finalizado"):
+                self._salir(p, "enviado a Zombi")
+                continue
+            self.planificador.retirar(pid)
+            self.planificador.cambiar_estado(p, "Zombi")
+            p.tiempo_estado = 0
+            p.linger_zombi = generar_linger_zombi_variado(self.rng)
+            self._log(f"PID {pid} enviado a Zombi (linger={p.linger_zombi}).")
+            # Un proceso raíz que sale también deja huérfanos: sin esto sus hijos apuntarían
+            # a un Zombi que nunca hace wait() y sus zombis no se recolectarían
+            self._reparentar_hijos(pid)
+
+    def recolectar_zombis(self):
+        reco = 0
+        for pid in sorted(self.planificador.zombis):
+            p = self.procesos[pid]
+            if p.padre is not None:
+                self._recolectar(p, "recolección manual de zombi")
+            else:
+                self._finalizar_proceso(p, "recolección manual de zombi")
+            reco += 1
+        if reco:
+            self._log(f"Recolectados {reco} zombi(s) manualmente.")
+
+    def extraer_para_migrar(self, n: int) -> List[Proceso]:
+        """Quita hasta n procesos del final de la cola de listos para enviarlos a otro nodo"""
+        cola = self.planificador.cola_listos
+        extraidos: List[Proceso] = []
+        i = len(cola) - 1
+        while i >= 0 and len(extraidos) < n:
+            p = self.procesos.get(cola[i])
+            # El árbol de procesos es local al nodo: no migran hijos ni padres
+            if (p and p.estado == "Listo" and p.pid not in self.procesos_automaticos
+                    and p.padre is None and p.pid not in self.hijos):
+                del cola[i]
+                self._eliminar_proceso(p.pid)
+                extraidos.append(p)
+            i -= 1
+        if extraidos:
+            self.estadisticas["migrados_salida"] += len(extraidos)
+            self._actualizar_pids_especiales()
+            self._log(f"📤 Migrados {len(extraidos)} proceso(s) a otro nodo: {[p.pid for p in extraidos]}")
+        return extraidos
+
+    def recibir_migrados(self, procesos: List[Proceso]):
+        """Incorpora procesos migrados desde otro nodo al final de la cola de listos con PIDs locales"""
+        if not procesos:
+            return
+        for pid, p in zip(reservar_pids(len(procesos)), procesos):
+            p.pid = pid
+            p.estado = "Listo"
+            if p.grupo not in self.grupos:
+                p.grupo = RAIZ  # el grupo de origen no existe en este nodo
+            p.tiempo_estado = 0
+            p.ultimo_nucleo = None   # su cache quedó en el otro nodo
+            p.sobrecarga = 0.0
+            p._fila = Proceso._fila  # el texto del PID memorizado en to_row ya no vale
+            self.procesos[pid] = p
+            self.candidatos_especiales.agregar(pid)
+            self.planificador.cola_listos.append(pid)
+        self._avisar_altas(procesos)
+        self.estadisticas["migrados_entrada"] += len(procesos)
+        self._actualizar_pids_especiales()
+        self._log(f"📥 Llegan {len(procesos)} proceso(s) migrados (PID {procesos[0].pid}-{procesos[-1].pid}). Estado: Listo.")
+
+    def kill_zombi(self):
+        """Kill solo UN zombi a la vez (el más antiguo por PID)"""
+        zombis = self.planificador.zombis  # índice: sin recorrer la tabla de procesos
+
+        if not zombis:
+            self._log("No hay zombis para eliminar.")
+            return
+
+        # Eliminar el zombi más antiguo (menor PID)
+        pid_eliminado = min(zombis)
+
+        # Verificar si era un proceso automático antes de eliminarlo
+        era_automatico = pid_eliminado in self.procesos_automaticos
+
+        self._eliminar_proceso(pid_eliminado)
+
+        # Si era automático, decrementar contador y remover de la lista
+        if era_automatico:
+            self.procesos_automaticos.remove(pid_eliminado)
+            self.auto_process_counter -= 1
+            self._log(f"🤖 Proceso automático PID {pid_eliminado} eliminado. Contador: {self.auto_process_counter}/{self.max_auto_processes}")
+
+        # Actualizar proporción de PIDs especiales
+        self._actualizar_pids_especiales()
+
+        self._log(f"💀 KILL: Zombi PID {pid_eliminado} eliminado definitivamente del sistema.")
+
+    # ---------- Instrumentación ----------
+    def activar_perfilador(self):
+        """Devuelve el perfilador por fase, creándolo la primera vez. Nunca se reemplaza:
+        soltarlo con una captura de cProfile en curso dejaría el perfil instalado en el hilo."""
+        if self.perfilador is None:
+            from perfilador import PerfiladorFases
+            self.perfilador = PerfiladorFases()
+        return self.perfilador
+
+    # ---------- Tick de simulación ----------
+    def tick(self):
+        self.tick_actual += 1
+        perf = self.perfilador  # instrumentación por fase (None = desactivada)
+        if perf:
+            perf.inicio_tick()
+
+        # 0) Verificar que tengamos PIDs especiales según proporción dinámica
+        if self.procesos:
+            total_procesos = len(self.procesos) - self.procesos_en_arbol
+            n = self.procesos_por_especial
+            zombis_objetivo = (total_procesos + n - 1) // n  # 1 por cada grupo de 9
+            if len(self.pids_especiales) < zombis_objetivo:
+                self._log(f"⚠️ Faltan PIDs especiales ({len(self.pids_especiales)}/{zombis_objetivo}), actualizando...")
+                self._actualizar_pids_especiales()
+
+        if perf:
+            perf.marca("0 especiales")
+
+        # 0.1) Creación automática de procesos cada 5-6 ticks (máximo 3)
+        self.auto_process_timer += 1
+        if (self.auto_process_counter < self.max_auto_processes and
+            self.auto_process_timer >= self.auto_process_interval):
+            # Crear proceso automático con nombre "System"
+            nuevo_pid = self.crear_proceso(nombre="System").pid
+            self.procesos_automaticos.add(nuevo_pid)
+
+            self.auto_process_counter += 1
+            self.auto_process_timer = 0
+            self.auto_process_interval = self.rng.randint(5, 6)  # Nuevo intervalo aleatorio
+            self._log(f"🤖 Proceso automático creado ({self.auto_process_counter}/{self.max_auto_processes}) - PID {nuevo_pid}")
+
+        if perf:
+            perf.marca("0.1 auto-creación")
+
+        # 1) Cambios automáticos de estado
+        if self.auto_progreso:
+            # Nuevo -> Listo: planificador de largo plazo con control de admisión
+            procesos_nuevos = sorted((p for p in self.procesos.values() if p.estado == "Nuevo"),
+                                     key=lambda x: x.pid)
+
+            if procesos_nuevos:
+                if self.admision_retenida:
+                    # Con contrapresión todos se preparan para entrar en lote al liberarse capacidad
+                    for p in procesos_nuevos:
+                        if p.tiempo_estado < p.tiempo_admision:
+                            p.tiempo_estado += 1
+                elif self.grupos.activo:
+                    # Secuencial por grupo: un grupo que inunda Nuevo no frena la admisión de los demás.
+                    # Un grupo retenido por su límite de memoria prepara a todos los suyos, como la
+                    # contrapresión del sistema pero sin afectar a los demás grupos
+                    vistos = set()
+                    retenidos = self.grupos_retenidos
+                    for p in procesos_nuevos:
+                        if p.grupo in retenidos:
+                            if p.tiempo_estado < p.tiempo_admision:
+                                p.tiempo_estado += 1
+                        elif p.grupo not in vistos:
+                            vistos.add(p.grupo)
+                            p.tiempo_estado += 1
+                else:
+                    # Secuencial: solo avanza el proceso con menor PID en Nuevo
+                    procesos_nuevos[0].tiempo_estado += 1
+
+                # Admitir a Listo los que alcanzaron su tiempo de admisión, si hay capacidad
+                preparados = [p for p in procesos_nuevos if p.tiempo_estado >= p.tiempo_admision]
+                admitidos, sin_capacidad, llenos = self.planificador.admitir_lote(preparados, self.procesos,
+                                                                                  self.tick_actual)
+                for p in admitidos:
+                    self._log(f"PID {p.pid}: Nuevo → Listo ({p.tiempo_admision} ticks, "
+                              f"{self.tick_actual - p.tick_llegada} ticks en Nuevo)")
+
+                # Un grupo lleno retiene solo a sus procesos: se registra aparte de la contrapresión
+                for ruta in sorted(llenos - self.grupos_retenidos):
+                    self._log(f"🚧 Grupo {ruta} en el límite de memoria (propio o de un ancestro): "
+                              f"retiene a sus procesos en Nuevo")
+                for ruta in sorted(self.grupos_retenidos - llenos):
+                    self._log(f"✅ Grupo {ruta}: memoria liberada, admisión del grupo reanudada")
+                self.grupos_retenidos = llenos
+
+                # Solo un rechazo por capacidad del sistema es contrapresión; los que exceden el lote
+                # entran el próximo tick
+                if sin_capacidad and not self.admision_retenida:
+                    self._log(f"🚧 CONTRAPRESIÓN: {len(preparados) - len(admitidos)} proceso(s) retenidos en Nuevo "
+                              f"(cola {len(self.planificador.cola_listos)}/{self.planificador.max_cola_listos}, "
+                              f"presupuesto {self.planificador.presupuesto_memoria_mb:.0f} MB)")
+                elif not sin_capacidad and self.admision_retenida:
+                    self._log(f"✅ Capacidad liberada: admisión normal reanudada")
+                self.admision_retenida = sin_capacidad
+
+            # Listo -> Ejecución: solo el primero en cola (tiempo variable)
+            for p in self.procesos.values():
+                if p.estado == "Listo":
+                    p.tiempo_estado += 1
+            if self.grupos.activo:
+                for pid in self.planificador.cola_listos:
+                    self.grupos.cargar(self.procesos[pid].grupo, "ticks_espera")
+
+            # Asignar CPU con PRIORIDAD POR ANTIGÜEDAD (aging anti-starvation), un proceso por núcleo libre
+            while self.planificador.nucleo_libre() is not None and self.planificador.cola_listos:
+
+                # 0. Con grupos de recursos, primero el reparto justo decide qué grupo tiene el turno
+                turno = None
+                if self.grupos.activo:
+                    turno = self._turno_por_grupo()
+                    if turno is None:
+                        break
+
+                # 1. Buscar procesos con MUCHO tiempo esperando (20+ ticks) - PRIORIDAD (dentro del grupo con turno)
+                procesos_hambrientos = []
+                for pid in self.planificador.cola_listos:
+                    p = self.procesos.get(pid)
+                    if (p and p.estado == "Listo" and p.tiempo_estado >= self.umbral_aging
+                            and (turno is None or p.grupo == turno[0])):
+                        procesos_hambrientos.append(p)
+
+                # 2. Si hay procesos hambrientos, dar prioridad al más antiguo
+                if procesos_hambrientos:
+                    proceso_elegido = min(procesos_hambrientos, key=lambda x: x.pid)  # Más antiguo por PID
+                    # Mover al frente de la cola para darle prioridad inmediata
+                    self.planificador.cola_listos.remove(proceso_elegido.pid)
+                    self.planificador.cola_listos.insert(0, proceso_elegido.pid)
+                    self.estadisticas["promociones_aging"] += 1
+                    self._log(f"🚨 AGING: PID {proceso_elegido.pid} promovido por hambruna ({proceso_elegido.tiempo_estado} ticks esperando)")
+
+                # 2b. Sin hambrientos en el grupo con turno, su primero en la cola (FIFO dentro del grupo)
+                elif turno is not None:
+                    self.planificador.cola_listos.remove(turno[1])
+                    self.planificador.cola_listos.insert(0, turno[1])
+
+                # 3. Ejecutar el primer proceso de la cola (FIFO normal o proceso promovido)
+                pid_primero = self.planificador.cola_listos[0]
+                p_primero = self.procesos.get(pid_primero)
+                if not (p_primero and p_primero.estado == "Listo" and p_primero.tiempo_estado >= p_primero.tiempo_espera_cpu):
+                    break  # FIFO estricto: si el primero aún no puede, nadie lo adelanta
+
+                # Ha esperado suficiente, puede ejecutar
+                self.planificador.cola_listos.pop(0)
+                self.planificador.cambiar_estado(p_primero, "Ejecución")
+                p_primero.tiempo_estado = 0
+                if p_primero.duracion_ejecucion <= 0:
+                    p_primero.duracion_ejecucion = generar_duracion_ejecucion_variada(self.rng)
+                nucleo = self.planificador.entrar(p_primero)
+
+                # Marcar si fue por aging y registrar
+                es_por_aging = p_primero.pid in {p.pid for p in procesos_hambrientos}
+                if es_por_aging:
+                    self.planificador.proceso_con_prioridad = p_primero.pid
+
+                tipo_asignacion = "AGING" if es_por_aging else self.planificador.politica.upper()
+                en_nucleo = f", núcleo {nucleo}" if len(self.planificador.nucleos) > 1 else ""
+                self._log(f"PID {p_primero.pid}: Listo → Ejecución ({tipo_asignacion}{en_nucleo}, esperó {p_primero.tiempo_estado + p_primero.tiempo_espera_cpu} ticks total)")
+
+            # Ejecución -> Bloqueado/Zombi/Finalizado/Listo (tiempo variable), núcleo por núcleo
+            for pid in self.planificador.ejecutando():
+                p = self.procesos.get(pid)
+                if p and p.estado == "Ejecución":
+                    self.estadisticas["ticks_cpu_ocupada"] += 1
+                    if self.grupos.activo:
+                        self.grupos.cargar_cpu(p.grupo)
+                    if p.sobrecarga >= 1:
+                        # Cambio de contexto / cache fría / migración: el núcleo trabaja, la ráfaga no avanza
+                        p.sobrecarga -= 1
+                        self.planificador.metricas_cambios.ticks_sobrecarga += 1
+                        continue
+                    p.tiempo_estado += 1
+                    if self.prob_fork and self.rng.random() < self.prob_fork:
+                        hijo = self.fork(p.pid)[0]
+                        hijo.recolecta = self.rng.random() >= self.prob_sin_wait
+                    ejecutado = p.ejecutado_previo + p.tiempo_estado
+
+                    # Calcular probabilidad de bloqueo basada en la CARGA del sistema
+                    procesos_esperando = len(self.planificador.cola_listos)
+                    ya_hay_bloqueados = len(self.planificador.procesos_bloqueados) > 0
+
+                    # Probabilidad aumenta con más procesos esperando (simulando contención de recursos)
+                    probabilidad_base = self.prob_bloqueo_base
+                    factor_carga = min(procesos_esperando * self.prob_bloqueo_por_espera,
+                                       self.prob_bloqueo_max_carga)  # Máximo 8% adicional
+                    probabilidad_bloqueo = probabilidad_base + factor_carga
+
+                    # Condiciones para bloqueo:
+                    # 1. Debe haber procesos esperando
+                    # 2. NO debe haber otros procesos ya bloqueados
+                    # 3. Debe haber ejecutado al menos 3 ticks
+                    # 4. Probabilidad variable según carga del sistema
+                    puede_bloquear = (p.automatizado and
+                                    procesos_esperando > 0 and
+                                    not ya_hay_bloqueados and
+                                    p.tiempo_estado >= 3 and
+                                    self.rng.random() < probabilidad_bloqueo)
+
+                    if puede_bloquear:
+                        # Si este proceso tenía prioridad, limpiar la marca antes de bloquearlo
+                        if self.planificador.proceso_con_prioridad == p.pid:
+                            self.planificador.proceso_con_prioridad = None
+                            self._log(f"🔓 PRIORIDAD LIBERADA: PID {p.pid} se bloqueó, procesos bloqueados pueden cambiar de estado")
+
+                        # Bloquear el proceso con dependencias
+                        self.planificador.bloquear_proceso(p, self.procesos)
+                        self.estadisticas["bloqueos"] += 1
+
+                        # Log con información de dependencia
+                        if p.proceso_dependencia:
+                            proceso_dep = self.procesos.get(p.proceso_dependencia)
+                            estado_dep = proceso_dep.estado if proceso_dep else "DESCONOCIDO"
+                            self._log(f"PID {p.pid}: Ejecución → Bloqueado (I/O, depende de PID {p.proceso_dependencia} [{estado_dep}])")
+                        else:
+                            self._log(f"PID {p.pid}: Ejecución → Bloqueado (I/O independiente, prob={probabilidad_bloqueo:.1%})")
+                    elif ejecutado >= p.duracion_ejecucion and p.rafagas:
+                        # Proceso de traza: termina la ráfaga y hace la E/S grabada antes de la siguiente
+                        if self.planificador.proceso_con_prioridad == p.pid:
+                            self.planificador.proceso_con_prioridad = None
+                        self.planificador.bloquear_por_traza(p, p.bloqueos[0])
+                        p.duracion_ejecucion, p.rafagas = p.rafagas[0], p.rafagas[1:]
+                        p.bloqueos = p.bloqueos[1:]
+                        self.estadisticas["bloqueos"] += 1
+                        self._log(f"PID {p.pid}: Ejecución → Bloqueado (E/S de traza, {p.tiempo_bloqueo} ticks; "
+                                  f"quedan {len(p.rafagas) + 1} ráfagas)")
+                    elif ejecutado >= p.duracion_ejecucion:
+                        # Terminar normalmente
+                        self.planificador.liberar(p.pid)
+                        p.ejecutado_previo = 0
+
+                        # Si este proceso terminó y tenía prioridad, limpiar la marca
+                        if self.planificador.proceso_con_prioridad == p.pid:
+                            self.planificador.proceso_con_prioridad = None
+                            self._log(f"🔓 PRIORIDAD LIBERADA: PID {p.pid} terminó, procesos bloqueados pueden cambiar de estado")
+
+                        if p.padre is not None:
+                            # Hijo por fork: exit() y Zombi hasta el wait() de su padre
+                            self._salir(p, f"{p.duracion_ejecucion} ticks completados")
+                        else:
+                            # TODOS los procesos van primero a Finalizado
+                            # Solo los PIDs especiales se convertirán en zombi después de 4 segundos
+                            self._finalizar_proceso(p, f"{p.duracion_ejecucion} ticks completados")
+                    elif (self.planificador.politica == "rr" and p.tiempo_estado >= self.planificador.quantum
+                          and self.planificador.cola_listos):
+                        # Round Robin: quantum agotado y hay otros esperando
+                        self.planificador.expropiar(p)
+                        self.estadisticas["expropiaciones"] += 1
+                        self._log(f"PID {p.pid}: Ejecución → Listo (quantum de {self.planificador.quantum} ticks agotado, "
+                                  f"{ejecutado}/{p.duracion_ejecucion} ejecutados)")
+
+            # Bloqueado -> Listo (SOLO si no hay proceso con prioridad ejecutándose)
+            for p in self.procesos.values():
+                if p.estado == "Bloqueado":
+                    p.tiempo_estado += 1
+                    if p.tiempo_estado >= p.tiempo_bloqueo:
+                        # Verificar condiciones para desbloqueo
+                        hay_proceso_prioritario = self.planificador.proceso_con_prioridad is not None
+
+                        # Verificar dependencia del proceso
+                        dependencia_resuelta = True
+                        if p.proceso_dependencia:
+                            proceso_dependencia = self.procesos.get(p.proceso_dependencia)
+                            if proceso_dependencia and proceso_dependencia.estado in ["Listo", "Ejecución"]:
+                                dependencia_resuelta = False  # Aún depende de un proceso activo
+                            else:
+                                # La dependencia terminó (Finalizado/Zombi) o no existe, se resuelve
+                                dependencia_resuelta = True
+
+                        if not hay_proceso_prioritario and dependencia_resuelta:
+                            # No hay prioridad activa y dependencia resuelta, puede desbloquearse
+                            self.planificador.desbloquear_proceso(p)
+                            if p.proceso_dependencia:
+                                self._log(f"PID {p.pid}: Bloqueado → Listo (dependencia PID {p.proceso_dependencia} resuelta)")
+                            else:
+                                self._log(f"PID {p.pid}: Bloqueado → Listo ({p.tiempo_bloqueo} ticks, sin dependencia)")
+                        elif hay_proceso_prioritario:
+                            # Hay proceso prioritario, debe esperar
+                            pid_prioritario = self.planificador.proceso_con_prioridad
+                            self._log(f"⏳ PID {p.pid}: Listo para cambiar, esperando proceso prioritario PID {pid_prioritario}")
+                        elif not dependencia_resuelta:
+                            # Dependencia aún activa, debe esperar
+                            proceso_dep = self.procesos.get(p.proceso_dependencia)
+                            estado_dep = proceso_dep.estado if proceso_dep else "INEXISTENTE"
+                            self._log(f"🔗 PID {p.pid}: Esperando dependencia PID {p.proceso_dependencia} [{estado_dep}]")
+
+        # 1.5) SIGCHLD: los padres que hacen wait() recolectan a sus hijos zombis
+        if self.sigchld_pendientes:
+            self._atender_sigchld()
+
+        self.estadisticas["suma_cola_listos"] += len(self.planificador.cola_listos)
+        if self.grupos.activo:
+            self.grupos.decaer()
+
+        if perf:
+            perf.marca("1 transiciones")
+
+        # 2) Los zombis permanecen para siempre - NO se recolectan automáticamente
+        # Solo pueden ser eliminados manualmente con el botón "Kill Zombi"
+        for p in self.procesos.values():
+            if p.estado == "Zombi":
+                p.tiempo_estado += 1  # Solo incrementar contador, no hacer nada más
+
+        # 3) Incrementar tiempo de procesos Finalizados (para auto-eliminación)
+        for p in self.procesos.values():
+            if p.estado == "Finalizado":
+                p.tiempo_estado += 1
+
+        if perf:
+            perf.marca("2-3 contadores")
+
+        # 4) Revisar PIDs especiales finalizados para conversión automática a zombi (4 segundos)
+        tiempo_actual = self.ahora()
+        pids_a_convertir_zombi = []
+
+        # Debug: mostrar PIDs pendientes y sus tiempos
+        if self.finalizados_pendientes_zombi:
+            self._log(f"⏰ Revisando PIDs pendientes para zombi:")
+            for pid, tiempo_finalizacion in self.finalizados_pendientes_zombi.items():
+                tiempo_transcurrido = tiempo_actual - tiempo_finalizacion
+                self._log(f"   PID {pid}: {tiempo_transcurrido:.1f}s transcurridos (necesita 4s)")
+
+        for pid, tiempo_finalizacion in list(self.finalizados_pendientes_zombi.items()):
+            tiempo_transcurrido = tiempo_actual - tiempo_finalizacion
+            if tiempo_transcurrido >= 4:  # 4 segundos
+                pids_a_convertir_zombi.append(pid)
+                self._log(f"✅ PID {pid} listo para conversión a zombi ({tiempo_transcurrido:.1f}s >= 4s)")
+
+        # Convertir PIDs especiales a zombi automáticamente
+        for pid in pids_a_convertir_zombi:
+            if pid in self.procesos:
+                p = self.procesos[pid]
+                if p.estado == "Finalizado":
+                    self.planificador.cambiar_estado(p, "Zombi")
+                    p.tiempo_estado = 0
+                    p.linger_zombi = generar_linger_zombi_variado(self.rng)
+                    self._log(f"PID {pid}: Finalizado → Zombi (conversión automática)")
+            del self.finalizados_pendientes_zombi[pid]
+
+        if perf:
+            perf.marca("4 zombis")
+
+        # 5) Eliminar procesos finalizados después de 3 ticks (procesos normales) o conversión a zombi (PIDs especiales)
+        pids_a_eliminar = []
+        for p in self.procesos.values():
+            if p.estado == "Finalizado":
+                if p.pid not in self.pids_especiales:
+                    # Proceso normal: eliminar después de 3 ticks
+                    if p.tiempo_estado >= 3:
+                        pids_a_eliminar.append(p.pid)
+                else:
+                    # PID especial: usar tiempo real para conversión a zombi (4 segundos)
+                    if p.tiempo_finalizado > 0:
+                        tiempo_transcurrido = tiempo_actual - p.tiempo_finalizado
+                        if tiempo_transcurrido >= 80:
+                            # PID especial encontrado después de 80 segundos - verificar si ya se convirtió
+                            self._log(f"🛡️ PID {p.pid} protegido (PID especial en Finalizado, esperando conversión a zombi)")
+
+        # Eliminar SOLO los procesos normales (no PIDs especiales)
+        for pid in pids_a_eliminar:
+            if pid in self.procesos:
+                proceso_eliminado = self.procesos[pid]
+
+                # Verificar si era un proceso automático antes de eliminarlo
+                era_automatico = pid in self.procesos_automaticos
+
+                self._eliminar_proceso(pid)
+
+                # Si era automático, decrementar contador y remover de la lista
+                if era_automatico:
+                    self.procesos_automaticos.remove(pid)
+                    self.auto_process_counter -= 1
+                    self._log(f"🤖 Proceso automático PID {pid} eliminado. Contador: {self.auto_process_counter}/{self.max_auto_processes}")
+
+                self._log(f"PID {pid} ({proceso_eliminado.nombre}) eliminado automáticamente tras 3 ticks (proceso normal).")
+
+        # Actualizar proporción de PIDs especiales después de eliminar procesos
+        if pids_a_eliminar:
+            self._actualizar_pids_especiales()
+
+        if perf:
+            perf.marca("5 purga")
+
+        # 5.5) Actualizar y distribuir recursos del sistema respetando límites
+        self._distribuir_recursos_sistema()
+        if perf:
+            perf.marca("5.5 recursos")
+            perf.fin_tick()
+
+    # ---------- Resumen ----------
+    def contar_por_estado(self) -> Dict[str, int]:
+        por_estado: Dict[str, int] = {e: 0 for e in ("Nuevo",) + ESTADOS}
+        for p in self.procesos.values():
+            por_estado[p.estado] = por_estado.get(p.estado, 0) + 1
+        return por_estado
+
+    def instantanea(self) -> Instantanea:
+        """Copia inmutable de lo que muestra la interfaz (se publica desde el hilo del motor)"""
+        filas = []
+        cpu_total = memoria_total = disco_total = 0.0
+        for p in self.procesos.values():
+            cpu_total += p.cpu_percent
+            memoria_total += p.memoria_mb
+            disco_total += p.disco_percent
+            if p.estado != "Nuevo":
+                filas.append(p.to_row())
+        admision = self.planificador.metricas_admision
+        return Instantanea(
+            tick=self.tick_actual,
+            filas=tuple(filas),
+            total=len(self.procesos),
+            por_estado=tuple(self.contar_por_estado().items()),
+            total_finalizados=self.total_finalizados_historico,
+            cola_listos=len(self.planificador.cola_listos),
+            cpu_total=cpu_total,
+            memoria_total=memoria_total,
+            disco_total=disco_total,
+            memoria_total_disponible=self.memoria_total_disponible,
+            espera_nuevo_promedio=admision.espera_promedio,
+            espera_nuevo_maxima=admision.espera_maxima,
+            rechazos_admision=admision.rechazos,
+            memoria_comprometida=self.planificador.memoria_comprometida(),
+            presupuesto_memoria_mb=self.planificador.presupuesto_memoria_mb,
+            admision_retenida=self.admision_retenida,
+            ticks_por_segundo=self.perfilador.ticks_por_segundo if self.perfilador else 0.0,
+            series=self.series,
+            perfil=self.perfilador.resumen() if self.perfilador else (),
+        )
+
+    def resumen(self) -> Dict[str, float]:
+        """Métricas agregadas de la ejecución hasta el tick actual"""
+        ticks = max(self.tick_actual, 1)
+        admision = self.planificador.metricas_admision
+        cambios = self.planificador.metricas_cambios
+        ticks_nucleo = ticks * len(self.planificador.nucleos)
+        resumen = {
+            "ticks": self.tick_actual,
+            "creados": self.estadisticas["creados"],
+            "finalizados": self.total_finalizados_historico,
+            "throughput": self.total_finalizados_historico / ticks,
+            "utilizacion_cpu": self.estadisticas["ticks_cpu_ocupada"] / ticks_nucleo,
+            "utilizacion_util": (self.estadisticas["ticks_cpu_ocupada"] - cambios.ticks_sobrecarga) / ticks_nucleo,
+            "cola_listos_promedio": self.estadisticas["suma_cola_listos"] / ticks,
+            "promociones_aging": self.estadisticas["promociones_aging"],
+            "bloqueos": self.estadisticas["bloqueos"],
+            "expropiaciones": self.estadisticas["expropiaciones"],
+            "espera_nuevo_promedio": admision.espera_promedio,
+            "espera_nuevo_maxima": admision.espera_maxima,
+            "rechazos_admision": admision.rechazos,
+            "forks": self.estadisticas["forks"],
+            "sigchld": self.estadisticas["sigchld"],
+            "recolectados_por_padre": self.estadisticas["recolectados_por_padre"],
+            "reparentados": self.estadisticas["reparentados"],
+            "zombis_sin_recolectar": sum(len(z) for z in self.zombis_de.values()),
+            "cambios_contexto": cambios.cambios_contexto,
+            "caches_frias": cambios.caches_frias,
+            "migraciones_nucleo": cambios.migraciones,
+            "ticks_sobrecarga": cambios.ticks_sobrecarga,
+        }
+        for estado, cantidad in self.contar_por_estado().items():
+            resumen[f"vivos_{estado}"] = cantidad
+        if self.grupos.activo:
+            for ruta, contabilidad in self.grupos.resumen().items():
+                if ruta != RAIZ:
+                    resumen.update((f"grupo{ruta}_{campo}", valor) for campo, valor in contabilidad.items())
+        return resumen
+
+# ===============================
+# Ejecución sin interfaz
+# ===============================
+
+@dataclass
+class ConfiguracionSimulacion:
+    """Parámetros de una ejecución sin ventana (una fila del barrido)"""
+    ticks: int = 1000
+    semilla: int = 0
+    umbral_aging: int = 20
+    prob_bloqueo_base: float = 0.02
+    prob_bloqueo_por_espera: float = 0.015
+    prob_bloqueo_max_carga: float = 0.08
+    max_auto_processes: int = 3
+    procesos_por_especial: int = 9
+    procesos_iniciales: int = 5
+    prob_llegada: float = 0.15       # probabilidad de que llegue un proceso de carga en cada tick
+    politica: str = "fifo"           # ver POLITICAS
+    quantum: int = 4                 # ticks por turno con política "rr"
+    nucleos: int = 1
+    grupos: Tuple[str, ...] = ()     # "/ruta:cuota=200,memoria=1024,disco=30,llegada=0.1" (ver grupos.py)
+    prob_fork: float = 0.0           # probabilidad por tick de fork de cada proceso en Ejecución
+    prob_sin_wait: float = 0.2       # proporción de hijos que nunca hacen wait() (dejan zombis)
+    costo_cambio_contexto: float = 0.0  # ticks de núcleo por cambio de contexto (ver CostosCambio)
+    costo_cache_fria: float = 0.0
+    costo_migracion: float = 0.0
+    capacidad_cache: int = 1
+
+def crear_motor(config: ConfiguracionSimulacion, log: Optional[Callable[[str], None]] = None) -> MotorSimulacion:
+    """Construye un motor con tiempo simulado y los parámetros de la configuración"""
+    motor = MotorSimulacion(log=log, semilla=config.semilla, tiempo_real=False, nucleos=config.nucleos,
+                            politica=config.politica, quantum=config.quantum)
+    motor.umbral_aging = config.umbral_aging
+    motor.prob_bloqueo_base = config.prob_bloqueo_base
+    motor.prob_bloqueo_por_espera = config.prob_bloqueo_por_espera
+    motor.prob_bloqueo_max_carga = config.prob_bloqueo_max_carga
+    motor.max_auto_processes = config.max_auto_processes
+    motor.procesos_por_especial = config.procesos_por_especial
+    motor.prob_fork = config.prob_fork
+    motor.prob_sin_wait = config.prob_sin_wait
+    motor.planificador.costos = CostosCambio(config.costo_cambio_contexto, config.costo_cache_fria,
+                                             config.costo_migracion, config.capacidad_cache)
+    for spec in config.grupos:
+        ruta, opciones = parsear_grupo(spec)
+        motor.grupos.definir(ruta, int(opciones.get("cuota", CUOTA_POR_DEFECTO)), opciones.get("memoria"), opciones.get("disco"))
+    return motor
+
+def ejecutar_simulacion(config: ConfiguracionSimulacion,
+                        al_tick: Optional[Callable[[MotorSimulacion], None]] = None) -> Dict[str, float]:
+    """Corre una simulación completa sin ventana y devuelve parámetros + métricas.
+    `al_tick`, si se pasa, se llama después de cada tick (p. ej. para volcar series)."""
+    motor = crear_motor(config)
+    # Llegadas propias de cada grupo (además de la carga general, que va a la raíz)
+    llegadas_grupo = [(ruta, opciones["llegada"]) for ruta, opciones in map(parsear_grupo, config.grupos)
+                      if opciones.get("llegada")]
+    motor.crear_procesos(config.procesos_iniciales, "Carga")
+    for _ in range(config.ticks):
+        if motor.rng.random() < config.prob_llegada:
+            motor.crear_proceso("Carga")
+        for ruta, prob in llegadas_grupo:
+            if motor.rng.random() < prob:
+                motor.crear_proceso("Carga", ruta)
+        motor.tick()
+        if al_tick is not None:
+            al_tick(motor)
+    fila: Dict[str, float] = asdict(config)
+    fila["grupos"] = " ".join(config.grupos)  # una celda de texto en cualquier tabla (cli, barrido)
+    fila.update(motor.resumen())
+    return fila
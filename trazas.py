@@ -0,0 +1,403 @@
+"""
+Simulación dirigida por trazas reales de Linux.
+
+Lee capturas de procesos y las convierte en llegadas, ráfagas de CPU e
+intervalos de E/S que se inyectan en el motor tick a tick. Todo es un
+flujo de iteradores: la captura se recorre una sola vez y en memoria solo
+quedan los procesos vivos y los ya terminados que esperan su turno de
+salida, así que una traza de varios GB no se carga completa.
+
+Formatos de entrada (se aceptan comprimidos con gzip, extensión .gz):
+
+- Instantáneas de /proc/[pid]/stat: cada muestra empieza con una línea
+  "# <instante en segundos>" seguida de las líneas de stat de los procesos
+  (lo que escribe `python trazas.py capturar`, o un bucle con
+  `date +%s.%N` y `cat /proc/[0-9]*/stat`). El CPU sale de utime+stime en
+  ticks de reloj (USER_HZ, por defecto 100).
+- CSV estilo ps con encabezado: instante (timestamp/ts/time_s), pid,
+  nombre (comm/command/cmd), estado (stat/state/s) y CPU acumulado, ya sea
+  cputime/time en segundos o en formato de ps "[dd-]hh:mm:ss", o bien
+  utime y stime en ticks de reloj.
+
+Las filas deben venir agrupadas por instante y en orden cronológico, que
+es como las produce cualquier captura periódica.
+
+Ejemplo:
+    python trazas.py capturar captura.txt --intervalo 0.5 --muestras 600
+    python trazas.py reproducir captura.txt --segundos-por-tick 0.5 --ticks 5000
+"""
+import argparse
+import csv
+import gzip
+import heapq
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from simulador import ConfiguracionSimulacion, MotorSimulacion, ProcesoTraza, crear_motor
+
+# Estados de /proc que cuentan como espera de E/S (durmiendo sin usar CPU)
+ESTADOS_DORMIDO = frozenset("SDW")
+
+
+class Muestra(NamedTuple):
+    """Un proceso en una instantánea de la captura"""
+    instante: float   # segundos
+    pid: int
+    nombre: str
+    estado: str       # letra de estado de /proc (R, S, D, Z...)
+    cpu_s: float      # CPU acumulado (usuario + sistema) en segundos
+
+
+def abrir_texto(ruta: str) -> TextIO:
+    if ruta.endswith(".gz"):
+        return gzip.open(ruta, "rt", encoding="utf-8", newline="")
+    return open(ruta, "r", encoding="utf-8", newline="", buffering=1 << 20)
+
+
+# ===============================
+# Lectores
+# ===============================
+
+def _parsear_stat(linea: str, hz: int) -> Optional[Tuple[int, str, str, float]]:
+    """(pid, comm, estado, cpu_s) de una línea de /proc/[pid]/stat"""
+    # comm va entre paréntesis y puede contener espacios o paréntesis: cortar en el último ')'
+    abre = linea.find("(")
+    cierra = linea.rfind(")")
+    if abre < 0 or cierra < abre:
+        return None
+    campos = linea[cierra + 2:].split()
+    if len(campos) < 13:
+        return None
+    utime, stime = int(campos[11]), int(campos[12])
+    return int(linea[:abre]), linea[abre + 1:cierra], campos[0], (utime + stime) / hz
+
+
+def leer_proc_stat(ruta: str, hz: int = 100) -> Iterator[Muestra]:
+    with abrir_texto(ruta) as f:
+        instante = None
+        for linea in f:
+            linea = linea.strip()
+            if not linea:
+                continue
+            if linea.startswith("#"):
+                instante = float(linea[1:])
+                continue
+            if instante is None:
+                raise ValueError(f"{ruta}: falta la línea '# <instante>' antes de la primera muestra")
+            datos = _parsear_stat(linea, hz)
+            if datos is not None:
+                yield Muestra(instante, *datos)
+
+
+def _segundos_ps(texto: str) -> float:
+    """TIME de ps ("[dd-]hh:mm:ss" o "mm:ss") o segundos en decimal"""
+    texto = texto.strip()
+    if ":" not in texto:
+        return float(texto)
+    dias = 0
+    if "-" in texto:
+        d, texto = texto.split("-", 1)
+        dias = int(d)
+    segundos = 0.0
+    for parte in texto.split(":"):
+        segundos = segundos * 60 + float(parte)
+    return dias * 86400 + segundos
+
+
+_ALIAS_CSV = {
+    "instante": ("timestamp", "ts", "time_s", "instante", "epoch"),
+    "pid": ("pid",),
+    "nombre": ("comm", "command", "cmd", "name", "nombre"),
+    "estado": ("stat", "state", "s", "estado"),
+    "cpu": ("cputime", "time", "cpu_s", "cpu"),
+}
+
+
+def leer_csv_ps(ruta: str, hz: int = 100) -> Iterator[Muestra]:
+    with abrir_texto(ruta) as f:
+        lector = csv.reader(f)
+        encabezado = [c.strip().lower() for c in next(lector)]
+        indice = {}
+        for campo, alias in _ALIAS_CSV.items():
+            indice[campo] = next((encabezado.index(a) for a in alias if a in encabezado), None)
+        por_ticks = indice["cpu"] is None and "utime" in encabezado and "stime" in encabezado
+        faltan = [c for c in ("instante", "pid", "nombre") if indice[c] is None]
+        if faltan or (indice["cpu"] is None and not por_ticks):
+            raise ValueError(f"{ruta}: columnas no reconocidas en el encabezado {encabezado}")
+        i_utime = encabezado.index("utime") if por_ticks else None
+        i_stime = encabezado.index("stime") if por_ticks else None
+        i_estado = indice["estado"]
+
+        for fila in lector:
+            if not fila:
+                continue
+            if por_ticks:
+                cpu_s = (int(fila[i_utime]) + int(fila[i_stime])) / hz
+            else:
+                cpu_s = _segundos_ps(fila[indice["cpu"]])
+            estado = fila[i_estado].strip()[:1] if i_estado is not None else "R"
+            yield Muestra(float(fila[indice["instante"]]), int(fila[indice["pid"]]),
+                          fila[indice["nombre"]].strip(), estado, cpu_s)
+
+
+def leer_captura(ruta: str, formato: str = "auto", hz: int = 100) -> Iterator[Muestra]:
+    if formato == "auto":
+        base = ruta[:-3] if ruta.endswith(".gz") else ruta
+        formato = "ps" if base.endswith(".csv") else "stat"
+    if formato == "ps":
+        return leer_csv_ps(ruta, hz)
+    if formato == "stat":
+        return leer_proc_stat(ruta, hz)
+    raise ValueError(f"formato desconocido: {formato}")
+
+
+# ===============================
+# Reconstrucción de procesos
+# ===============================
+
+@dataclass
+class _Vivo:
+    llegada: int
+    nombre: str
+    instante: float
+    cpu_s: float
+    rafagas: List[int] = field(default_factory=list)
+    bloqueos: List[int] = field(default_factory=list)
+    cpu_actual: float = 0.0     # CPU de la ráfaga en curso (s)
+    dormido: float = 0.0        # E/S acumulada desde la última ráfaga (s)
+
+
+class ReconstructorTraza:
+    """
+    Convierte el flujo de muestras en ProcesoTraza ordenados por llegada.
+
+    Un proceso se conoce entero recién cuando desaparece de la captura, pero
+    debe salir en orden de llegada: los terminados esperan en un montículo
+    hasta que no quede vivo ninguno que haya llegado antes (la marca de agua
+    es la llegada del vivo más antiguo). Para que un demonio que vive toda
+    la captura no retenga todo detrás de sí, los vivos más viejos que
+    `horizonte_ticks` se emiten por tramos: lo observado hasta ahí sale como
+    un proceso y el resto continúa como uno nuevo que llega en ese tick.
+    """
+
+    def __init__(self, segundos_por_tick: float = 1.0, horizonte_ticks: int = 10000):
+        self.segundos_por_tick = segundos_por_tick
+        self.horizonte_ticks = horizonte_ticks
+        self.vivos: Dict[int, _Vivo] = {}   # en orden de llegada (los dict conservan la inserción)
+        self._listos: List[Tuple[int, int, ProcesoTraza]] = []
+        self._secuencia = 0
+        self._inicio: Optional[float] = None
+        self.descartados = 0                # procesos sin ninguna ráfaga de CPU observada
+
+    def _ticks(self, segundos: float) -> int:
+        return max(1, round(segundos / self.segundos_por_tick))
+
+    def _tick_de(self, instante: float) -> int:
+        return int((instante - self._inicio) / self.segundos_por_tick)
+
+    def _cerrar(self, pid: int, vivo: _Vivo):
+        rafagas, bloqueos = vivo.rafagas, vivo.bloqueos
+        # Cada bloqueo se registra junto con la ráfaga que lo sigue, que queda abierta en
+        # cpu_actual: la E/S final sin ráfaga posterior nunca llega a `bloqueos`
+        if vivo.cpu_actual > 0:
+            rafagas.append(self._ticks(vivo.cpu_actual))
+        if not rafagas:
+            self.descartados += 1
+            return
+        traza = ProcesoTraza(vivo.llegada, pid, vivo.nombre, tuple(rafagas), tuple(bloqueos))
+        heapq.heappush(self._listos, (vivo.llegada, self._secuencia, traza))
+        self._secuencia += 1
+
+    def _observar(self, vivo: _Vivo, muestra: Muestra):
+        dt = muestra.instante - vivo.instante
+        dcpu = muestra.cpu_s - vivo.cpu_s
+        if dcpu > 0:
+            if vivo.dormido > 0 and vivo.cpu_actual > 0:
+                # Terminó una E/S: se cierra la ráfaga anterior y su bloqueo
+                vivo.rafagas.append(self._ticks(vivo.cpu_actual))
+                vivo.bloqueos.append(self._ticks(vivo.dormido))
+                vivo.cpu_actual = 0.0
+            vivo.dormido = 0.0
+            vivo.cpu_actual += dcpu
+        elif muestra.estado in ESTADOS_DORMIDO and vivo.cpu_actual > 0:
+            vivo.dormido += dt
+        vivo.instante = muestra.instante
+        vivo.cpu_s = muestra.cpu_s
+
+    def _fin_instantanea(self, tick: int, vistos: set):
+        # Los que no aparecieron en la instantánea terminaron
+        for pid in [pid for pid in self.vivos if pid not in vistos]:
+            self._cerrar(pid, self.vivos.pop(pid))
+        # Tramos de los vivos más viejos que el horizonte
+        while self.vivos:
+            pid, vivo = next(iter(self.vivos.items()))
+            if tick - vivo.llegada <= self.horizonte_ticks:
+                break
+            del self.vivos[pid]
+            self._cerrar(pid, vivo)
+            self.vivos[pid] = _Vivo(tick, vivo.nombre, vivo.instante, vivo.cpu_s)
+
+    def _emitibles(self) -> Iterator[ProcesoTraza]:
+        marca = next(iter(self.vivos.values())).llegada if self.vivos else None
+        while self._listos and (marca is None or self._listos[0][0] <= marca):
+            yield heapq.heappop(self._listos)[2]
+
+    def procesar(self, muestras: Iterable[Muestra]) -> Iterator[ProcesoTraza]:
+        actual: Optional[float] = None
+        primera = True
+        vistos: set = set()
+        for m in muestras:
+            if m.instante != actual:
+                if actual is not None:
+                    self._fin_instantanea(self._tick_de(actual), vistos)
+                    yield from self._emitibles()
+                    primera = False
+                if self._inicio is None:
+                    self._inicio = m.instante
+                actual = m.instante
+                vistos = set()
+            vistos.add(m.pid)
+            vivo = self.vivos.get(m.pid)
+            if vivo is not None and m.cpu_s < vivo.cpu_s:
+                # PID reutilizado por un proceso nuevo
+                self._cerrar(m.pid, self.vivos.pop(m.pid))
+                vivo = None
+            if vivo is None:
+                # Los presentes en la primera instantánea arrancan de cero; los que llegan
+                # después traen como primera ráfaga el CPU que usaron desde que nacieron
+                vivo = _Vivo(self._tick_de(m.instante), m.nombre, m.instante, m.cpu_s)
+                if not primera:
+                    vivo.cpu_actual = m.cpu_s
+                self.vivos[m.pid] = vivo
+            else:
+                self._observar(vivo, m)
+        # Fin de la captura: lo que sigue vivo se emite con lo observado
+        for pid, vivo in list(self.vivos.items()):
+            self._cerrar(pid, vivo)
+        self.vivos.clear()
+        yield from self._emitibles()
+
+
+def leer_traza(ruta: str, formato: str = "auto", segundos_por_tick: float = 1.0,
+               hz: int = 100, horizonte_ticks: int = 10000) -> Iterator[ProcesoTraza]:
+    """Flujo de ProcesoTraza en orden de llegada a partir de una captura"""
+    reconstructor = ReconstructorTraza(segundos_por_tick, horizonte_ticks)
+    return reconstructor.procesar(leer_captura(ruta, formato, hz))
+
+
+# ===============================
+# Reproducción en el motor
+# ===============================
+
+class ReproductorTraza:
+    """Inyecta en el motor, antes de cada tick, los procesos de la traza que ya llegaron"""
+
+    def __init__(self, procesos: Iterator[ProcesoTraza], tick_inicio: int = 0):
+        self.procesos = procesos
+        self.tick_inicio = tick_inicio
+        self._siguiente: Optional[ProcesoTraza] = next(self.procesos, None)
+        self.inyectados = 0
+
+    @property
+    def agotada(self) -> bool:
+        return self._siguiente is None
+
+    def alimentar(self, motor: MotorSimulacion) -> int:
+        tick = motor.tick_actual - self.tick_inicio
+        llegan = []
+        while self._siguiente is not None and self._siguiente.llegada <= tick:
+            llegan.append(self._siguiente)
+            self._siguiente = next(self.procesos, None)
+        motor.crear_procesos_traza(llegan)
+        self.inyectados += len(llegan)
+        return len(llegan)
+
+
+def ejecutar_traza(procesos: Iterator[ProcesoTraza], config: Optional[ConfiguracionSimulacion] = None,
+                   ticks: Optional[int] = None, ticks_drenaje: int = 10000) -> Dict[str, float]:
+    """
+    Corre el motor sin ventana alimentado solo por la traza (sin llegadas
+    sintéticas ni procesos "System"). Con ticks=None sigue hasta agotar la
+    traza y vaciar el sistema, con un tope de `ticks_drenaje` tras la última llegada.
+    """
+    config = config or ConfiguracionSimulacion(max_auto_processes=0)
+    motor = crear_motor(config)
+    motor.max_auto_processes = 0
+    reproductor = ReproductorTraza(procesos, motor.tick_actual)
+    drenaje = 0
+    while ticks is None or motor.tick_actual < ticks:
+        reproductor.alimentar(motor)
+        motor.tick()
+        if ticks is None and reproductor.agotada:
+            drenaje += 1
+            vivos = any(p.estado not in ("Finalizado", "Zombi") for p in motor.procesos.values())
+            if not vivos or drenaje >= ticks_drenaje:
+                break
+    resumen = motor.resumen()
+    resumen["procesos_traza"] = reproductor.inyectados
+    return resumen
+
+
+# ===============================
+# Captura en el equipo local
+# ===============================
+
+def capturar_proc_stat(salida: str, intervalo_s: float = 1.0, muestras: int = 60, proc: str = "/proc"):
+    """Graba `muestras` instantáneas de /proc/[pid]/stat en el formato que lee leer_proc_stat"""
+    abrir = gzip.open if salida.endswith(".gz") else open
+    with abrir(salida, "wt", encoding="utf-8") as f:
+        proxima = time.monotonic()
+        for _ in range(muestras):
+            f.write(f"# {time.time():.3f}\n")
+            for entrada in os.listdir(proc):
+                if not entrada.isdigit():
+                    continue
+                try:
+                    with open(os.path.join(proc, entrada, "stat"), "r", encoding="utf-8", errors="replace") as stat:
+                        f.write(stat.read())
+                except OSError:
+                    pass  # el proceso terminó entre listdir y la lectura
+            proxima += intervalo_s
+            time.sleep(max(0.0, proxima - time.monotonic()))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulación dirigida por trazas de procesos reales")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    cap = sub.add_parser("capturar", help="graba instantáneas de /proc/[pid]/stat")
+    cap.add_argument("salida")
+    cap.add_argument("--intervalo", type=float, default=1.0, help="segundos entre instantáneas")
+    cap.add_argument("--muestras", type=int, default=60)
+
+    rep = sub.add_parser("reproducir", help="simula la carga de una captura")
+    rep.add_argument("captura")
+    rep.add_argument("--formato", choices=("auto", "stat", "ps"), default="auto")
+    rep.add_argument("--segundos-por-tick", type=float, default=1.0)
+    rep.add_argument("--hz", type=int, default=100, help="USER_HZ de utime/stime")
+    rep.add_argument("--horizonte", type=int, default=10000,
+                     help="ticks tras los cuales un proceso vivo se emite por tramos")
+    rep.add_argument("--ticks", type=int, default=None, help="por defecto, hasta agotar la traza")
+    rep.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.comando == "capturar":
+        capturar_proc_stat(args.salida, args.intervalo, args.muestras)
+        print(f"{args.muestras} instantáneas guardadas en {args.salida}", file=sys.stderr)
+        return 0
+
+    inicio = time.perf_counter()
+    procesos = leer_traza(args.captura, args.formato, args.segundos_por_tick, args.hz, args.horizonte)
+    config = ConfiguracionSimulacion(semilla=args.semilla, max_auto_processes=0)
+    resumen = ejecutar_traza(procesos, config, args.ticks)
+    for clave, valor in resumen.items():
+        print(f"{clave}: {valor:.4g}" if isinstance(valor, float) else f"{clave}: {valor}")
+    print(f"({time.perf_counter() - inicio:.1f}s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,496 @@
+"""
+Verificación diferencial del motor contra el modelo de referencia.
+
+Cada caso arma una configuración al azar (núcleos, política, quantum,
+aging, probabilidades de bloqueo, llegadas) y una secuencia de acciones
+manuales (crear, crear en lote, admitir, finalizar, forzar, enviar a Zombi,
+recolectar, kill) a partir de su número de caso. La misma carga corre en
+MotorSimulacion y en ModeloReferencia (referencia.py). Después de cada
+tick se comparan:
+
+- las transiciones del tick, en orden (altas y bajas incluidas);
+- el estado de cada proceso, la cola de listos, los núcleos, los
+  bloqueados, la prioridad por aging y los PIDs especiales;
+- los contadores, los totales de recursos y el estado del generador
+  aleatorio (si el motor consume un número de más, se detecta en ese tick).
+
+Además se comprueban invariantes del motor en cada tick:
+
+- a lo sumo un proceso en Ejecución por núcleo, y todo proceso en Ejecución
+  ocupa un núcleo;
+- la cola de listos contiene exactamente a los procesos Listo, sin
+  repetidos, y la lista de bloqueados a los Bloqueado;
+- el índice de zombis coincide con los procesos en Zombi;
+- la CPU y el disco totales no superan el 100% ni la memoria la del sistema.
+
+Con --extendido, cada caso corre además con grupos de recursos, fork/wait y
+costos de cambio de contexto (fuera del modelo de referencia). En esas
+corridas solo se comprueban los invariantes, más la consistencia del árbol
+de procesos.
+
+Antes de los casos corren los escenarios de regresión (ESCENARIOS), que
+arman a mano situaciones puntuales y comprueban el resultado esperado.
+
+Un fallo informa el caso y el primer tick distinto. `--caso N` lo reproduce.
+
+Ejemplo:
+    python verificacion.py --casos 300 --ticks 400
+    python verificacion.py --caso 17 --ticks 400
+"""
+import argparse
+import contextlib
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import cli
+import simulador
+from referencia import ModeloReferencia, Transicion
+from simulador import ConfiguracionSimulacion, MotorSimulacion, crear_motor
+
+PRIMER_PID = 1001
+ACCIONES = ("crear", "crear_lote", "admitir", "finalizar", "forzar", "zombi", "recolectar", "kill_zombi")
+
+
+@dataclass
+class Fallo:
+    caso: int
+    tick: int
+    motivo: str
+    detalle: str
+
+    def __str__(self) -> str:
+        return f"caso {self.caso}, tick {self.tick}: {self.motivo}\n{self.detalle}"
+
+
+# ===============================
+# Carga aleatoria
+# ===============================
+
+def configuracion_aleatoria(rng: random.Random, caso: int, ticks: int, extendido: bool = False) -> ConfiguracionSimulacion:
+    config = ConfiguracionSimulacion(
+        ticks=ticks,
+        semilla=caso,
+        umbral_aging=rng.choice((3, 8, 20, 40)),
+        prob_bloqueo_base=rng.choice((0.0, 0.02, 0.1, 0.3)),
+        prob_bloqueo_por_espera=rng.choice((0.0, 0.015, 0.05)),
+        prob_bloqueo_max_carga=rng.choice((0.0, 0.08, 0.3)),
+        max_auto_processes=rng.randint(0, 4),
+        procesos_por_especial=rng.randint(2, 12),
+        procesos_iniciales=rng.randint(0, 12),
+        prob_llegada=rng.choice((0.0, 0.15, 0.5, 1.0)),
+        politica=rng.choice(simulador.POLITICAS),
+        quantum=rng.randint(1, 6),
+        nucleos=rng.randint(1, 4),
+    )
+    if extendido:
+        config.grupos = ("/a:cuota=300", "/b:cuota=100,memoria=400", "/b/c")
+        config.prob_fork = rng.choice((0.01, 0.05, 0.2))
+        config.prob_sin_wait = rng.choice((0.0, 0.5, 1.0))
+        config.costo_cambio_contexto = rng.choice((0.0, 0.3, 1.0))
+        config.costo_cache_fria = rng.choice((0.0, 0.5, 2.0))
+        config.costo_migracion = rng.choice((0.0, 1.0, 3.0))
+    return config
+
+
+def elegir_accion(rng: random.Random, pids: List[int]) -> Tuple[str, Any]:
+    """Acción manual al azar sobre los PIDs actuales (los dos modelos reciben la misma)"""
+    accion = rng.choice(ACCIONES)
+    if accion == "crear_lote":
+        return accion, rng.randint(1, 20)
+    if accion in ("admitir", "finalizar", "zombi") and pids:
+        return accion, rng.sample(pids, min(len(pids), rng.randint(1, 3)))
+    if accion == "forzar" and pids:
+        return accion, rng.choice(pids)
+    if accion in ("admitir", "finalizar", "zombi", "forzar"):
+        return "crear", None
+    return accion, None
+
+
+def aplicar(modelo, accion: str, argumento: Any):
+    """Misma acción sobre MotorSimulacion o ModeloReferencia (comparten los nombres de los métodos)"""
+    if accion == "crear":
+        modelo.crear_proceso("Manual")
+    elif accion == "crear_lote":
+        modelo.crear_procesos(argumento, "Lote")
+    elif accion == "admitir":
+        modelo.admitir(argumento)
+    elif accion == "finalizar":
+        modelo.finalizar(argumento)
+    elif accion == "forzar":
+        modelo.forzar_ejecucion(argumento)
+    elif accion == "zombi":
+        modelo.enviar_a_zombi(argumento)
+    elif accion == "recolectar":
+        modelo.recolectar_zombis()
+    elif accion == "kill_zombi":
+        modelo.kill_zombi()
+
+
+# ===============================
+# Observación y comparación
+# ===============================
+
+def observar_motor(motor: MotorSimulacion) -> Dict[str, Any]:
+    pl = motor.planificador
+    return {
+        "procesos": {p.pid: (p.estado, p.tiempo_estado, p.ejecutado_previo, p.duracion_ejecucion,
+                             p.proceso_dependencia) for p in motor.procesos.values()},
+        "cola_listos": list(pl.cola_listos),
+        "nucleos": list(pl.nucleos),
+        "bloqueados": list(pl.procesos_bloqueados),
+        "prioridad": pl.proceso_con_prioridad,
+        "especiales": list(motor.pids_especiales),
+        "candidatos": list(motor.candidatos_especiales),
+        "contadores": {
+            "creados": motor.estadisticas["creados"],
+            "finalizados": motor.total_finalizados_historico,
+            "bloqueos": motor.estadisticas["bloqueos"],
+            "expropiaciones": motor.estadisticas["expropiaciones"],
+            "promociones_aging": motor.estadisticas["promociones_aging"],
+            "rechazos_admision": pl.metricas_admision.rechazos,
+            "ticks_cpu_ocupada": motor.estadisticas["ticks_cpu_ocupada"],
+        },
+        "recursos": _totales(motor),
+        "rng": motor.rng.getstate(),
+    }
+
+
+def observar_referencia(ref: ModeloReferencia) -> Dict[str, Any]:
+    return {
+        "procesos": {p.pid: (p.estado, p.tiempo_estado, p.ejecutado_previo, p.duracion_ejecucion,
+                             p.proceso_dependencia) for p in ref.procesos.values()},
+        "cola_listos": list(ref.cola_listos),
+        "nucleos": list(ref.nucleos),
+        "bloqueados": list(ref.procesos_bloqueados),
+        "prioridad": ref.proceso_con_prioridad,
+        "especiales": list(ref.especiales),
+        "candidatos": list(ref.candidatos),
+        "contadores": dict(ref.contadores),
+        "recursos": ref.totales,
+        "rng": ref.rng.getstate(),
+    }
+
+
+def _totales(motor: MotorSimulacion) -> Tuple[float, float, float]:
+    ejecutando = [p for p in motor.procesos.values() if p.estado == "Ejecución"]
+    return (sum(p.cpu_percent for p in ejecutando),
+            sum(p.memoria_mb for p in motor.procesos.values()),
+            sum(p.disco_percent for p in ejecutando))
+
+
+def diferencias(motor: Dict[str, Any], ref: Dict[str, Any]) -> List[str]:
+    salida = []
+    for clave in motor:
+        if motor[clave] == ref[clave]:
+            continue
+        if clave == "procesos":
+            for pid in sorted(set(motor[clave]) | set(ref[clave])):
+                if motor[clave].get(pid) != ref[clave].get(pid):
+                    salida.append(f"  PID {pid}: motor {motor[clave].get(pid)} / referencia {ref[clave].get(pid)}")
+        elif clave == "rng":
+            salida.append("  el generador aleatorio se desincronizó (distinta cantidad de números consumidos)")
+        else:
+            salida.append(f"  {clave}: motor {motor[clave]} / referencia {ref[clave]}")
+    return salida
+
+
+def invariantes(motor: MotorSimulacion) -> List[str]:
+    """Violaciones de los invariantes del motor en el estado actual (lista vacía = todo bien)"""
+    pl = motor.planificador
+    errores = []
+    por_estado: Dict[str, set] = {}
+    for p in motor.procesos.values():
+        por_estado.setdefault(p.estado, set()).add(p.pid)
+
+    en_nucleo = [pid for pid in pl.nucleos if pid is not None]
+    if len(en_nucleo) != len(set(en_nucleo)):
+        errores.append(f"un PID ocupa más de un núcleo: {pl.nucleos}")
+    if set(en_nucleo) != por_estado.get("Ejecución", set()):
+        errores.append(f"núcleos {pl.nucleos} / en Ejecución {sorted(por_estado.get('Ejecución', ()))}")
+    if len(pl._nucleo_de) != len(en_nucleo) or any(pl.nucleos[n] != pid for pid, n in pl._nucleo_de.items()):
+        errores.append(f"índice de núcleos inconsistente: {pl._nucleo_de} / {pl.nucleos}")
+
+    if len(pl.cola_listos) != len(set(pl.cola_listos)):
+        errores.append(f"PIDs repetidos en la cola de listos: {pl.cola_listos}")
+    if set(pl.cola_listos) != por_estado.get("Listo", set()):
+        errores.append(f"cola de listos {pl.cola_listos} / en Listo {sorted(por_estado.get('Listo', ()))}")
+    if len(pl.procesos_bloqueados) != len(set(pl.procesos_bloqueados)):
+        errores.append(f"PIDs repetidos en bloqueados: {pl.procesos_bloqueados}")
+    if set(pl.procesos_bloqueados) != por_estado.get("Bloqueado", set()):
+        errores.append(f"bloqueados {pl.procesos_bloqueados} / en Bloqueado {sorted(por_estado.get('Bloqueado', ()))}")
+    if pl.zombis != por_estado.get("Zombi", set()):
+        errores.append(f"índice de zombis {sorted(pl.zombis)} / en Zombi {sorted(por_estado.get('Zombi', ()))}")
+
+    # Índices incrementales del planificador contra un recorrido de la tabla
+    comprometida = sum(simulador.MEMORIA_RESERVA_MB.get(p.estado, 0.0) for p in motor.procesos.values())
+    if abs(pl.memoria_comprometida() - comprometida) > 1e-6:
+        errores.append(f"memoria comprometida {pl.memoria_comprometida():.1f} MB / en la tabla {comprometida:.1f} MB")
+    por_grupo: Dict[str, float] = {}
+    listos_grupo: Dict[str, int] = {}
+    for p in motor.procesos.values():
+        for g in motor.grupos[p.grupo].linaje():
+            por_grupo[g.ruta] = por_grupo.get(g.ruta, 0.0) + simulador.MEMORIA_RESERVA_MB.get(p.estado, 0.0)
+        if p.estado == "Listo":
+            listos_grupo[p.grupo] = listos_grupo.get(p.grupo, 0) + 1
+    for ruta in set(por_grupo) | set(pl.comprometida_grupo):
+        if abs(pl.comprometida_grupo.get(ruta, 0.0) - por_grupo.get(ruta, 0.0)) > 1e-6:
+            errores.append(f"memoria comprometida de {ruta}: {pl.comprometida_grupo.get(ruta, 0.0):.1f} MB / "
+                           f"en la tabla {por_grupo.get(ruta, 0.0):.1f} MB")
+    if +pl.listos_grupo != listos_grupo:
+        errores.append(f"listos por grupo {dict(+pl.listos_grupo)} / en la tabla {listos_grupo}")
+
+    cpu, memoria, disco = _totales(motor)
+    if cpu > motor.cpu_total_disponible + 1e-9:
+        errores.append(f"CPU total {cpu:.6f}% > 100%")
+    if disco > motor.disco_total_disponible + 1e-9:
+        errores.append(f"disco total {disco:.6f}% > 100%")
+    if memoria > motor.memoria_total_disponible + 1e-6:
+        errores.append(f"memoria total {memoria:.3f} MB > {motor.memoria_total_disponible:.0f} MB")
+
+    # Árbol de procesos (fork/wait)
+    for padre, hijos in motor.hijos.items():
+        for hijo in hijos:
+            if hijo not in motor.procesos or motor.procesos[hijo].padre != padre:
+                errores.append(f"PID {hijo} figura como hijo de {padre} pero no lo es")
+    for padre, zombis in motor.zombis_de.items():
+        for hijo in zombis:
+            if hijo not in motor.hijos.get(padre, ()) or motor.procesos[hijo].estado != "Zombi":
+                errores.append(f"PID {hijo} figura como zombi de {padre} pero no lo es")
+    if motor.procesos_en_arbol != sum(1 for p in motor.procesos.values() if p.padre is not None):
+        errores.append(f"procesos_en_arbol={motor.procesos_en_arbol} no coincide con la tabla")
+    return errores
+
+
+# ===============================
+# Escenarios de regresión
+# ===============================
+# Situaciones puntuales que las cargas al azar casi nunca arman. Cada una
+# devuelve la lista de errores (vacía = todo bien).
+
+def _motor_escenario(**campos) -> MotorSimulacion:
+    simulador._id_counter = PRIMER_PID - 1
+    motor = crear_motor(ConfiguracionSimulacion(ticks=0, semilla=0, **campos))
+    motor.series = None
+    return motor
+
+
+def escenario_lote_sin_contrapresion() -> List[str]:
+    """Más preparados que el tamaño de lote, con capacidad de sobra: no es contrapresión"""
+    motor = _motor_escenario(max_auto_processes=0)
+    nuevos = motor.crear_procesos(20, "Lote")
+    for p in nuevos:
+        p.tiempo_estado = p.tiempo_admision
+    motor.tick()
+    errores = []
+    admitidos = sum(1 for p in nuevos if p.estado != "Nuevo")
+    if admitidos != motor.planificador.max_lote_admision:
+        errores.append(f"admitidos {admitidos}, se esperaba un lote de {motor.planificador.max_lote_admision}")
+    if motor.admision_retenida or motor.planificador.metricas_admision.rechazos:
+        errores.append(f"contrapresión por el tamaño de lote (retenida={motor.admision_retenida}, "
+                       f"rechazos={motor.planificador.metricas_admision.rechazos})")
+    return errores
+
+
+def escenario_traza_cuenta_en_grupo() -> List[str]:
+    """Los procesos de traza cuentan como creados en su grupo, igual que los sintéticos"""
+    motor = _motor_escenario(max_auto_processes=0)
+    motor.crear_procesos(3, "Carga")
+    motor.crear_procesos_traza([simulador.ProcesoTraza(0, 100 + i, "traza", (2, 1), (1,)) for i in range(4)])
+    raiz = motor.grupos[simulador.RAIZ]
+    if raiz.creados != motor.estadisticas["creados"]:
+        return [f"creados en {simulador.RAIZ}: {raiz.creados}, en el motor: {motor.estadisticas['creados']}"]
+    return []
+
+
+def escenario_forzar_conserva_rafaga() -> List[str]:
+    """Forzar la ejecución bajo rr: el desalojado conserva lo ejecutado y vuelve al frente"""
+    motor = _motor_escenario(max_auto_processes=0, politica="rr", quantum=10, nucleos=1,
+                             prob_bloqueo_base=0.0, prob_bloqueo_por_espera=0.0, prob_bloqueo_max_carga=0.0)
+    victima, siguiente = motor.crear_procesos(2, "Carga")
+    for p in (victima, siguiente):
+        p.duracion_ejecucion = 50
+    motor.admitir([victima.pid, siguiente.pid])
+    motor.forzar_ejecucion(victima.pid)
+    for _ in range(3):
+        motor.tick()
+    corrido = victima.ejecutado_previo + victima.tiempo_estado
+    motor.forzar_ejecucion(siguiente.pid)
+    errores = []
+    if victima.estado != "Listo" or motor.planificador.cola_listos[:1] != [victima.pid]:
+        errores.append(f"el desalojado quedó en {victima.estado}, cola {motor.planificador.cola_listos}")
+    if corrido == 0 or victima.ejecutado_previo != corrido:
+        errores.append(f"el desalojado perdió su avance: ejecutado_previo={victima.ejecutado_previo}, "
+                       f"había corrido {corrido} de {victima.duracion_ejecucion}")
+    return errores
+
+
+def escenario_csv_con_grupos() -> List[str]:
+    """El resumen CSV de cli.py guarda los grupos como especificaciones separadas por espacios"""
+    grupos = ["/a:cuota=100,llegada=0.1", "/b"]
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "resumen.csv")
+        argv = ["--ticks", "20", "--salida", ruta]
+        for spec in grupos:
+            argv += ["--grupo", spec]
+        with contextlib.redirect_stderr(io.StringIO()):
+            cli.main(argv)
+        with open(ruta, newline="", encoding="utf-8") as f:
+            filas = list(csv.DictReader(f))
+    if len(filas) != 1 or filas[0].get("grupos") != " ".join(grupos):
+        return [f"columna grupos: {[fila.get('grupos') for fila in filas]!r}"]
+    return []
+
+
+def escenario_huerfanos_de_raiz() -> List[str]:
+    """Un padre sin padre que sale antes que sus hijos: init los adopta y recolecta sus zombis"""
+    motor = _motor_escenario(max_auto_processes=0)
+    padre = motor.crear_proceso("Raíz")
+    hijos = motor.fork(padre.pid, 2)
+    motor.enviar_a_zombi([padre.pid])
+    motor.enviar_a_zombi([h.pid for h in hijos])
+    motor.tick()
+    errores = []
+    for h in hijos:
+        if h.padre != simulador.PID_INIT:
+            errores.append(f"PID {h.pid} sigue como hijo de {h.padre}, no de init")
+        if h.estado == "Zombi":
+            errores.append(f"PID {h.pid} quedó Zombi sin recolectar")
+    return errores
+
+
+def escenario_grupo_lleno_no_frena_al_resto() -> List[str]:
+    """Un grupo en su límite de memoria retiene solo a sus procesos, sin contrapresión del sistema"""
+    motor = _motor_escenario(max_auto_processes=0, grupos=("/chico:memoria=75", "/otro"))
+    chicos = motor.crear_procesos(5, "Chico", grupo="/chico")
+    otros = motor.crear_procesos(5, "Otro", grupo="/otro")
+    for p in chicos + otros:
+        p.tiempo_estado = p.tiempo_admision
+    motor.tick()
+    errores = []
+    admitidos_chico = sum(1 for p in chicos if p.estado != "Nuevo")
+    if admitidos_chico != 1:
+        errores.append(f"/chico admitió {admitidos_chico}, su límite deja entrar 1")
+    if any(p.estado == "Nuevo" for p in otros):
+        errores.append("/otro quedó retenido por el límite de /chico")
+    if motor.admision_retenida:
+        errores.append("el límite de un grupo activó la contrapresión del sistema")
+    if motor.grupos_retenidos != {"/chico"}:
+        errores.append(f"grupos retenidos {sorted(motor.grupos_retenidos)}, se esperaba ['/chico']")
+    if not motor.grupos["/chico"].rechazos_admision:
+        errores.append("/chico no contó el rechazo de admisión")
+    return errores
+
+
+ESCENARIOS = (
+    escenario_lote_sin_contrapresion,
+    escenario_traza_cuenta_en_grupo,
+    escenario_forzar_conserva_rafaga,
+    escenario_csv_con_grupos,
+    escenario_huerfanos_de_raiz,
+    escenario_grupo_lleno_no_frena_al_resto,
+)
+
+
+def ejecutar_escenarios() -> int:
+    fallos = 0
+    for escenario in ESCENARIOS:
+        for error in escenario():
+            fallos += 1
+            print(f"{escenario.__name__}: {error}", file=sys.stderr)
+    return fallos
+
+
+# ===============================
+# Ejecución de casos
+# ===============================
+
+def ejecutar_caso(caso: int, ticks: int, prob_accion: float, extendido: bool = False) -> Optional[Fallo]:
+    rng = random.Random(caso)
+    config = configuracion_aleatoria(rng, caso, ticks, extendido)
+    simulador._id_counter = PRIMER_PID - 1   # los dos modelos numeran igual desde PRIMER_PID
+    motor = crear_motor(config)
+    motor.series = None
+    transiciones: List[Transicion] = []
+    motor.al_transicion = lambda p, de, a: transiciones.append((p.pid, de, a))
+    ref = None
+    if not extendido:
+        ref = ModeloReferencia(config.semilla, PRIMER_PID, config.nucleos, config.politica, config.quantum,
+                               config.umbral_aging, config.prob_bloqueo_base, config.prob_bloqueo_por_espera,
+                               config.prob_bloqueo_max_carga, config.max_auto_processes,
+                               config.procesos_por_especial)
+    rutas = [simulador.RAIZ] + [spec.split(":")[0] for spec in config.grupos]
+
+    modelos = [motor] if ref is None else [motor, ref]
+    for modelo in modelos:
+        modelo.crear_procesos(config.procesos_iniciales, "Carga")
+    for tick in range(1, ticks + 1):
+        # La carga sale del generador del caso, no del de los modelos (que deben coincidir solos)
+        if rng.random() < config.prob_llegada:
+            if ref is None:
+                motor.crear_proceso("Carga", rng.choice(rutas))
+            else:
+                for modelo in modelos:
+                    modelo.crear_proceso("Carga")
+        if rng.random() < prob_accion:
+            accion, argumento = elegir_accion(rng, sorted(motor.procesos))
+            for modelo in modelos:
+                aplicar(modelo, accion, argumento)
+        for modelo in modelos:
+            modelo.tick()
+
+        errores = invariantes(motor)
+        if errores:
+            return Fallo(caso, tick, "invariante violado", "\n".join(f"  {e}" for e in errores))
+        if ref is not None:
+            if transiciones != ref.transiciones:
+                return Fallo(caso, tick, "transiciones distintas",
+                             f"  motor      {transiciones}\n  referencia {ref.transiciones}")
+            distintas = diferencias(observar_motor(motor), observar_referencia(ref))
+            if distintas:
+                return Fallo(caso, tick, "estado distinto", "\n".join(distintas))
+            ref.transiciones.clear()
+        transiciones.clear()
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compara el motor con el modelo de referencia en cargas al azar")
+    parser.add_argument("--casos", type=int, default=100)
+    parser.add_argument("--primer-caso", type=int, default=0)
+    parser.add_argument("--caso", type=int, default=None, help="reproducir solo este caso")
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--prob-accion", type=float, default=0.15, help="probabilidad de una acción manual por tick")
+    parser.add_argument("--extendido", action="store_true",
+                        help="además, correr cada caso con grupos, fork/wait y costos de cambio (solo invariantes)")
+    args = parser.parse_args(argv)
+
+    casos = [args.caso] if args.caso is not None else range(args.primer_caso, args.primer_caso + args.casos)
+    modos = (False, True) if args.extendido else (False,)
+    inicio = time.perf_counter()
+    fallos = 0
+    corridas = 0
+    if args.caso is None:
+        fallos_escenarios = ejecutar_escenarios()
+        print(f"{len(ESCENARIOS)} escenarios de regresión, {fallos_escenarios} error(es)")
+        fallos += fallos_escenarios
+    for caso in casos:
+        for extendido in modos:
+            corridas += 1
+            fallo = ejecutar_caso(caso, args.ticks, args.prob_accion, extendido)
+            if fallo is not None:
+                fallos += 1
+                print(("[extendido] " if extendido else "") + str(fallo), file=sys.stderr)
+    duracion = time.perf_counter() - inicio
+    print(f"{corridas - fallos}/{corridas} corridas sin diferencias ({args.ticks} ticks c/u, {duracion:.1f}s)")
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
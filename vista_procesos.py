@@ -0,0 +1,143 @@
+"""
+Vista ordenada y filtrada de la tabla de procesos.
+
+Mantiene, para la columna de orden activa, una lista (clave, pid) ordenada
+que se actualiza solo con las filas que cambiaron entre instantáneas: pocas
+filas se reubican con bisect y muchas se quitan en bloque y se fusionan
+(Timsort detecta las dos corridas ya ordenadas), así que nunca se vuelve a
+ordenar todo desde cero salvo al cambiar de columna. Los filtros usan un
+índice por estado y el conjunto de PIDs cuyo nombre contiene el texto
+buscado, también mantenido de forma incremental.
+"""
+from bisect import bisect_left, insort
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from simulador import ESTADOS
+
+Fila = Tuple[str, ...]  # ("PID", "Nombre", "Estado", "Tiempo", "Duración", "CPU", "Memoria", "Disco")
+
+ORDEN_ESTADO = {estado: i for i, estado in enumerate(("Nuevo",) + ESTADOS)}
+
+# Clave de orden por columna a partir de la fila ya formateada
+CLAVES: Dict[str, Callable[[Fila], object]] = {
+    "PID": lambda fila: int(fila[0]),
+    "Nombre": lambda fila: fila[1].lower(),
+    "Estado": lambda fila: ORDEN_ESTADO.get(fila[2], len(ORDEN_ESTADO)),
+    "Tiempo": lambda fila: int(fila[3]),
+    "Duración": lambda fila: int(fila[4]) if fila[4].isdigit() else -1,  # "Auto" primero
+    "CPU": lambda fila: float(fila[5][:-1]),
+    "Memoria": lambda fila: float(fila[6][:-3]),
+    "Disco": lambda fila: float(fila[7][:-1]),
+}
+
+# Por encima de esta cantidad de cambios se fusiona en bloque en lugar de usar bisect
+MAX_CAMBIOS_BISECT = 32
+
+
+class VistaProcesos:
+    def __init__(self, columna: str = "PID", descendente: bool = False):
+        self.filas: Dict[int, Fila] = {}
+        self.por_estado: Dict[str, Set[int]] = {}
+        self.columna = columna
+        self.descendente = descendente
+        self._clave: Dict[int, object] = {}
+        self._orden: List[Tuple[object, int]] = []
+        # Filtros
+        self.filtro_estado: Optional[str] = None
+        self.filtro_texto = ""
+        self._coinciden: Set[int] = set()
+
+    # ---------- Actualización incremental ----------
+    def actualizar(self, filas: Tuple[Fila, ...]) -> Tuple[List[Fila], List[int]]:
+        """Aplica una instantánea; devuelve (filas nuevas o cambiadas, PIDs eliminados)"""
+        clave_de = CLAVES[self.columna]
+        vistos: Set[int] = set()
+        cambiadas: List[Fila] = []
+        movidos: List[Tuple[object, object, int]] = []  # (clave vieja o None, clave nueva, pid)
+        for fila in filas:
+            pid = int(fila[0])
+            vistos.add(pid)
+            anterior = self.filas.get(pid)
+            if anterior is fila or anterior == fila:  # to_row reutiliza la tupla si nada cambió
+                continue
+            self.filas[pid] = fila
+            cambiadas.append(fila)
+            if anterior is None or anterior[2] != fila[2]:
+                if anterior is not None:
+                    self.por_estado[anterior[2]].discard(pid)
+                self.por_estado.setdefault(fila[2], set()).add(pid)
+            if self.filtro_texto:
+                if self.filtro_texto in fila[1].lower():
+                    self._coinciden.add(pid)
+                else:
+                    self._coinciden.discard(pid)
+            clave = clave_de(fila)
+            vieja = self._clave.get(pid)
+            if anterior is None or vieja != clave:
+                self._clave[pid] = clave
+                movidos.append((None if anterior is None else vieja, clave, pid))
+
+        eliminados = [pid for pid in self.filas if pid not in vistos] if len(vistos) != len(self.filas) else []
+        for pid in eliminados:
+            fila = self.filas.pop(pid)
+            self.por_estado[fila[2]].discard(pid)
+            self._coinciden.discard(pid)
+            movidos.append((self._clave.pop(pid), None, pid))
+
+        self._reubicar(movidos)
+        return cambiadas, eliminados
+
+    def _reubicar(self, movidos: List[Tuple[object, object, int]]):
+        orden = self._orden
+        if len(movidos) <= MAX_CAMBIOS_BISECT:
+            for vieja, nueva, pid in movidos:
+                if vieja is not None:
+                    del orden[bisect_left(orden, (vieja, pid))]
+                if nueva is not None:
+                    insort(orden, (nueva, pid))
+            return
+        # Muchos cambios: quitar en bloque y fusionar la corrida nueva (O(n + k log k))
+        tocados = {pid for _v, _n, pid in movidos}
+        nuevos = sorted((nueva, pid) for _v, nueva, pid in movidos if nueva is not None)
+        self._orden = [par for par in orden if par[1] not in tocados]
+        self._orden.extend(nuevos)
+        self._orden.sort()
+
+    # ---------- Orden y filtros ----------
+    def ordenar_por(self, columna: str, descendente: Optional[bool] = None):
+        """Cambia la columna de orden (único caso en que se ordena todo)"""
+        if descendente is None:
+            descendente = not self.descendente if columna == self.columna else False
+        self.descendente = descendente
+        if columna != self.columna:
+            self.columna = columna
+            clave_de = CLAVES[columna]
+            self._clave = {pid: clave_de(fila) for pid, fila in self.filas.items()}
+            self._orden = sorted((clave, pid) for pid, clave in self._clave.items())
+
+    def filtrar(self, estado: Optional[str] = None, texto: str = ""):
+        self.filtro_estado = estado or None
+        texto = texto.strip().lower()
+        if texto != self.filtro_texto:
+            self.filtro_texto = texto
+            self._coinciden = {pid for pid, fila in self.filas.items() if texto in fila[1].lower()} if texto else set()
+
+    def visibles(self) -> List[int]:
+        """PIDs que pasan los filtros, en el orden de la columna activa"""
+        candidatos: Optional[Set[int]] = None
+        if self.filtro_estado is not None:
+            candidatos = self.por_estado.get(self.filtro_estado, set())
+        if self.filtro_texto:
+            candidatos = self._coinciden if candidatos is None else candidatos & self._coinciden
+
+        if candidatos is None:
+            pids = [pid for _clave, pid in self._orden]
+        elif len(candidatos) * 8 < len(self._orden):
+            # Subconjunto chico (p. ej. un estado poco poblado): ordenar solo ese subconjunto
+            clave = self._clave
+            pids = [pid for _c, pid in sorted((clave[pid], pid) for pid in candidatos)]
+        else:
+            pids = [pid for _clave, pid in self._orden if pid in candidatos]
+        if self.descendente:
+            pids.reverse()
+        return pids